@@ -3,6 +3,8 @@ Main class for calculating metrics.
 '''
 
 from pathlib import Path
+import copy
+
 import clang.cindex
 
 from cpp_stats.metrics.lines_of_code import LinesOfCodeCalculator
@@ -33,18 +35,42 @@ from cpp_stats.metrics.lcom.tcc_lcc.lcc import MeanLCCCalculator, MinLCCCalculat
 from cpp_stats.metrics.lcom.tcc_lcc.tcc import MeanTCCCalculator, MinTCCCalculator
 from cpp_stats.metrics.metric_calculator import Metric
 from cpp_stats.ast.ast_tree import analyze_ast
+from cpp_stats.ast.options import AnalysisOptions
+from cpp_stats.profiling import Profiler
+from cpp_stats.instrumentation import CallCounter
+from cpp_stats.progress import ProgressReporter
 
-# pylint: disable=R0903
+# pylint: disable=R0902,R0903,R0913,R0917
 class CodeAnalyzer:
     '''
     Provides calculated metrics.
     '''
 
-    def __init__(self, repo_path: str, c_cxx_files: list[Path], clang_path: str = None):
+    def __init__(self, repo_path: str, c_cxx_files: list[Path], clang_path: str = None,
+                 profiler: Profiler | None = None, call_counter: CallCounter | None = None,
+                 progress: ProgressReporter | None = None, **options):
+        '''
+        Initializes analyzer. Metrics are calculated only when they are requested.
+
+        Parameters:
+        repo_path (str): Path to the repository.
+        c_cxx_files (list[Path]): C/C++ files to analyze.
+        clang_path (str): Path to libclang, files are not parsed if it is `None`.
+        profiler (Profiler | None): Profiler measuring time of analysis.
+        call_counter (CallCounter | None): Counter of calls into libclang.
+        progress (ProgressReporter | None): Reporter of progress of counted and parsed files.
+        options: Options of analysis, see `AnalysisOptions`.
+        '''
+        self._repo_path = repo_path
         self._files = c_cxx_files
-        self._ast_tree = None
+        self._clang_path = clang_path
+        self._options = AnalysisOptions(**options)
+        self._index = None
+        self._profiler = profiler
+        self._call_counter = call_counter
+        self._progress = progress
         self._basic_calculators = {
-            'LINES_OF_CODE' : LinesOfCodeCalculator(),
+            'LINES_OF_CODE' : LinesOfCodeCalculator(progress),
         }
         self._clang_calculators = {
             'NUMBER_OF_CLASSES' : NumberOfClassesCalculator(),
@@ -119,25 +145,72 @@ class CodeAnalyzer:
             'LINES_OF_CODE' : None,
             'NUMBER_OF_CLASSES' : None,
         }
-        self._clang_cache = None
-        self._use_clang = False
-        if clang_path is not None:
-            self._use_clang = True
-            clang.cindex.Config.set_library_file(clang_path)
-            index = clang.cindex.Index.create()
-            self._clang_cache = analyze_ast(index, repo_path, c_cxx_files, self._clang_calculators)
+        self._clang_cache = {}
+        # records of metric families are reused by metrics requested later
+        self._traversed = {}
+        self._analyzed_metrics = set()
+        self._use_clang = clang_path is not None
+
+    def analyze(self, metric_names: list[str]):
+        '''
+        Calculates metrics with Clang that are not calculated yet in one pass over files.
+        Files are not parsed again for metrics derived from records of earlier passes.
+        Metrics that are not calculated with Clang are ignored.
+
+        Parameters:
+        metric_names (list[str]): Metric names.
+        '''
+        if not self._use_clang:
+            return
+        requested = [
+            name for name in metric_names
+            if name in self._clang_calculators and name not in self._analyzed_metrics
+            and (self._options.metrics is None or name in self._options.metrics)
+        ]
+        if len(requested) == 0:
+            return
+        options = copy.copy(self._options)
+        options.metrics = requested
+        self._clang_cache.update(analyze_ast(
+            self._get_index(),
+            self._repo_path,
+            self._files,
+            self._clang_calculators,
+            options,
+            self._profiler,
+            self._call_counter,
+            self._progress,
+            self._traversed
+        ))
+        self._analyzed_metrics.update(requested)
 
     def metric(self, metric_name: str) -> Metric | None:
         '''
-        Returns calculated metric by name.
+        Returns calculated metric by name. Metric is calculated on first request.
         
         Parameters:
         metric_name (str): Metric name.
         '''
         if self._cache.get(metric_name, None) is not None:
             return self._cache[metric_name]
-        if self._use_clang and self._clang_cache.get(metric_name, None) is not None:
+        self.analyze([metric_name])
+        if self._clang_cache.get(metric_name, None) is not None:
             return self._clang_cache[metric_name]
         if self._basic_calculators.get(metric_name, None) is not None:
-            self._cache[metric_name] = self._basic_calculators[metric_name](self._files)
+            calculator = self._basic_calculators[metric_name]
+            if self._profiler is None:
+                self._cache[metric_name] = calculator(self._files)
+            else:
+                with self._profiler.measure('basic_metrics'):
+                    self._cache[metric_name] = calculator(self._files)
         return self._cache.get(metric_name, None)
+
+    def _get_index(self) -> clang.cindex.Index:
+        '''
+        Loads libclang and creates index on first use.
+        '''
+        if self._index is None:
+            if not clang.cindex.Config.loaded:
+                clang.cindex.Config.set_library_file(self._clang_path)
+            self._index = clang.cindex.Index.create()
+        return self._index
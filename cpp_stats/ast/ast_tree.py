@@ -2,54 +2,631 @@
 Module for creating ast tree based on clang tree for calculating metric.
 '''
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from collections import deque
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator
+import ctypes
+import math
 import os
+import tempfile
+import time
 
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import ClangMetricCalculator, Metric
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator, reduce_metrics
+from cpp_stats.metrics.sources import source_store
+from cpp_stats.ast.compilation import get_parse_commands, is_header_file
+from cpp_stats.ast.options import AnalysisOptions
+from cpp_stats.ast.precompiled_header import use_precompiled_header
+from cpp_stats.ast.cache import FileCache, get_cpp_stats_version, get_libclang_version
+from cpp_stats.ast.memory import dispose_translation_unit, get_resident_memory
+from cpp_stats.ast.memory import release_free_memory
+from cpp_stats.git_changes import get_changed_files, get_revision_files, resolve_revision
+from cpp_stats.profiling import Profiler
+from cpp_stats import instrumentation
+from cpp_stats.instrumentation import CallCounter, counting_calls
+from cpp_stats.progress import ProgressReporter
+
+_CHILD_VISIT_BREAK = 0
+_CHILD_VISIT_CONTINUE = 1
+_CHILD_VISIT_RECURSE = 2
+
+# share of memory budget above which no more files are given to workers
+_MEMORY_THROTTLE_RATIO = 0.8
 
 def analyze_ast(index: clang.cindex.Index, repo_path: str, c_cxx_files: list[Path],
-                calculators: dict[str, ClangMetricCalculator]) -> dict[str, Metric]:
+                calculators: dict[str, ClangMetricCalculator],
+                options: AnalysisOptions | None = None,
+                profiler: Profiler | None = None,
+                call_counter: CallCounter | None = None,
+                progress: ProgressReporter | None = None,
+                traversed: dict[str, Metric] | None = None) -> dict[str, Metric]:
     '''
     Analyzes ast based on `c_cxx_files` and calculates metrics using `calculators`
     
     Parameters:
     `c_cxx_files` (`list[Path]`): C/C++ files to parse.
     `calculators` (`list[ClangMetricCalculator]`): calculators to calculate metris.
+    `options` (`AnalysisOptions | None`): options of analysis, default options if `None`.
+    `profiler` (`Profiler | None`): profiler measuring phases, files and calculators.
+    `call_counter` (`CallCounter | None`): counter of calls into libclang
+    per file and calculator.
+    `progress` (`ProgressReporter | None`): reporter of analyzed files, phase `analysis`.
+    `traversed` (`dict[str, Metric] | None`): metrics and records of previous analyses
+    of the same files. Only calculators whose results are missing in it are run,
+    files are not parsed if none are, and new results are added to it.
     
     Returns:
     `dict[str, Metric]`: dictionary with all metrics calculated by `calculators`.
     '''
-    result = {}
-    args = ["-x", "c++"]
-    for root, _, _ in os.walk(repo_path):
-        args.extend(["-I", root])
-    for _, file_path in enumerate(c_cxx_files):
-        translation_unit = index.parse(file_path, args=args)
-        _analyze_children(
-            result,
-            calculators,
-            translation_unit.cursor,
-            str(file_path.resolve())
+    if options is None:
+        options = AnalysisOptions()
+    if options.metrics is not None:
+        calculators = {
+            name: calculator for name, calculator in calculators.items()
+            if name in options.metrics
+        }
+    traversed_calculators = _get_traversed_calculators(calculators)
+    if traversed is None:
+        traversed = {}
+    traversed_calculators = {
+        name: calculator for name, calculator in traversed_calculators.items()
+        if name not in traversed
+    }
+    if len(traversed_calculators) == 0:
+        return _collect_metrics(calculators, traversed)
+    with _measure(profiler, 'compilation_commands'):
+        parse_commands = get_parse_commands(repo_path, c_cxx_files, options.compilation_database)
+    _set_counter_scope(call_counter, None, None)
+    if progress is not None:
+        progress.start('analysis')
+    try:
+        with counting_calls(call_counter) if call_counter is not None else nullcontext():
+            with (tempfile.TemporaryDirectory(prefix='cpp-stats-')
+                  if options.precompiled_headers else nullcontext()) as pch_dir:
+                context = {
+                    'index': index,
+                    'parse_options': get_parse_options(traversed_calculators,
+                                                       options.skip_function_bodies),
+                    'calculators': traversed_calculators,
+                    'headers': set(),
+                    'claimed': set(),
+                    'pch_dir': pch_dir,
+                    'pch_dependencies': [],
+                    'cache': None,
+                    'max_memory': options.max_memory,
+                    'profiler': profiler,
+                    'count_calls': call_counter is not None,
+                    'progress': progress,
+                }
+                if options.cache_dir is not None:
+                    changed_files = None
+                    revision = None
+                    revision_files = None
+                    if options.since is not None:
+                        revision = resolve_revision(repo_path, options.since)
+                        changed_files = get_changed_files(repo_path, revision)
+                        revision_files = get_revision_files(repo_path, revision)
+                    context['cache'] = _create_cache(options.cache_dir, context,
+                                                     changed_files, revision, revision_files)
+                if options.attribute_headers:
+                    file_results = _analyze_with_header_attribution(
+                        context,
+                        parse_commands,
+                        options.jobs
+                    )
+                else:
+                    file_results = _analyze_files(context, parse_commands, options.jobs, False)
+            _set_counter_scope(call_counter, None, '(merge)')
+            with _measure(profiler, 'merge'):
+                traversed.update(
+                    _merge_partial_results([partial_result for _, partial_result in file_results])
+                )
+                return _collect_metrics(calculators, traversed)
+    finally:
+        source_store.clear()
+        if progress is not None:
+            progress.finish()
+
+def _create_cache(cache_dir: str, context: dict, changed_files: set[str] | None,
+                  revision: str | None, revision_files: set[str] | None) -> FileCache:
+    '''
+    Creates cache of results of files for libclang, cpp-stats and calculators in use.
+    '''
+    salt = '|'.join([
+        get_cpp_stats_version(),
+        get_libclang_version(),
+        str(context['parse_options']),
+        ','.join(sorted(context['calculators'])),
+    ])
+    return FileCache(cache_dir, salt, changed_files, revision, revision_files)
+
+def get_parse_options(calculators: dict[str, ClangMetricCalculator],
+                      skip_function_bodies: bool = False) -> int:
+    '''
+    Returns the cheapest parse options that satisfy all `calculators`.
+    If `skip_function_bodies` is set, bodies of functions are skipped
+    if no calculator needs them, then classes local to functions are not seen.
+    '''
+    if (not skip_function_bodies
+            or any(calculator.needs_function_bodies() for calculator in calculators.values())):
+        return clang.cindex.TranslationUnit.PARSE_NONE
+    return (clang.cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+            | clang.cindex.TranslationUnit.PARSE_INCOMPLETE)
+
+def _analyze_with_header_attribution(
+    context: dict,
+    parse_commands: list[tuple[str, list[str]]],
+    jobs: int
+    ) -> list[tuple[str, dict[str, Metric]]]:
+    '''
+    Parses source files first and credits cursors of analyzed headers to these headers,
+    so each header is traversed once, inside the first source that includes it.
+    Only headers that are not included by any source are parsed on their own.
+    Results are ordered like `parse_commands`, so they do not depend on `jobs`.
+    '''
+    order = {os.path.realpath(file_path): i for i, (file_path, _) in enumerate(parse_commands)}
+    headers = [command for command in parse_commands if is_header_file(command[0])]
+    sources = [command for command in parse_commands if not is_header_file(command[0])]
+    context['headers'] = {os.path.realpath(file_path) for file_path, _ in headers}
+    file_results = {}
+    for real_path, partial_result in _analyze_files(context, sources, jobs, True):
+        file_results.setdefault(real_path, partial_result)
+    not_included_headers = [
+        command for command in headers
+        if os.path.realpath(command[0]) not in file_results
+    ]
+    for real_path, partial_result in _analyze_files(context, not_included_headers, jobs, False):
+        file_results.setdefault(real_path, partial_result)
+    return sorted(file_results.items(), key=lambda item: order[item[0]])
+
+def _analyze_files(
+    context: dict,
+    parse_commands: list[tuple[str, list[str]]],
+    jobs: int,
+    attribute_headers: bool
+    ) -> list[tuple[str, dict[str, Metric]]]:
+    '''
+    Analyzes files serially or in `jobs` worker processes.
+    Results of files are taken from cache when possible.
+    '''
+    results = [None] * len(parse_commands)
+    if context['cache'] is not None:
+        headers = context['headers'] if attribute_headers else set()
+        with _measure(context['profiler'], 'cache'):
+            for i, (file_path, args) in enumerate(parse_commands):
+                results[i] = context['cache'].load(file_path, args, headers)
+    missing = [i for i, result in enumerate(results) if result is None]
+    missing_commands = [parse_commands[i] for i in missing]
+    progress = context['progress']
+    if progress is not None:
+        progress.add_files(len(parse_commands))
+        for (file_path, _), result in zip(parse_commands, results):
+            if result is not None:
+                progress.file_done(file_path, 0.0, result[1])
+    if context['pch_dir'] is not None:
+        with _measure(context['profiler'], 'precompiled_header'):
+            missing_commands, context['pch_dependencies'] = use_precompiled_header(
+                context['index'],
+                missing_commands,
+                context['pch_dir']
+            )
+    if jobs > 1 and len(missing_commands) > 1:
+        missing_results = _analyze_files_in_parallel(
+            context,
+            missing_commands,
+            jobs,
+            attribute_headers
         )
+    else:
+        if 'dispatch_table' not in context:
+            context['dispatch_table'] = _build_dispatch_table(context['calculators'])
+        missing_results = []
+        for file_path, args in missing_commands:
+            if progress is not None:
+                progress.file_started(file_path)
+            missing_results.append(_analyze_file(context, file_path, args, attribute_headers))
+            if progress is not None:
+                progress.file_done(file_path, None, missing_results[-1][1])
+    for i, result in zip(missing, missing_results):
+        results[i] = result
+    return [file_result for result, _ in results for file_result in result]
+
+def _analyze_file(
+    context: dict,
+    file_path: str,
+    args: list[str],
+    attribute_headers: bool
+    ) -> tuple[list[tuple[str, dict[str, Metric]]], int]:
+    '''
+    Parses `file_path` and returns metrics calculated for this file
+    and for headers credited to it, keyed by real paths of files,
+    together with number of lines of the file.
+    With memory budget the translation unit is disposed right after it is analyzed.
+    '''
+    profiler = context['profiler']
+    call_counter = instrumentation.active_counter
+    _set_counter_scope(call_counter, file_path, '(parse)')
+    with _measure(profiler, 'parse', file_path):
+        translation_unit = context['index'].parse(
+            file_path,
+            args=args,
+            options=context['parse_options']
+        )
+    try:
+        _set_counter_scope(call_counter, file_path, '(traversal)')
+        with _measure(profiler, 'traversal', file_path):
+            partial_result = {}
+            # Every calculator sees the translation unit itself, so each
+            # requested metric is present in the result.
+            _add_metrics(partial_result, context['calculators'].items(),
+                         translation_unit.cursor, profiler)
+            file_results = {translation_unit.spelling: partial_result}
+            _set_counter_scope(call_counter, file_path, '(traversal)')
+            if attribute_headers:
+                file_results.update(_claim_headers(context, translation_unit))
+            _analyze_children(file_results, context['dispatch_table'],
+                              translation_unit.cursor, profiler)
+        _set_counter_scope(call_counter, file_path, '(traversal)')
+        result = [(os.path.realpath(name), result) for name, result in file_results.items()]
+        lines = _count_lines(translation_unit)
+        if context['cache'] is not None:
+            dependencies = [inclusion.include.name for inclusion in translation_unit.get_includes()]
+            if '-include-pch' in args:
+                dependencies.extend(context['pch_dependencies'])
+            context['cache'].store(file_path, args, dependencies, result, lines)
+    finally:
+        if context['max_memory'] is not None:
+            dispose_translation_unit(translation_unit)
+            source_store.clear()
+            release_free_memory()
+        _set_counter_scope(call_counter, None, None)
+    return result, lines
+
+def _count_lines(translation_unit: clang.cindex.TranslationUnit) -> int:
+    '''
+    Returns number of lines of parsed file from extent of `translation_unit`,
+    counted like `LinesOfCodeCalculator` does, so the file is not read again.
+    '''
+    end = translation_unit.cursor.extent.end
+    # extent of file ending with newline ends at the start of an empty line
+    return end.line - 1 if end.column == 1 else end.line
+
+def _set_counter_scope(call_counter: CallCounter | None, file_path: str | None,
+                       calculator: str | None):
+    '''
+    Makes `call_counter` count following events for `file_path` and `calculator`.
+    '''
+    if call_counter is not None:
+        call_counter.file = file_path
+        call_counter.calculator = calculator
+
+def _claim_headers(context: dict,
+                   translation_unit: clang.cindex.TranslationUnit) -> dict[str, dict[str, Metric]]:
+    '''
+    Returns empty results for analyzed headers included by `translation_unit`
+    that were not claimed by previous translation units.
+
+    With cache, results of a file must not depend on files analyzed before it,
+    so every translation unit claims all included headers and duplicates
+    are dropped when results are combined.
+    '''
+    claimed = {}
+    for inclusion in translation_unit.get_includes():
+        real_path = os.path.realpath(inclusion.include.name)
+        if real_path in context['headers'] and real_path not in context['claimed']:
+            if context['cache'] is None:
+                context['claimed'].add(real_path)
+            claimed[inclusion.include.name] = {}
+    return claimed
+
+# Context of a worker process, filled once by `_init_worker`.
+_worker_context = {}
+
+def _init_worker(library_file: str | None, context: dict):
+    '''
+    Prepares worker process: loads libclang and creates its own index.
+    '''
+    if library_file is not None and not clang.cindex.Config.loaded:
+        clang.cindex.Config.set_library_file(library_file)
+    _worker_context.update(context)
+    _worker_context['index'] = clang.cindex.Index.create()
+    _worker_context['dispatch_table'] = _build_dispatch_table(context['calculators'])
+
+def _analyze_shard(
+    parse_commands: list[tuple[str, list[str]]],
+    attribute_headers: bool
+    ) -> tuple[list[tuple[list[tuple[str, dict[str, Metric]]], int]], list[float],
+               Profiler | None, CallCounter | None]:
+    '''
+    Analyzes shard of files in worker process.
+    Returns results and lines of files, wall time of each file, profile of the shard
+    if profiling is on and counted calls if counting is on.
+    '''
+    if _worker_context['profiler'] is not None:
+        _worker_context['profiler'] = Profiler()
+    call_counter = CallCounter() if _worker_context['count_calls'] else None
+    try:
+        with counting_calls(call_counter) if call_counter is not None else nullcontext():
+            results = []
+            durations = []
+            for file_path, args in parse_commands:
+                started = time.perf_counter()
+                results.append(_analyze_file(_worker_context, file_path, args, attribute_headers))
+                durations.append(time.perf_counter() - started)
+    finally:
+        source_store.clear()
+    return results, durations, _worker_context['profiler'], call_counter
+
+def _split_into_shards(items: list, jobs: int) -> list[list]:
+    '''
+    Splits items into consecutive shards, several shards per worker
+    so that workers stay busy when some files take longer to parse.
+    '''
+    shard_size = max(1, math.ceil(len(items) / (jobs * 4)))
+    return [
+        items[start:start + shard_size]
+        for start in range(0, len(items), shard_size)
+    ]
+
+def _analyze_files_in_parallel(
+    context: dict,
+    parse_commands: list[tuple[str, list[str]]],
+    jobs: int,
+    attribute_headers: bool
+    ) -> list[tuple[list[tuple[str, dict[str, Metric]]], int]]:
+    '''
+    Analyzes files in `jobs` worker processes.
+    Results and lines of files are returned in order of `parse_commands`,
+    so merged metrics are the same as for serial analysis.
+
+    Each worker takes shards in order of submission, so a header is always
+    claimed by the first translation unit that includes it, as in serial analysis.
+    Progress is reported by the main process as results of shards arrive.
+    '''
+    worker_context = {
+        'parse_options': context['parse_options'],
+        'calculators': context['calculators'],
+        'headers': context['headers'],
+        'claimed': set(),
+        'pch_dependencies': context['pch_dependencies'],
+        'cache': context['cache'],
+        'max_memory': context['max_memory'],
+        'profiler': context['profiler'],
+        'count_calls': context['count_calls'],
+    }
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(clang.cindex.Config.library_file, worker_context)
+        ) as executor:
+        if context['max_memory'] is None:
+            shards = _split_into_shards(parse_commands, jobs)
+            shard_results = executor.map(_analyze_shard, shards, repeat(attribute_headers))
+        else:
+            shards = [[command] for command in parse_commands]
+            shard_results = _map_within_memory(
+                executor,
+                shards,
+                jobs,
+                attribute_headers,
+                context['max_memory']
+            )
+        for shard, (shard_result, durations, shard_profiler, shard_call_counter) in zip(
+                shards, shard_results):
+            results.extend(shard_result)
+            if context['progress'] is not None:
+                for (file_path, _), (_, lines), seconds in zip(shard, shard_result, durations):
+                    context['progress'].file_done(file_path, seconds, lines)
+            if shard_profiler is not None:
+                context['profiler'].merge(shard_profiler)
+            if shard_call_counter is not None:
+                instrumentation.active_counter.merge(shard_call_counter)
+    return results
+
+def _map_within_memory(
+    executor: ProcessPoolExecutor,
+    shards: list[list[tuple[str, list[str]]]],
+    jobs: int,
+    attribute_headers: bool,
+    max_memory: int
+    ) -> Iterator[tuple[list[tuple[list[tuple[str, dict[str, Metric]]], int]], list[float],
+                        Profiler | None, CallCounter | None]]:
+    '''
+    Analyzes `shards` in `executor` like `executor.map`, but a new shard is submitted
+    only while resident memory of all processes is below share of `max_memory`.
+    At least one shard is always being analyzed, so analysis does not stall.
+    '''
+    pending = deque(shards)
+    futures = deque()
+    running = set()
+    while pending or running:
+        while pending and len(running) < jobs:
+            if running:
+                resident_memory = get_resident_memory()
+                if (resident_memory is not None
+                        and resident_memory >= max_memory * _MEMORY_THROTTLE_RATIO):
+                    break
+            future = executor.submit(_analyze_shard, pending.popleft(), attribute_headers)
+            futures.append(future)
+            running.add(future)
+        _, running = wait(running, return_when=FIRST_COMPLETED)
+        # results are yielded in order of shards as soon as they are ready
+        while futures and futures[0].done():
+            yield futures.popleft().result()
+
+def _merge_partial_results(partial_results: list[dict[str, Metric]]) -> dict[str, Metric]:
+    '''
+    Merges metrics calculated for separate files using pairwise reduction.
+    '''
+    grouped_metrics = {}
+    for partial_result in partial_results:
+        for name, metric in partial_result.items():
+            grouped_metrics.setdefault(name, []).append(metric)
+    return {name: reduce_metrics(metrics) for name, metrics in grouped_metrics.items()}
+
+def _get_records_key(calculator: ClangMetricCalculator) -> str:
+    '''
+    Returns key of records calculated by `calculator`.
+    Calculators of the same type share their records.
+    '''
+    return f'{type(calculator).__module__}.{type(calculator).__qualname__}'
+
+def _get_traversed_calculators(
+    calculators: dict[str, ClangMetricCalculator]
+    ) -> dict[str, ClangMetricCalculator]:
+    '''
+    Returns calculators that must be run during AST traversal.
+    Derived metrics are replaced by calculators of their records,
+    so records of each family are calculated only once.
+    '''
+    result = {}
+    for name, calculator in calculators.items():
+        if not isinstance(calculator, DerivedMetricCalculator):
+            result[name] = calculator
+            continue
+        for records_calculator in calculator.records():
+            result.setdefault(_get_records_key(records_calculator), records_calculator)
     return result
 
-def _analyze_children(
-    result: dict[str, Metric],
+def _collect_metrics(
     calculators: dict[str, ClangMetricCalculator],
+    traversed_metrics: dict[str, Metric]
+    ) -> dict[str, Metric]:
+    '''
+    Returns metrics calculated by `calculators` based on metrics
+    and records accumulated during AST traversal.
+    '''
+    result = {}
+    for name, calculator in calculators.items():
+        if not isinstance(calculator, DerivedMetricCalculator):
+            metric = traversed_metrics.get(name, None)
+        elif all(_get_records_key(records_calculator) in traversed_metrics
+                 for records_calculator in calculator.records()):
+            metric = calculator.from_records([
+                traversed_metrics[_get_records_key(records_calculator)]
+                for records_calculator in calculator.records()
+            ])
+        else:
+            metric = None
+        if metric is not None:
+            result[metric.name()] = metric
+    return result
+
+def _build_dispatch_table(
+    calculators: dict[str, ClangMetricCalculator]
+    ) -> dict[clang.cindex.CursorKind, list[tuple[str, ClangMetricCalculator]]]:
+    '''
+    Groups `calculators` by cursor kinds declared in `cursor_kinds`,
+    so each cursor reaches only the calculators that can use it.
+    '''
+    table = {kind: [] for kind in clang.cindex.CursorKind.get_all_kinds()}
+    for name, calculator in calculators.items():
+        kinds = calculator.cursor_kinds()
+        for kind in table if kinds is None else kinds:
+            table[kind].append((name, calculator))
+    return table
+
+def _measure(profiler: Profiler | None, phase: str, file_path: str | None = None):
+    '''
+    Returns context manager measuring `phase` if profiling is on.
+    '''
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(phase, file_path)
+
+def _add_metrics(
+    result: dict[str, Metric],
+    calculators: list[tuple[str, ClangMetricCalculator]],
     cursor: clang.cindex.Cursor,
-    analyzed_file: str
+    profiler: Profiler | None = None
     ):
-    for clc in calculators.items():
-        metric = clc[1](cursor)
-        if result.get(metric.name(), None) is None:
-            result[metric.name()] = metric
+    call_counter = instrumentation.active_counter
+    for name, calculator in calculators:
+        if call_counter is not None:
+            call_counter.calculator = name
+        if profiler is None:
+            metric = calculator(cursor)
         else:
-            result[metric.name()] += metric
-    for child in cursor.get_children():
-        if (not child.kind.is_translation_unit() and
-            (child.location.file is None or
-            child.translation_unit.spelling != child.location.file.name)):
-            continue
-        _analyze_children(result, calculators, child, analyzed_file)
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            metric = calculator(cursor)
+            profiler.add_calculator(
+                name,
+                time.perf_counter() - wall,
+                time.process_time() - cpu
+            )
+        if result.get(name, None) is None:
+            result[name] = metric
+        else:
+            result[name] += metric
+
+def _analyze_children(
+    file_results: dict[str, dict[str, Metric]],
+    dispatch_table: dict[clang.cindex.CursorKind, list[tuple[str, ClangMetricCalculator]]],
+    cursor: clang.cindex.Cursor,
+    profiler: Profiler | None = None
+    ):
+    '''
+    Calculates metrics for descendants of `cursor` located in files of `file_results`.
+    Metrics of each cursor are added to results of its file.
+    '''
+    for result, calculators, child in _extract_nodes(file_results, dispatch_table, cursor):
+        _add_metrics(result, calculators, child, profiler)
+
+def _extract_nodes(
+    file_results: dict[str, dict[str, Metric]],
+    dispatch_table: dict[clang.cindex.CursorKind, list[tuple[str, ClangMetricCalculator]]],
+    cursor: clang.cindex.Cursor
+    ) -> list[tuple[dict[str, Metric], list[tuple[str, ClangMetricCalculator]], clang.cindex.Cursor]]:
+    '''
+    Returns descendants of `cursor` that some calculators use, in preorder,
+    with results of their files and their calculators.
+
+    The whole tree is walked by a single recursive visitation of libclang
+    instead of one visitation per cursor, subtrees outside of files of `file_results`
+    are skipped. Names of files are fetched once per file, not once per cursor.
+    '''
+    file_handles = {}
+    nodes = []
+    errors = []
+    visited = 0
+
+    def visitor(child, _parent, _data):
+        nonlocal visited
+        visited += 1
+        try:
+            child._tu = cursor._tu  # pylint: disable=W0212
+            location_file = child.location.file
+            if location_file is None:
+                return _CHILD_VISIT_CONTINUE
+            handle = ctypes.cast(location_file.obj, ctypes.c_void_p).value
+            if handle not in file_handles:
+                file_handles[handle] = file_results.get(location_file.name, None)
+            result = file_handles[handle]
+            if result is None:
+                return _CHILD_VISIT_CONTINUE
+            calculators = dispatch_table[child.kind]
+            if calculators:
+                nodes.append((result, calculators, child))
+            return _CHILD_VISIT_RECURSE
+        except Exception as e:  # pylint: disable=W0718
+            # exceptions can not be raised through libclang
+            errors.append(e)
+            return _CHILD_VISIT_BREAK
+
+    clang.cindex.conf.lib.clang_visitChildren(
+        cursor,
+        clang.cindex.callbacks['cursor_visit'](visitor),
+        None
+    )
+    if instrumentation.active_counter is not None:
+        instrumentation.active_counter.add(instrumentation.CURSORS_VISITED, visited)
+    if errors:
+        raise errors[0]
+    return nodes
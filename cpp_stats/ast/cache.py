@@ -0,0 +1,212 @@
+'''
+Module for persistent cache of metrics calculated for separate files.
+'''
+
+from importlib import metadata
+import hashlib
+import os
+import pickle
+import tempfile
+
+import clang.cindex
+
+from cpp_stats.metrics.metric_calculator import Metric
+
+CACHE_FORMAT_VERSION = 4
+
+_unpickling_errors = (
+    OSError, EOFError, pickle.UnpicklingError,
+    AttributeError, ImportError, IndexError, KeyError, TypeError, ValueError
+)
+
+def get_libclang_version() -> str:
+    '''
+    Returns version of loaded libclang, e.g. `clang version 17.0.6`.
+    '''
+    # pylint: disable=W0212
+    function = clang.cindex.conf.lib.clang_getClangVersion
+    function.restype = clang.cindex._CXString
+    function.errcheck = clang.cindex._CXString.from_result
+    version = function()
+    if isinstance(version, bytes):
+        return version.decode('utf-8', errors='replace')
+    return str(version)
+
+def get_cpp_stats_version() -> str:
+    '''
+    Returns version of installed cpp-stats or `unknown` if it is not installed.
+    '''
+    try:
+        return metadata.version('cpp-stats')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+def get_cache_args(args: list[str]) -> list[str]:
+    '''
+    Returns arguments that affect results of parsing.
+    Precompiled header is stored in temporary directory and does not change results,
+    so it is not part of the key.
+    '''
+    result = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == '-include-pch':
+            skip_next = True
+            continue
+        result.append(arg)
+    return result
+
+class FileCache:
+    '''
+    Stores metrics calculated for separate files on disk.
+
+    Entry of a file is keyed by its path, arguments of parsing and `salt`,
+    which describes versions of libclang and cpp-stats and requested calculators.
+    Entry is valid while contents of the file and all files included by it are unchanged.
+    Entry built while none of its files differed from a git revision records that revision,
+    its files tracked at that revision are checked only by the list of changed files.
+    Its other files, e.g. ignored or generated headers, are checked as usual.
+    Entries are pickled, so cache directory must be trusted.
+    '''
+
+    def __init__(self, directory: str, salt: str, changed_files: set[str] | None = None,
+                 revision: str | None = None, revision_files: set[str] | None = None):
+        '''
+        Initializes cache.
+
+        Parameters:
+        directory (str): Directory where entries are stored, it is created if needed.
+        salt (str): Description of everything else that changes results of analysis.
+        changed_files (set[str] | None): Real paths of files that differ from `revision`.
+        revision (str | None): Hash of git commit `changed_files` are relative to.
+        revision_files (set[str] | None): Real paths of files tracked at `revision`.
+        Contents of these files are not checked for entries built at this revision,
+        other files are checked by modification time, size and hash of contents.
+        '''
+        self._directory = directory
+        self._salt = salt
+        self._changed_files = changed_files if revision is not None else None
+        self._revision = revision
+        self._revision_files = revision_files if revision is not None else None
+        self._digests = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, file_path: str, args: list[str],
+             headers: set[str]) -> tuple[list[tuple[str, dict[str, Metric]]], int] | None:
+        '''
+        Returns cached results and lines of file or `None` if there is no valid entry.
+
+        Parameters:
+        file_path (str): Path to the file.
+        args (list[str]): Arguments for parsing the file.
+        headers (set[str]): Real paths of headers that are credited to including files.
+        '''
+        key = self._get_key(file_path, args)
+        try:
+            with open(self._get_entry_path(key), 'rb') as f:
+                entry = pickle.load(f)
+        except _unpickling_errors:
+            return None
+        # tracked files of entry built at the revision have the same contents as in it
+        at_revision = self._changed_files is not None and entry['revision'] == self._revision
+        for dependency, mtime, size, digest in entry['dependencies']:
+            if at_revision and dependency in self._changed_files:
+                return None
+            if at_revision and dependency in self._revision_files:
+                continue
+            if not self._is_unchanged(dependency, mtime, size, digest):
+                return None
+        claimed = {dependency for dependency, _, _, _ in entry['dependencies']} & headers
+        if claimed != set(entry['claimed']):
+            return None
+        return entry['results'], entry['lines']
+
+    def store(self, file_path: str, args: list[str], dependencies: list[str],
+              file_results: list[tuple[str, dict[str, Metric]]], lines: int):
+        '''
+        Stores results and lines of file.
+
+        Parameters:
+        file_path (str): Path to the file.
+        args (list[str]): Arguments for parsing the file.
+        dependencies (list[str]): Files included by the file.
+        file_results (list[tuple[str, dict[str, Metric]]]): results of the file
+        and headers credited to it, keyed by real paths.
+        lines (int): Number of lines of the file.
+        '''
+        key = self._get_key(file_path, args)
+        entry_dependencies = []
+        real_paths = [os.path.realpath(name) for name in [file_path] + dependencies]
+        for dependency in dict.fromkeys(real_paths):
+            try:
+                stat = os.stat(dependency)
+            except OSError:
+                return
+            digest = self._get_digest(dependency)
+            if digest is None:
+                return
+            entry_dependencies.append((dependency, stat.st_mtime_ns, stat.st_size, digest))
+        revision = None
+        if self._changed_files is not None and self._changed_files.isdisjoint(real_paths):
+            revision = self._revision
+        entry = {
+            'revision': revision,
+            'dependencies': entry_dependencies,
+            'claimed': [path for path, _ in file_results if path != real_paths[0]],
+            'results': file_results,
+            'lines': lines,
+        }
+        entry_path = self._get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(entry_path), delete=False) as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, entry_path)
+
+    def _get_key(self, file_path: str, args: list[str]) -> str:
+        key = hashlib.sha256()
+        for part in [str(CACHE_FORMAT_VERSION), self._salt, str(file_path)]:
+            key.update(part.encode('utf-8', errors='surrogateescape'))
+            key.update(b'\0')
+        for arg in get_cache_args(args):
+            key.update(arg.encode('utf-8', errors='surrogateescape'))
+            key.update(b'\0')
+        return key.hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key[2:] + '.pickle')
+
+    def _is_unchanged(self, file_path: str, mtime: int, size: int, digest: str) -> bool:
+        '''
+        Says whether file still has contents with `digest`.
+        File with the same modification time and size is not read again.
+        '''
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns == mtime and stat.st_size == size:
+            return True
+        return self._get_digest(file_path) == digest
+
+    def _get_digest(self, file_path: str) -> str | None:
+        '''
+        Returns hash of file contents. Hash is calculated once per process,
+        while modification time and size of file stay the same.
+        '''
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        cached = self._digests.get(file_path, None)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        try:
+            with open(file_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        self._digests[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
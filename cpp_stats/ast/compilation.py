@@ -0,0 +1,158 @@
+'''
+Module for getting arguments that are used to parse C/C++ files.
+'''
+
+from pathlib import Path
+import os
+
+import clang.cindex
+
+from cpp_stats.file_sieve import get_ignored_dirs
+
+COMPILATION_DATABASE_NAME = 'compile_commands.json'
+
+_header_extensions = {'.h', '.hh', '.hpp', '.hxx', '.h++', '.inc', '.inl', '.ipp', '.tpp', '.tcc'}
+
+def is_header_file(file_path: str | Path) -> bool:
+    '''
+    Says whether file is a header according to its extension.
+
+    Parameters:
+    `file_path` (`str | Path`): path to the file.
+    '''
+    return Path(file_path).suffix.lower() in _header_extensions
+
+def get_include_args(repo_path: str) -> list[str]:
+    '''
+    Infers include arguments for files of repository without compilation database.
+
+    Only directories that contain files and their parent directories
+    inside the repository are used as include paths. Any included file,
+    whatever its extension, lies in such a directory, so every `#include`
+    found with all directories is still found, while directories without
+    any files, e.g. build or cache trees, are not probed.
+    Like in `sieve_c_cxx_files`, `.git` and directories listed in `.gitignore`
+    or `.gitmodules` are skipped, so files inside them are found only
+    relative to the including file or through a compilation database.
+    Directories are listed in the order of `os.walk`.
+
+    Parameters:
+    `repo_path` (`str`): path to the repository.
+
+    Returns:
+    `list[str]`: arguments for parsing files of the repository.
+    '''
+    walked_dirs = []
+    include_dirs = set()
+    ignored_dirs = set()
+    for root, dirs, files in os.walk(repo_path):
+        ignored_dirs.update(get_ignored_dirs(root, files))
+        dirs[:] = [
+            name for name in dirs
+            if name != '.git' and os.path.normpath(os.path.join(root, name)) not in ignored_dirs
+        ]
+        walked_dirs.append(root)
+        if not files:
+            continue
+        include_dir = Path(root)
+        while include_dir not in include_dirs:
+            include_dirs.add(include_dir)
+            if include_dir == Path(repo_path) or include_dir.parent == include_dir:
+                break
+            include_dir = include_dir.parent
+    args = ["-x", "c++"]
+    for root in walked_dirs:
+        if Path(root) in include_dirs:
+            args.extend(["-I", root])
+    return args
+
+def find_compilation_database(repo_path: str,
+                              compilation_database: str | None = None) -> str | None:
+    '''
+    Returns directory with compilation database.
+
+    Parameters:
+    `repo_path` (`str`): path to the repository.
+    `compilation_database` (`str | None`): path to `compile_commands.json`
+    or to directory containing it. If it is `None`, the database is looked up
+    in the root of the repository.
+
+    Returns:
+    `str | None`: directory with compilation database or `None` if there is no database.
+
+    Raises:
+    `ValueError`: if `compilation_database` is given, but there is no database at it.
+    '''
+    if compilation_database is None:
+        if not Path(repo_path).joinpath(COMPILATION_DATABASE_NAME).is_file():
+            return None
+        return str(repo_path)
+    database_dir = Path(compilation_database)
+    if database_dir.is_file():
+        database_dir = database_dir.parent
+    if not database_dir.joinpath(COMPILATION_DATABASE_NAME).is_file():
+        raise ValueError(f'{COMPILATION_DATABASE_NAME} is not found at {compilation_database}')
+    return str(database_dir)
+
+def get_parse_commands(repo_path: str, c_cxx_files: list[Path],
+                       compilation_database: str | None = None
+                       ) -> list[tuple[str, list[str]]]:
+    '''
+    Returns path and arguments for parsing each of `c_cxx_files`.
+
+    Files are parsed with their own flags from compilation database.
+    Libclang interpolates flags of files missing in the database,
+    usually headers, from files of the database with similar paths.
+    Without compilation database files are parsed with include arguments
+    inferred by `get_include_args`, which are calculated only once.
+
+    Parameters:
+    `repo_path` (`str`): path to the repository.
+    `c_cxx_files` (`list[Path]`): C/C++ files to parse.
+    `compilation_database` (`str | None`): path to compilation database,
+    see `find_compilation_database`.
+
+    Returns:
+    `list[tuple[str, list[str]]]`: path and arguments of each file in order of `c_cxx_files`.
+    '''
+    database_dir = find_compilation_database(repo_path, compilation_database)
+    database = None
+    if database_dir is not None:
+        database = clang.cindex.CompilationDatabase.fromDirectory(database_dir)
+    inferred_args = None
+    commands = []
+    for file_path in c_cxx_files:
+        compile_commands = None
+        if database is not None:
+            compile_commands = database.getCompileCommands(os.path.abspath(file_path))
+        if compile_commands:
+            commands.append(_get_command_args(next(iter(compile_commands))))
+            continue
+        if inferred_args is None:
+            inferred_args = get_include_args(repo_path)
+        commands.append((str(file_path), inferred_args))
+    return commands
+
+def _get_command_args(command: clang.cindex.CompileCommand) -> tuple[str, list[str]]:
+    '''
+    Converts compile command to absolute path of source file and arguments for parsing it.
+    Compiler, output and source file are removed from arguments,
+    relative paths are resolved against directory of the command.
+    '''
+    source_file = os.path.normpath(os.path.join(command.directory, command.filename))
+    args = []
+    arguments = list(command.arguments)[1:]
+    skip_next = False
+    for arg in arguments:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == '-o':
+            skip_next = True
+            continue
+        if arg in ('-c', '--') or arg.startswith('-o'):
+            continue
+        if os.path.normpath(os.path.join(command.directory, arg)) == source_file:
+            continue
+        args.append(arg)
+    return source_file, [f'-working-directory={command.directory}'] + args
@@ -0,0 +1,61 @@
+'''
+Module for keeping memory of analysis within a budget.
+
+Resident memory is read from `/proc`, so the budget is enforced only on Linux.
+'''
+
+import ctypes
+import multiprocessing
+import os
+import re
+
+import clang.cindex
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def parse_memory_size(size: str) -> int:
+    '''
+    Returns number of bytes in `size`, e.g. `4G`, `512M`, `1024K` or `1000000`.
+
+    Raises:
+    ValueError: if `size` is not a positive size.
+    '''
+    match = re.fullmatch(r'\s*(\d+)\s*([KMGT]?)i?B?\s*', size, re.IGNORECASE)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f'invalid memory size: {size}')
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+def get_resident_memory() -> int | None:
+    '''
+    Returns resident memory of this process and its child processes in bytes
+    or `None` if it can not be read.
+    '''
+    total = 0
+    for pid in [os.getpid()] + [child.pid for child in multiprocessing.active_children()]:
+        try:
+            with open(f'/proc/{pid}/statm', 'r', encoding='utf-8') as f:
+                total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except FileNotFoundError:
+            # child process has just exited
+            continue
+        except (OSError, ValueError, IndexError):
+            return None
+    return total
+
+def dispose_translation_unit(translation_unit: clang.cindex.TranslationUnit):
+    '''
+    Releases native memory of `translation_unit` right away instead of
+    when it is garbage collected. Neither it nor its cursors may be used afterwards.
+    '''
+    clang.cindex.conf.lib.clang_disposeTranslationUnit(translation_unit)
+    # disposal of null translation unit by the destructor is ignored by libclang
+    translation_unit.obj = translation_unit._as_parameter_ = None  # pylint: disable=W0201
+
+def release_free_memory():
+    '''
+    Returns memory freed by libclang to the system, where C library supports it.
+    '''
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (AttributeError, OSError):
+        pass
@@ -0,0 +1,59 @@
+'''
+Module with options of AST analysis.
+'''
+
+from cpp_stats.ast.compilation import find_compilation_database
+
+# pylint: disable=R0903
+class AnalysisOptions:
+    '''
+    Stores options that control how C/C++ files are parsed and analyzed.
+    '''
+
+    def __init__(self, jobs: int = 1, compilation_database: str | None = None,
+                 precompiled_headers: bool = False, metrics: list[str] | None = None,
+                 attribute_headers: bool = False, cache_dir: str | None = None,
+                 since: str | None = None, max_memory: int | None = None,
+                 skip_function_bodies: bool = False):
+        '''
+        Initializes options.
+
+        Parameters:
+        jobs (int): Number of processes parsing files in parallel.
+        compilation_database (str | None): Path to `compile_commands.json` or its directory.
+        By default it is looked up in the root of the repository.
+        precompiled_headers (bool): Whether to parse the most frequently included headers
+        once into precompiled header shared by all files.
+        metrics (list[str] | None): Names of metrics to calculate, all metrics if `None`.
+        attribute_headers (bool): Whether to analyze headers inside the first source
+        that includes them instead of parsing them on their own.
+        cache_dir (str | None): Directory where results of separate files are cached
+        between runs. Files are parsed again only if they or their includes changed.
+        since (str | None): Git revision. If it is given, contents of files tracked at it
+        are not checked for results cached while the files did not differ from the revision,
+        only files changed since it according to git, and files including them, are parsed
+        again. Untracked files and other results are checked as usual. Requires `cache_dir`.
+        max_memory (int | None): Memory budget in bytes. If it is given, each translation unit
+        is released right after it is analyzed and no more files are given to parallel
+        workers while resident memory nears the budget.
+        skip_function_bodies (bool): Whether to parse files without bodies of functions
+        if requested metrics do not need them. Results are approximate: classes declared
+        inside bodies of functions and their methods are not counted.
+
+        Raises:
+        ValueError: if `since` is given without `cache_dir`
+        or there is no compilation database at `compilation_database`.
+        '''
+        if since is not None and cache_dir is None:
+            raise ValueError('analysis since revision requires cache directory')
+        if compilation_database is not None:
+            find_compilation_database('', compilation_database)
+        self.jobs = jobs
+        self.compilation_database = compilation_database
+        self.precompiled_headers = precompiled_headers
+        self.metrics = metrics
+        self.attribute_headers = attribute_headers
+        self.cache_dir = cache_dir
+        self.since = since
+        self.max_memory = max_memory
+        self.skip_function_bodies = skip_function_bodies
@@ -0,0 +1,141 @@
+'''
+Module for building precompiled header shared between translation units.
+'''
+
+from collections import Counter
+from pathlib import Path
+import os
+import re
+
+import clang.cindex
+
+from cpp_stats.ast.compilation import is_header_file
+
+MAX_PRECOMPILED_HEADERS = 64
+MIN_INCLUDE_COUNT = 2
+
+_include_pattern = re.compile(r'^\s*#\s*include\s*(<[^>\n]+>|"[^"\n]+")', re.MULTILINE)
+
+def get_frequent_includes(c_cxx_files: list[Path]) -> list[str]:
+    '''
+    Returns `#include` arguments that are used in at least `MIN_INCLUDE_COUNT` files.
+    At most `MAX_PRECOMPILED_HEADERS` of the most frequent includes are returned
+    in order of their first appearance, so dependent headers keep their order.
+
+    Parameters:
+    `c_cxx_files` (`list[Path]`): C/C++ files to scan.
+
+    Returns:
+    `list[str]`: includes with their delimiters, e.g. `<vector>` or `"core.hpp"`.
+    '''
+    return _get_frequent_includes(_read_includes(c_cxx_files))
+
+def _read_includes(c_cxx_files: list[Path]) -> list[list[str]]:
+    '''
+    Returns `#include` arguments of each file without duplicates, in order of appearance.
+    '''
+    result = []
+    for file_path in c_cxx_files:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            result.append(list(dict.fromkeys(_include_pattern.findall(f.read()))))
+    return result
+
+def _get_frequent_includes(includes_of_files: list[list[str]]) -> list[str]:
+    '''
+    Returns includes that are used by at least `MIN_INCLUDE_COUNT` files,
+    see `get_frequent_includes`.
+    '''
+    counter = Counter()
+    first_seen = {}
+    for includes in includes_of_files:
+        for include in includes:
+            first_seen.setdefault(include, len(first_seen))
+        counter.update(includes)
+    frequent = [
+        include for include, count in counter.most_common(MAX_PRECOMPILED_HEADERS)
+        if count >= MIN_INCLUDE_COUNT
+    ]
+    return sorted(frequent, key=first_seen.get)
+
+def use_precompiled_header(index: clang.cindex.Index,
+                           parse_commands: list[tuple[str, list[str]]],
+                           directory: str
+                           ) -> tuple[list[tuple[str, list[str]]], list[str]]:
+    '''
+    Builds precompiled header from the most frequently included headers
+    and adds it to arguments of `parse_commands`.
+
+    Precompiled header is used only if all files are parsed with the same arguments.
+    Headers are parsed without it, otherwise include guards of precompiled headers
+    would hide their content, e.g. of `b/util.h` with the same guard as `a/util.h`.
+    Headers of precompiled header are found by include paths, so files that would find
+    a header with the same name next to them, e.g. `b/util.h` instead of `a/util.h`,
+    are parsed without it as well.
+    If precompiled header can not be built, `parse_commands` are returned unchanged.
+
+    Included files of precompiled header are not reported by translation units
+    that use it, so they are returned as well.
+
+    Parameters:
+    `index` (`clang.cindex.Index`): index used to build precompiled header.
+    `parse_commands` (`list[tuple[str, list[str]]]`): path and arguments of each file.
+    `directory` (`str`): directory where precompiled header is stored.
+
+    Returns:
+    `tuple[list[tuple[str, list[str]]], list[str]]`: path and arguments of each file
+    and files included by precompiled header.
+    '''
+    if len(parse_commands) < MIN_INCLUDE_COUNT:
+        return parse_commands, []
+    args = parse_commands[0][1]
+    if any(file_args != args for _, file_args in parse_commands):
+        return parse_commands, []
+    includes_of_files = _read_includes([file_path for file_path, _ in parse_commands])
+    includes = _get_frequent_includes(includes_of_files)
+    if len(includes) == 0:
+        return parse_commands, []
+    header_path = os.path.join(directory, 'cpp_stats_pch.hpp')
+    pch_path = os.path.join(directory, 'cpp_stats_pch.pch')
+    with open(header_path, 'w', encoding='utf-8') as f:
+        f.writelines(f'#include {include}\n' for include in includes)
+    try:
+        translation_unit = index.parse(
+            header_path,
+            args=args,
+            options=clang.cindex.TranslationUnit.PARSE_INCOMPLETE
+        )
+        translation_unit.save(pch_path)
+    except (clang.cindex.TranslationUnitLoadError, clang.cindex.TranslationUnitSaveError):
+        return parse_commands, []
+    dependencies = []
+    resolved = {}
+    for inclusion in translation_unit.get_includes():
+        dependencies.append(inclusion.include.name)
+        if inclusion.depth == 1:
+            # precompiled header has one include per line
+            resolved[includes[inclusion.location.line - 1]] = \
+                os.path.realpath(inclusion.include.name)
+    precompiled_files = {os.path.realpath(file_name) for file_name in dependencies}
+    pch_args = args + ['-include-pch', pch_path]
+    return [
+        (file_path, pch_args
+         if not is_header_file(file_path)
+         and os.path.realpath(file_path) not in precompiled_files
+         and _resolves_as_precompiled(file_path, file_includes, resolved) else args)
+        for (file_path, _), file_includes in zip(parse_commands, includes_of_files)
+    ], dependencies
+
+def _resolves_as_precompiled(file_path: str, includes: list[str],
+                             resolved: dict[str, str]) -> bool:
+    '''
+    Says whether quoted `includes` of file, which are looked up next to the file first,
+    find the same headers as precompiled header, whose real paths are `resolved`.
+    '''
+    directory = os.path.dirname(file_path)
+    for include in includes:
+        if not include.startswith('"') or include not in resolved:
+            continue
+        local_path = os.path.join(directory, include[1:-1])
+        if os.path.isfile(local_path) and os.path.realpath(local_path) != resolved[include]:
+            return False
+    return True
@@ -0,0 +1,3 @@
+'''
+Benchmarks of cpp-stats on generated C++ repositories.
+'''
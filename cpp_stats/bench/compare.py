@@ -0,0 +1,137 @@
+'''
+Module that compares results of benchmarks to find regressions.
+
+Each scenario is summarized by median of its runs, and noise is estimated
+by median absolute deviation, so a single slow run does not change the verdict.
+'''
+
+import json
+import statistics
+
+from cpp_stats.bench.scenarios import RESULTS_FORMAT_VERSION
+
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+NEW = 'new'
+MISSING = 'missing'
+
+# scales median absolute deviation to standard deviation of normal distribution
+_MAD_TO_SIGMA = 1.4826
+
+def load_results(path: str) -> dict:
+    '''
+    Returns results of benchmarks stored in JSON file `path`.
+
+    Raises:
+    ValueError: if file does not contain results of supported format.
+    '''
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f'results can not be read from {path}: {e}') from e
+    if not isinstance(results, dict) or results.get('format_version') != RESULTS_FORMAT_VERSION:
+        raise ValueError(f'{path} does not contain results of format {RESULTS_FORMAT_VERSION}')
+    return results
+
+def median_absolute_deviation(values: list[float]) -> float:
+    '''
+    Returns median of absolute deviations of `values` from their median.
+    '''
+    center = statistics.median(values)
+    return statistics.median(abs(value - center) for value in values)
+
+# pylint: disable=R0902,R0903,R0913,R0917
+class ScenarioComparison:
+    '''
+    Comparison of runs of one scenario in baseline and current results.
+    '''
+
+    def __init__(self, name: str, baseline: list[float] | None, current: list[float] | None,
+                 threshold: float, noise_factor: float):
+        '''
+        Compares medians of runs.
+
+        Parameters:
+        name (str): Name of scenario.
+        baseline (list[float] | None): Times of baseline runs, `None` if scenario is new.
+        current (list[float] | None): Times of current runs, `None` if scenario is missing.
+        threshold (float): Relative change of median, e.g. `0.1`, that is significant.
+        noise_factor (float): Change is significant only if it exceeds this number of
+        standard deviations of noise, estimated by median absolute deviation.
+        '''
+        self.name = name
+        self.baseline = None if baseline is None else statistics.median(baseline)
+        self.current = None if current is None else statistics.median(current)
+        self.delta = None
+        self.relative_delta = None
+        self.noise = None
+        if baseline is None:
+            self.status = NEW
+            return
+        if current is None:
+            self.status = MISSING
+            return
+        self.delta = self.current - self.baseline
+        self.relative_delta = self.delta / self.baseline if self.baseline > 0 else 0.0
+        self.noise = noise_factor * _MAD_TO_SIGMA * max(
+            median_absolute_deviation(baseline),
+            median_absolute_deviation(current)
+        )
+        if abs(self.delta) <= self.noise or abs(self.relative_delta) <= threshold:
+            self.status = UNCHANGED
+        elif self.delta > 0:
+            self.status = REGRESSION
+        else:
+            self.status = IMPROVEMENT
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1,
+                    noise_factor: float = 3.0, time_kind: str = 'wall') -> list[ScenarioComparison]:
+    '''
+    Returns comparisons of all scenarios of `baseline` and `current` results.
+
+    Parameters:
+    baseline (dict): Results of baseline, see `run_benchmarks`.
+    current (dict): Results to compare with baseline.
+    threshold (float): Relative change of median, e.g. `0.1`, that is significant.
+    noise_factor (float): Number of standard deviations of noise a change must exceed.
+    time_kind (str): Compared time, `wall` or `cpu`.
+    '''
+    names = list(baseline['scenarios'])
+    names += [name for name in current['scenarios'] if name not in baseline['scenarios']]
+    comparisons = []
+    for name in names:
+        baseline_runs = baseline['scenarios'].get(name, None)
+        current_runs = current['scenarios'].get(name, None)
+        comparisons.append(ScenarioComparison(
+            name,
+            None if baseline_runs is None else [run[time_kind] for run in baseline_runs],
+            None if current_runs is None else [run[time_kind] for run in current_runs],
+            threshold,
+            noise_factor
+        ))
+    return comparisons
+
+def format_comparisons(comparisons: list[ScenarioComparison]) -> str:
+    '''
+    Returns comparisons as a table with a row per scenario.
+    '''
+    rows = [('scenario', 'baseline', 'current', 'delta', 'noise', 'status')]
+    for comparison in comparisons:
+        rows.append((
+            comparison.name,
+            _format_seconds(comparison.baseline),
+            _format_seconds(comparison.current),
+            '-' if comparison.relative_delta is None else f'{comparison.relative_delta:+.1%}',
+            _format_seconds(comparison.noise),
+            comparison.status,
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join(
+        '  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+def _format_seconds(value: float | None) -> str:
+    return '-' if value is None else f'{value:.3f}s'
@@ -0,0 +1,175 @@
+'''
+Module that generates synthetic C++ repositories for benchmarks.
+
+Repository is determined by its parameters and seed, so the same corpus
+can be generated again on another machine to compare results.
+'''
+
+from pathlib import Path
+import random
+
+_OPERATORS = ['+', '-', '*', '&', '|', '^']
+_COMPARISONS = ['<', '>', '<=', '>=', '==', '!=']
+
+# pylint: disable=R0902,R0903,R0913,R0917
+class CorpusOptions:
+    '''
+    Stores parameters of generated repository.
+    '''
+
+    def __init__(self, files: int = 50, classes_per_file: int = 4, methods_per_class: int = 6,
+                 nesting_depth: int = 3, expression_density: int = 4, include_fan_out: int = 3,
+                 seed: int = 0):
+        '''
+        Initializes parameters.
+
+        Parameters:
+        files (int): Number of modules, each is a header and a source.
+        classes_per_file (int): Number of classes declared in each header.
+        methods_per_class (int): Number of methods of each class.
+        nesting_depth (int): Depth of nested control statements in bodies of methods.
+        expression_density (int): Number of binary operators in each expression.
+        include_fan_out (int): Number of headers of other modules included by each source.
+        seed (int): Seed of random choices.
+
+        Raises:
+        ValueError: if a parameter is negative or there are no files.
+        '''
+        if files < 1:
+            raise ValueError('corpus must have at least one file')
+        if min(classes_per_file, methods_per_class, nesting_depth,
+               expression_density, include_fan_out) < 0:
+            raise ValueError('parameters of corpus must not be negative')
+        self.files = files
+        self.classes_per_file = classes_per_file
+        self.methods_per_class = methods_per_class
+        self.nesting_depth = nesting_depth
+        self.expression_density = expression_density
+        self.include_fan_out = include_fan_out
+        self.seed = seed
+
+    def as_dict(self) -> dict[str, int]:
+        '''
+        Returns parameters by names.
+        '''
+        return dict(vars(self))
+
+def generate_corpus(path: Path, options: CorpusOptions | None = None) -> list[Path]:
+    '''
+    Writes repository with modules `include/module_N.hpp` and `src/module_N.cpp`
+    into directory `path` and returns paths of written files.
+
+    Parameters:
+    path (Path): Directory of repository, it is created if it does not exist.
+    options (CorpusOptions | None): Parameters of repository, default ones if `None`.
+    '''
+    if options is None:
+        options = CorpusOptions()
+    rng = random.Random(options.seed)
+    path = Path(path)
+    path.joinpath('include').mkdir(parents=True, exist_ok=True)
+    path.joinpath('src').mkdir(parents=True, exist_ok=True)
+    written = []
+    for module in range(options.files):
+        header = path.joinpath('include', f'module_{module}.hpp')
+        source = path.joinpath('src', f'module_{module}.cpp')
+        classes = [
+            _generate_class(rng, module, i, options)
+            for i in range(options.classes_per_file)
+        ]
+        header.write_text(_generate_header(module, classes), encoding='utf-8')
+        source.write_text(_generate_source(rng, module, classes, options), encoding='utf-8')
+        written += [header, source]
+    return written
+
+def _generate_class(rng: random.Random, module: int, index: int, options: CorpusOptions) -> dict:
+    '''
+    Returns description of class: its name, fields and methods with their parameters.
+    '''
+    fields = [f'field_{i}' for i in range(rng.randint(1, 4))]
+    methods = [
+        {
+            'name': f'method_{i}',
+            'params': [f'arg_{j}' for j in range(rng.randint(0, 3))],
+        }
+        for i in range(options.methods_per_class)
+    ]
+    return {'name': f'Module{module}Class{index}', 'fields': fields, 'methods': methods}
+
+def _generate_header(module: int, classes: list[dict]) -> str:
+    lines = ['#pragma once', '', f'namespace module_{module} {{', '']
+    for cls in classes:
+        lines.append(f'class {cls["name"]} {{')
+        lines.append('public:')
+        for method in cls['methods']:
+            params = ', '.join(f'int {param}' for param in method['params'])
+            lines.append(f'    int {method["name"]}({params});')
+        lines.append('private:')
+        for field in cls['fields']:
+            lines.append(f'    int {field} = 0;')
+        lines.append('};')
+        lines.append('')
+    lines.append(f'}} // namespace module_{module}')
+    return '\n'.join(lines) + '\n'
+
+def _generate_source(rng: random.Random, module: int, classes: list[dict],
+                     options: CorpusOptions) -> str:
+    lines = [f'#include "../include/module_{module}.hpp"']
+    other_modules = [i for i in range(options.files) if i != module]
+    for included in sorted(rng.sample(other_modules,
+                                      min(options.include_fan_out, len(other_modules)))):
+        lines.append(f'#include "../include/module_{included}.hpp"')
+    lines += ['', f'namespace module_{module} {{', '']
+    for cls in classes:
+        for method in cls['methods']:
+            params = ', '.join(f'int {param}' for param in method['params'])
+            lines.append(f'int {cls["name"]}::{method["name"]}({params}) {{')
+            variables = cls['fields'] + method['params']
+            lines.append('    int result = 0;')
+            lines += _generate_block(rng, variables + ['result'], options.nesting_depth,
+                                     options.expression_density, 1)
+            lines.append('    return result;')
+            lines.append('}')
+            lines.append('')
+    lines.append(f'}} // namespace module_{module}')
+    return '\n'.join(lines) + '\n'
+
+def _generate_block(rng: random.Random, variables: list[str], depth: int,
+                    density: int, indent: int) -> list[str]:
+    '''
+    Returns statements of block with control statements nested `depth` times.
+    '''
+    prefix = '    ' * indent
+    lines = [f'{prefix}result += {_generate_expression(rng, variables, density)};']
+    if depth == 0:
+        return lines
+    kind = rng.choice(['if', 'for', 'while'])
+    condition = (f'{rng.choice(variables)} {rng.choice(_COMPARISONS)} '
+                 f'{_generate_expression(rng, variables, density)}')
+    if kind == 'if':
+        lines.append(f'{prefix}if ({condition}) {{')
+    elif kind == 'for':
+        counter = f'i{depth}'
+        lines.append(f'{prefix}for (int {counter} = 0; {counter} < {rng.randint(2, 9)}; '
+                     f'++{counter}) {{')
+    else:
+        lines.append(f'{prefix}while ({condition} && result < {rng.randint(10, 99)}) {{')
+    lines += _generate_block(rng, variables, depth - 1, density, indent + 1)
+    if kind == 'while':
+        lines.append(f'{prefix}    ++result;')
+    lines.append(f'{prefix}}}')
+    if kind == 'if':
+        lines.append(f'{prefix}else {{')
+        lines.append(f'{prefix}    result -= {rng.choice(variables)};')
+        lines.append(f'{prefix}}}')
+    return lines
+
+def _generate_expression(rng: random.Random, variables: list[str], density: int) -> str:
+    '''
+    Returns expression with `density` binary operators.
+    '''
+    expression = rng.choice(variables)
+    for _ in range(density):
+        operand = rng.choice(variables + [str(rng.randint(1, 9))])
+        expression = f'{expression} {rng.choice(_OPERATORS)} {operand}'
+    return expression
@@ -0,0 +1,109 @@
+'''
+Command line interface of benchmarks.
+'''
+
+from pathlib import Path
+import json
+import sys
+import tempfile
+
+import click
+
+from cpp_stats.bench.compare import REGRESSION, compare_results, format_comparisons
+from cpp_stats.bench.compare import load_results
+from cpp_stats.bench.corpus import CorpusOptions, generate_corpus
+from cpp_stats.bench.scenarios import get_scenarios, run_benchmarks
+
+@click.group()
+def main():
+    '''
+    Benchmarks of cpp-stats on generated C++ repositories.
+    '''
+
+@main.command()
+@click.option('--output', default='bench-results.json',
+              help='Path to JSON file where to store results.')
+@click.option('--repo', 'repo_path', default=None,
+              help='Benchmark existing repository instead of generated one.')
+@click.option('--corpus-dir', default=None,
+              help='Directory where to generate repository. Temporary directory by default.')
+@click.option('--files', default=50, type=click.IntRange(min=1),
+              help='Number of generated modules, each is a header and a source.')
+@click.option('--classes-per-file', default=4, type=click.IntRange(min=0))
+@click.option('--methods-per-class', default=6, type=click.IntRange(min=0))
+@click.option('--nesting-depth', default=3, type=click.IntRange(min=0))
+@click.option('--expression-density', default=4, type=click.IntRange(min=0),
+              help='Number of binary operators in each generated expression.')
+@click.option('--include-fan-out', default=3, type=click.IntRange(min=0),
+              help='Number of headers of other modules included by each source.')
+@click.option('--seed', default=0, help='Seed of generated repository.')
+@click.option('--scenario', 'scenario_names', multiple=True,
+              type=click.Choice(list(get_scenarios())),
+              help='Scenario to run, can be repeated. All available scenarios by default.')
+@click.option('--repeat', default=3, type=click.IntRange(min=1),
+              help='Number of runs of each scenario.')
+@click.option('--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of processes parsing files in parallel.')
+# pylint: disable=R0913,R0914,R0917
+def run(output, repo_path, corpus_dir, files, classes_per_file, methods_per_class,
+        nesting_depth, expression_density, include_fan_out, seed, scenario_names, repeat, jobs):
+    '''
+    Runs benchmark scenarios and stores wall and CPU time of each run as JSON.
+    '''
+    corpus = None
+    with tempfile.TemporaryDirectory(prefix='cpp-stats-bench-') as temp_dir:
+        if repo_path is None:
+            corpus_options = CorpusOptions(files, classes_per_file, methods_per_class,
+                                           nesting_depth, expression_density,
+                                           include_fan_out, seed)
+            repo_path = corpus_dir if corpus_dir is not None else temp_dir
+            generate_corpus(Path(repo_path), corpus_options)
+            corpus = corpus_options.as_dict()
+        results = run_benchmarks(
+            Path(repo_path),
+            list(scenario_names) if scenario_names else None,
+            repeat,
+            corpus,
+            jobs=jobs
+        )
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+        f.write('\n')
+    for name, runs in results['scenarios'].items():
+        best = min(run['wall'] for run in runs)
+        click.echo(f'{name}: {best:.3f}s')
+
+@main.command()
+@click.argument('baseline')
+@click.argument('current')
+@click.option('--threshold', default=10.0, type=click.FloatRange(min=0),
+              help='Change of median time in percent that is a regression.')
+@click.option('--noise-factor', default=3.0, type=click.FloatRange(min=0),
+              help='Number of standard deviations of noise, estimated by median '
+              'absolute deviation of runs, that a change must exceed.')
+@click.option('--time', 'time_kind', default='wall', type=click.Choice(['wall', 'cpu']),
+              help='Compared time.')
+def compare(baseline, current, threshold, noise_factor, time_kind):
+    '''
+    Compares results of benchmarks BASELINE and CURRENT
+    and exits with code 1 if any scenario regressed.
+    '''
+    try:
+        comparisons = compare_results(
+            load_results(baseline),
+            load_results(current),
+            threshold / 100,
+            noise_factor,
+            time_kind
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    click.echo(format_comparisons(comparisons))
+    regressions = [comparison.name for comparison in comparisons
+                   if comparison.status == REGRESSION]
+    if regressions:
+        click.echo(f'Regressions: {", ".join(regressions)}', err=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+'''
+Module with benchmark scenarios and their runner.
+
+Each scenario is run several times on the same repository, wall and CPU time
+of each run are stored, so results of different versions can be compared.
+'''
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+import os
+import platform
+import re
+import time
+
+import clang.cindex
+
+from cpp_stats.analyzer import CodeAnalyzer
+from cpp_stats.ast.cache import get_cpp_stats_version, get_libclang_version
+from cpp_stats.cpp_stats import CppStats
+from cpp_stats.file_sieve import sieve_c_cxx_files
+from cpp_stats.metrics.lines_of_code import LinesOfCodeCalculator
+
+RESULTS_FORMAT_VERSION = 1
+
+# metrics calculated without Clang
+_BASIC_METRICS = ['NUMBER_OF_C_C++_FILES', 'LINES_OF_CODE']
+
+def get_metric_families() -> dict[str, list[str]]:
+    '''
+    Returns metrics calculated with Clang grouped by families,
+    e.g. `halstead` or `lcom`. Aggregations of the same value belong to one family.
+    '''
+    families = {}
+    for name in CppStats('.').list():
+        if name not in _BASIC_METRICS:
+            families.setdefault(_get_metric_family(name), []).append(name)
+    return families
+
+def _get_metric_family(metric_name: str) -> str:
+    value = re.sub(r'^(MEAN|MAX|MIN|SUM)_', '', metric_name)
+    if value.startswith('HALSTEAD_'):
+        return 'halstead'
+    if re.fullmatch(r'LCOM\d', value):
+        return 'lcom'
+    if value in ('TCC', 'LCC'):
+        return 'tcc_lcc'
+    if value == 'NUMBER_OF_METHODS_PER_CLASS':
+        return 'number_of_methods'
+    return value.lower()
+
+# pylint: disable=R0903
+class Scenario:
+    '''
+    Benchmarked operation on repository.
+    '''
+
+    def __init__(self, name: str, run: Callable[[Path, list[Path], dict], None],
+                 needs_clang: bool):
+        '''
+        Initializes scenario.
+
+        Parameters:
+        name (str): Name of scenario.
+        run (Callable[[Path, list[Path], dict], None]): Runs scenario on repository,
+        its C/C++ files and options of analysis.
+        needs_clang (bool): Whether scenario parses files with libclang.
+        '''
+        self.name = name
+        self.run = run
+        self.needs_clang = needs_clang
+
+def _run_sieve(repo_path: Path, _files: list[Path], options: dict):
+    sieve_c_cxx_files(repo_path, options.get('jobs', 1))
+
+def _run_lines_of_code(_repo_path: Path, files: list[Path], _options: dict):
+    LinesOfCodeCalculator()(files)
+
+def _analyze_metrics(metric_names: list[str]) -> Callable[[Path, list[Path], dict], None]:
+    def run(repo_path: Path, files: list[Path], options: dict):
+        analyzer = CodeAnalyzer(
+            str(repo_path),
+            files,
+            os.getenv('LIBCLANG_LIBRARY_PATH'),
+            **options
+        )
+        analyzer.analyze(metric_names)
+    return run
+
+def _run_report(repo_path: Path, _files: list[Path], options: dict):
+    CppStats(str(repo_path), True, **options).as_xml()
+
+def get_scenarios() -> dict[str, Scenario]:
+    '''
+    Returns all scenarios by names: file discovery, lines of code, analysis of all metrics
+    with Clang, analysis of each family of metrics and generation of the whole report.
+    '''
+    families = get_metric_families()
+    scenarios = [
+        Scenario('sieve', _run_sieve, False),
+        Scenario('lines_of_code', _run_lines_of_code, False),
+        Scenario(
+            'analyze_ast',
+            _analyze_metrics([name for names in families.values() for name in names]),
+            True
+        ),
+    ]
+    for family, metric_names in families.items():
+        scenarios.append(Scenario(f'family:{family}', _analyze_metrics(metric_names), True))
+    scenarios.append(Scenario('report', _run_report, True))
+    return {scenario.name: scenario for scenario in scenarios}
+
+def run_benchmarks(repo_path: Path, scenario_names: list[str] | None = None,
+                   repeat: int = 3, corpus: dict | None = None, **options) -> dict:
+    '''
+    Runs scenarios on repository `repo_path` and returns results that can be stored as JSON.
+
+    Parameters:
+    repo_path (Path): Path to the repository.
+    scenario_names (list[str] | None): Names of scenarios to run.
+    All scenarios if `None`, only those without Clang if libclang is not found.
+    repeat (int): Number of runs of each scenario.
+    corpus (dict | None): Parameters of generated repository stored with results.
+    options: Options of analysis, see `AnalysisOptions`.
+
+    Raises:
+    ValueError: if scenario is unknown or needs libclang that is not found.
+    '''
+    scenarios = get_scenarios()
+    has_clang = os.getenv('LIBCLANG_LIBRARY_PATH') is not None
+    if scenario_names is None:
+        scenario_names = [
+            name for name, scenario in scenarios.items()
+            if has_clang or not scenario.needs_clang
+        ]
+    for name in scenario_names:
+        if name not in scenarios:
+            raise ValueError(f'unknown scenario: {name}')
+        if scenarios[name].needs_clang and not has_clang:
+            raise ValueError(f'scenario {name} needs libclang, set LIBCLANG_LIBRARY_PATH')
+    files = sieve_c_cxx_files(Path(repo_path))
+    results = {}
+    for name in scenario_names:
+        runs = []
+        for _ in range(repeat):
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            scenarios[name].run(Path(repo_path), files, options)
+            runs.append({
+                'wall': time.perf_counter() - wall,
+                'cpu': time.process_time() - cpu,
+            })
+        results[name] = runs
+    return {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'cpp_stats': get_cpp_stats_version(),
+            'libclang': get_libclang_version() if clang.cindex.Config.loaded else None,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'corpus': corpus,
+        'files': len(files),
+        'options': options,
+        'scenarios': results,
+    }
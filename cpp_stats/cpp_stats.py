@@ -4,23 +4,51 @@ Main class for creating report about quality of C/C++ repository.
 
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator, TextIO
+from xml.sax.saxutils import escape
+from contextlib import nullcontext
 import os
 
 from cpp_stats.file_sieve import sieve_c_cxx_files
 from cpp_stats.analyzer import CodeAnalyzer
+from cpp_stats.ast.options import AnalysisOptions
+from cpp_stats.profiling import DEFAULT_TOP_FILES, Profiler
+from cpp_stats.instrumentation import CallCounter
+from cpp_stats.progress import ProgressReporter
 
+# pylint: disable=R0902,R0913,R0917
 class CppStats:
     '''
     Class for calculating C++ metrics in a given repository.
     '''
 
-    def __init__(self, path_to_repo: str, use_clang: bool = False):
+    def __init__(self, path_to_repo: str, use_clang: bool = False, profile: bool = False,
+                 count_calls: bool = False, progress: ProgressReporter | None = None,
+                 **options):
         '''
-        Initializes CppStats object.
+        Initializes CppStats object. Files are found and metrics are calculated
+        only when they are requested.
         
         Parameters:
         path_to_repo (str): Path to the repository.
         use_clang (bool): Whether to use Clang or not.
+        profile (bool): Whether to measure time of analysis, see `profile`.
+        count_calls (bool): Whether to count calls into libclang, see `call_counts`.
+        progress (ProgressReporter | None): Reporter of files done, throughput and ETA
+        of long phases, nothing is reported if `None`.
+        options: Options of analysis with Clang, see `AnalysisOptions`:
+        jobs (int): Number of processes parsing files in parallel.
+        compilation_database (str | None): Path to `compile_commands.json` or its directory.
+        By default it is looked up in the root of the repository.
+        precompiled_headers (bool): Whether to share precompiled frequent headers between files.
+        metrics (list[str] | None): Names of metrics to calculate with Clang, all if `None`.
+        attribute_headers (bool): Whether to analyze headers inside sources that include them.
+        cache_dir (str | None): Directory where results of files are cached between runs.
+        since (str | None): Git revision, only files changed since it are parsed again.
+        max_memory (int | None): Memory budget in bytes, translation units are released
+        right after analysis and parallel parsing is throttled near the budget.
+        skip_function_bodies (bool): Whether to skip bodies of functions if requested
+        metrics do not need them, results are approximate.
         '''
         self._use_clang = use_clang
         self._path_to_repo = path_to_repo
@@ -76,15 +104,15 @@ class CppStats:
             'MIN_LCC',
             ]
 
-        self._files = sieve_c_cxx_files(Path(self._path_to_repo))
+        self._options = options
+        self._files = None
+        self._analyzer = None
+        self._profiler = Profiler() if profile else None
+        self._call_counter = CallCounter() if count_calls else None
+        self._progress = progress
         if use_clang:
-            self._analyzer = CodeAnalyzer(
-                path_to_repo,
-                self._files,
-                os.getenv('LIBCLANG_LIBRARY_PATH')
-            )
-        else:
-            self._analyzer = CodeAnalyzer(path_to_repo, self._files, None)
+            # invalid options are reported right away, not on first metric
+            AnalysisOptions(**options)
 
     def list(self) -> list[str]:
         '''
@@ -101,46 +129,111 @@ class CppStats:
         metric_name (str): Metric name.
         '''
         if metric_name == 'NUMBER_OF_C_C++_FILES':
-            return metric_name, len(self._files)
-        metric = self._analyzer.metric(metric_name)
+            return metric_name, len(self._get_files())
+        metric = self._get_analyzer().metric(metric_name)
         if metric is None:
             return "None", None
         return metric.get()
 
+    def profile(self, top_files: int = DEFAULT_TOP_FILES) -> dict | None:
+        '''
+        Returns wall and CPU time spent so far per phase of analysis, per file
+        and per calculator, with `top_files` slowest files, or `None` if profiling is off.
+        Times of parallel workers are summed.
+
+        Parameters:
+        top_files (int): Number of the slowest files listed separately.
+        '''
+        if self._profiler is None:
+            return None
+        return self._profiler.report(top_files)
+
+    def call_counts(self) -> CallCounter | None:
+        '''
+        Returns counter of calls into libclang, visited cursors, tokens and opened
+        source files per file and calculator, or `None` if counting is off.
+        '''
+        return self._call_counter
+
     def as_xml(self):
         '''
         Returns report with all metrics as XML for a given repository.
         '''
 
+        return ''.join(self.iter_xml())
+
+    def write_xml(self, stream: TextIO):
+        '''
+        Writes report with all metrics as XML to `stream`.
+        Each metric is written as soon as it is calculated,
+        so the whole report is never kept in memory.
+
+        Parameters:
+        stream (TextIO): text stream to write to.
+        '''
+        for chunk in self.iter_xml():
+            stream.write(chunk)
+
+    def iter_xml(self) -> Iterator[str]:
+        '''
+        Yields report with all metrics as XML piece by piece.
+        '''
+        yield '<report>\n'
+        yield f'    <report-time>{datetime.now().strftime("%d.%m.%Y")}</report-time>\n'
+        yield f'    <repository-path>{escape(str(self._path_to_repo))}</repository-path>\n'
+        yield '    <metrics>\n'
         if self._use_clang:
-            return self.__clang_report()
-        return self.__regular_report()
-
-    def __regular_report(self) -> str:
-        return (
-            f'<report>\n'
-            f'    <report-time>{datetime.now().strftime("%d.%m.%Y")}</report-time>\n'
-            f'    <repository-path>{self._path_to_repo}</repository-path>\n'
-            f'    <metrics>\n'
-            f'        <metric name="NUMBER_OF_C_C++_FILES">'
-            f'{self.metric("NUMBER_OF_C_C++_FILES")}</metric>\n'
-            f'        <metric name="LINES_OF_CODE">'
-            f'{self.metric("LINES_OF_CODE")[1]}</metric>\n'
-            f'    </metrics>\n'
-            f'</report>\n'
-        )
-
-    def __clang_report(self) -> str:
-        metric_part = ''
-        for metric_name in self._available_metrics:
-            metric_part += (f'        <metric name="{metric_name}">'
-                            f'{self.metric(metric_name)[1]}</metric>\n')
-        return (
-            f'<report>\n'
-            f'    <report-time>{datetime.now().strftime("%d.%m.%Y")}</report-time>\n'
-            f'    <repository-path>{self._path_to_repo}</repository-path>\n'
-            f'    <metrics>\n'
-            f'{metric_part}'
-            f'    </metrics>\n'
-            f'</report>\n'
-        )
+            metric_names = self._available_metrics
+        else:
+            metric_names = ['NUMBER_OF_C_C++_FILES', 'LINES_OF_CODE']
+        # all metrics of the report are calculated in one pass over files
+        self._get_analyzer().analyze(metric_names)
+        for metric_name in metric_names:
+            yield (f'        <metric name="{metric_name}">'
+                   f'{self.__metric_value(metric_name)}</metric>\n')
+        yield '    </metrics>\n'
+        yield '</report>\n'
+
+    def _get_files(self):
+        '''
+        Returns C/C++ files of the repository, they are found on first use.
+        '''
+        if self._files is None:
+            # the repository is walked with as many threads as files are parsed
+            with self._profiler.measure('discovery') if self._profiler else nullcontext():
+                self._files = sieve_c_cxx_files(
+                    Path(self._path_to_repo),
+                    self._options.get('jobs', 1)
+                )
+        return self._files
+
+    def _get_analyzer(self) -> CodeAnalyzer:
+        '''
+        Returns analyzer of the repository, it is created on first use.
+        '''
+        if self._analyzer is None:
+            if self._use_clang:
+                self._analyzer = CodeAnalyzer(
+                    self._path_to_repo,
+                    self._get_files(),
+                    os.getenv('LIBCLANG_LIBRARY_PATH'),
+                    self._profiler,
+                    self._call_counter,
+                    self._progress,
+                    **self._options
+                )
+            else:
+                self._analyzer = CodeAnalyzer(
+                    self._path_to_repo,
+                    self._get_files(),
+                    None,
+                    self._profiler,
+                    None,
+                    self._progress
+                )
+        return self._analyzer
+
+    def __metric_value(self, metric_name: str):
+        if metric_name == 'NUMBER_OF_C_C++_FILES' and not self._use_clang:
+            return self.metric(metric_name)
+        return self.metric(metric_name)[1]
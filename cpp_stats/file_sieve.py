@@ -4,65 +4,143 @@ or located inside ignored directories, which are listed in
 `.gitignore` as ignored or `.gitmodules` as submodules.
 '''
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import os
 
-def sieve_c_cxx_files(path_to_repo: str) -> list[Path] | None:
+def sieve_c_cxx_files(path_to_repo: str, threads: int = 1) -> list[Path] | None:
     '''
-    Returns list of C/C++ files, what have matching extensions: 
+    Returns sorted list of C/C++ files, what have matching extensions: 
     `.h`, `.hpp`, `.C`, `.cc`, `.cpp`, `.CPP`, `.c++`, `.cp`, 
     or `.cxx`.
     
     Files that located in directories specified in `.gitignore` 
     or `.gitmodules` are ignored.
+
+    The repository is walked once, ignored directories are skipped
+    before their contents are listed, so `.gitignore` and `.gitmodules`
+    inside them are not read. Found files are filtered by all ignored directories
+    once the walk is over, so a directory ignored by a `.gitignore` outside of it
+    is skipped regardless of which one is visited first.
+    Like `Path.rglob`, symbolic links to directories are not followed,
+    only files and symbolic links to files are returned.
     
     Parameters:
     path_to_repo (str): Path to the repository.
+    threads (int): Number of threads walking top-level directories in parallel.
     '''
     if path_to_repo is None:
         return None
 
-    submodules_paths = _locate_file(path_to_repo, '.gitmodules', [])
-    submodules_dirs = []
-    for p in submodules_paths:
-        submodules_dirs += _get_git_modules_dirs(p)
+    root = os.path.normpath(str(path_to_repo))
+    # walks share banned directories, adding to a set is atomic
+    banned_dirs = set()
+    c_cxx_files, subdirs = _scan_directory(root, banned_dirs)
+    if threads > 1 and len(subdirs) > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            walks = executor.map(lambda d: _walk_directory(d, banned_dirs), subdirs)
+            for files in walks:
+                c_cxx_files += files
+    else:
+        for subdir in subdirs:
+            c_cxx_files += _walk_directory(subdir, banned_dirs)
+    return sorted(Path(p) for p in c_cxx_files if not _is_inside_banned_dirs(p, banned_dirs))
+
+_possible_extensions = ['*.h', '*.hpp', '*.c', '*.C', '*.cc', '*.cpp',
+                        '*.CPP', '*.c++', '*.cp', '*.cxx']
 
-    gitignore_paths = _locate_file(path_to_repo, '.gitignore', submodules_dirs)
-    gitignore_dirs = []
-    for p in gitignore_paths:
-        gitignore_dirs += _get_git_ignore_dirs(p)
+_c_cxx_suffixes = frozenset(ext[1:] for ext in _possible_extensions)
 
-    banned_dirs = submodules_dirs + gitignore_dirs
+def _walk_directory(directory: str, banned_dirs: set[str]) -> list[str]:
+    '''
+    Returns paths of C/C++ files inside `directory` and its not banned subdirectories.
 
+    Parameters:
+    `directory` (`str`): path to starting directory.
+    `banned_dirs` (`set[str]`): normalized paths of ignored directories,
+    directories listed in found `.gitignore` and `.gitmodules` are added to it.
+    '''
     c_cxx_files = []
-    for ext in _possible_extensions:
-        c_cxx_files += _locate_file(path_to_repo, ext, banned_dirs)
-    c_cxx_files = set(c_cxx_files)
-    return list(c_cxx_files)
+    stack = [directory]
+    while stack:
+        files, subdirs = _scan_directory(stack.pop(), banned_dirs)
+        c_cxx_files += files
+        stack += reversed(subdirs)
+    return c_cxx_files
 
-_possible_extensions = ['*.h', '*.hpp', '*.c', '*.C', '*.cc', '*.cpp',
-                        '*.CPP', '*.c++', '*.cp', '*.cxx']
+def _scan_directory(directory: str, banned_dirs: set[str]) -> tuple[list[str], list[str]]:
+    '''
+    Lists `directory` and returns paths of its C/C++ files and its not banned subdirectories.
+    Directories listed in `.gitmodules` and `.gitignore` of `directory`
+    are added to `banned_dirs` first.
 
-def _locate_file(path_to_search: Path, pattern: str,
-                 banned_dirs: list[Path]) -> list[Path]:
+    Parameters:
+    `directory` (`str`): path to directory.
+    `banned_dirs` (`set[str]`): normalized paths of ignored directories.
     '''
-    Finds all files that match `pattern` inside `path_to_search` directory
-    ignoring `banned_dirs`.
-    
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return [], []
+    banned_dirs.update(get_ignored_dirs(directory, [entry.name for entry in entries]))
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            path = os.path.normpath(entry.path)
+            if path not in banned_dirs:
+                subdirs.append(path)
+        elif ('.' in entry.name and '.' + entry.name.rpartition('.')[2] in _c_cxx_suffixes
+              and _is_file(entry)):
+            files.append(entry.path)
+    return files, subdirs
+
+def get_ignored_dirs(directory: str, file_names: list[str]) -> list[str]:
+    '''
+    Returns normalized paths of directories listed in `.gitmodules` and `.gitignore`
+    of `directory`, if they are among `file_names` of the directory.
+
     Parameters:
-    `path_to_search` (`pathlib.Path`): path to starting directory.
-    `pattern` (`str`): pattern to find.
-    `banned_dirs` (`list[pathlib.Path]`): directories that will be ignored during search.
+    `directory` (`str`): path to directory.
+    `file_names` (`list[str]`): names of files in the directory.
     '''
-    paths = []
-    for entry in path_to_search.rglob(pattern):
-        is_inside_banned_dirs = False
-        for b_dir in banned_dirs:
-            if entry.is_relative_to(b_dir):
-                is_inside_banned_dirs = True
-                break
-        if not is_inside_banned_dirs:
-            paths.append(entry)
-    return paths
+    ignored_dirs = []
+    if '.gitmodules' in file_names:
+        for p in _get_git_modules_dirs(Path(directory, '.gitmodules')):
+            ignored_dirs.append(os.path.normpath(p))
+    if '.gitignore' in file_names:
+        for p in _get_git_ignore_dirs(Path(directory, '.gitignore')):
+            ignored_dirs.append(os.path.normpath(p))
+    return ignored_dirs
+
+def _is_file(entry: os.DirEntry) -> bool:
+    '''
+    Says whether `entry` is a file or a symbolic link to a file.
+    '''
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+def _is_inside_banned_dirs(path: str, banned_dirs: set[str]) -> bool:
+    '''
+    Says whether `path` is located inside one of `banned_dirs`.
+    '''
+    directory = os.path.dirname(os.path.normpath(path))
+    while directory:
+        if directory in banned_dirs:
+            return True
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return False
 
 def _get_git_modules_dirs(git_modules_path: Path) -> list[Path]:
     '''
@@ -0,0 +1,84 @@
+'''
+Module that finds files of git repository changed since a given revision.
+'''
+
+import os
+import subprocess
+
+def resolve_revision(path_to_repo: str, revision: str) -> str:
+    '''
+    Returns hash of commit that `revision` refers to.
+
+    Parameters:
+    path_to_repo (str): Path to the repository or any directory inside it.
+    revision (str): Git revision, e.g. `main` or `HEAD~3`.
+
+    Raises:
+    ValueError: if revision does not exist or git is not found.
+    '''
+    return _run_git(path_to_repo, ['rev-parse', '--verify', f'{revision}^{{commit}}']).strip()
+
+def get_changed_files(path_to_repo: str, since: str) -> set[str]:
+    '''
+    Returns real paths of files that differ between revision `since`
+    and the working tree, including staged and untracked files.
+
+    Parameters:
+    path_to_repo (str): Path to the repository or any directory inside it.
+    since (str): Git revision, e.g. `main` or `HEAD~3`.
+
+    Raises:
+    ValueError: if changes can not be found, e.g. revision does not exist.
+    '''
+    top_level = _run_git(path_to_repo, ['rev-parse', '--show-toplevel']).strip()
+    changed = _run_git(path_to_repo, ['diff', '--name-only', '--no-renames', '-z', since, '--'])
+    untracked = _run_git(path_to_repo, ['ls-files', '--others', '--exclude-standard', '-z'])
+    paths = [path for path in changed.split('\0') if path]
+    # `ls-files` reports paths relative to the current directory
+    untracked_paths = [
+        os.path.relpath(os.path.join(path_to_repo, path), top_level)
+        for path in untracked.split('\0') if path
+    ]
+    return {
+        os.path.realpath(os.path.join(top_level, path))
+        for path in paths + untracked_paths
+    }
+
+def get_revision_files(path_to_repo: str, revision: str) -> set[str]:
+    '''
+    Returns real paths of files tracked by git at `revision`.
+    Ignored, generated and untracked files and files outside of the repository are not listed.
+
+    Parameters:
+    path_to_repo (str): Path to the repository or any directory inside it.
+    revision (str): Git revision, e.g. `main` or `HEAD~3`.
+
+    Raises:
+    ValueError: if files can not be listed, e.g. revision does not exist.
+    '''
+    top_level = _run_git(path_to_repo, ['rev-parse', '--show-toplevel']).strip()
+    tracked = _run_git(path_to_repo, ['ls-tree', '-r', '--full-tree', '--name-only', '-z',
+                                      revision])
+    return {
+        os.path.realpath(os.path.join(top_level, path))
+        for path in tracked.split('\0') if path
+    }
+
+def _run_git(path_to_repo: str, args: list[str]) -> str:
+    '''
+    Runs git command in repository and returns its output.
+    '''
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(path_to_repo)] + args,
+            capture_output=True,
+            check=True,
+            text=True,
+            encoding='utf-8',
+            errors='surrogateescape'
+        )
+    except FileNotFoundError as e:
+        raise ValueError('git is not found') from e
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f'git {args[0]} failed: {e.stderr.strip()}') from e
+    return result.stdout
@@ -0,0 +1,161 @@
+'''
+Module for counting calls into libclang and other work on hot paths.
+
+While counting is on, every function of libclang is called through a wrapper
+that counts the call for the current file and calculator. Other events,
+e.g. visited cursors or opened source files, are counted by code that does the work.
+'''
+
+from contextlib import contextmanager
+from typing import Iterator
+
+import clang.cindex
+
+CURSORS_VISITED = 'cursors_visited'
+TOKENS = 'tokens'
+SOURCE_FILE_OPENS = 'source_file_opens'
+
+DEFAULT_TOP_FILES = 10
+
+# counter of the running analysis, `None` if counting is off
+active_counter = None  # pylint: disable=C0103
+
+class CallCounter:
+    '''
+    Counts events keyed by file, calculator and event name.
+    '''
+
+    def __init__(self):
+        self.counts = {}
+        self.file = None
+        self.calculator = None
+
+    def add(self, event: str, count: int = 1):
+        '''
+        Adds `count` events `event` to the current file and calculator.
+        '''
+        key = (self.file, self.calculator, event)
+        self.counts[key] = self.counts.get(key, 0) + count
+
+    def merge(self, other: 'CallCounter'):
+        '''
+        Adds all events counted by `other`.
+        '''
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+
+    def report(self) -> dict:
+        '''
+        Returns numbers of events in total, per calculator and per file.
+        Calls into libclang are named after functions of libclang, e.g. `clang_visitChildren`.
+        '''
+        events = {}
+        calculators = {}
+        files = {}
+        for (file_path, calculator, event), count in self.counts.items():
+            _add_count(events, event, count)
+            _add_count(calculators.setdefault(calculator or '-', {}), event, count)
+            _add_count(files.setdefault(file_path or '-', {}), event, count)
+        return {
+            'events': _sorted_counts(events),
+            'calculators': {
+                name: _sorted_counts(counts) for name, counts in sorted(calculators.items())
+            },
+            'files': {name: _sorted_counts(counts) for name, counts in sorted(files.items())},
+        }
+
+    def format_table(self, top_files: int = DEFAULT_TOP_FILES) -> str:
+        '''
+        Returns summary as text tables: events in total, events per calculator
+        and `top_files` files with the most calls into libclang.
+        '''
+        report = self.report()
+        rows = [('event', 'count')]
+        rows += [(event, str(count)) for event, count in report['events'].items()]
+        lines = _format_rows(rows) + ['']
+        rows = [('calculator', 'event', 'count')]
+        for calculator, counts in report['calculators'].items():
+            rows += [(calculator, event, str(count)) for event, count in counts.items()]
+        lines += _format_rows(rows) + ['']
+        slowest_files = sorted(
+            report['files'].items(),
+            key=lambda item: _count_libclang_calls(item[1]),
+            reverse=True
+        )[:top_files]
+        rows = [('file', 'libclang calls', CURSORS_VISITED)]
+        rows += [
+            (file_path, str(_count_libclang_calls(counts)), str(counts.get(CURSORS_VISITED, 0)))
+            for file_path, counts in slowest_files
+        ]
+        return '\n'.join(lines + _format_rows(rows))
+
+@contextmanager
+def counting_calls(counter: CallCounter) -> Iterator[CallCounter]:
+    '''
+    Counts calls into libclang and other events with `counter` inside the block.
+    '''
+    global active_counter  # pylint: disable=W0603
+    library = clang.cindex.conf.lib
+    previous_counter = active_counter
+    clang.cindex.conf.lib = _CountingLibrary(library, counter)
+    active_counter = counter
+    try:
+        yield counter
+    finally:
+        clang.cindex.conf.lib = library
+        active_counter = previous_counter
+
+class _CountedFunction:
+    '''
+    Function of libclang that counts its calls.
+    Attributes, e.g. `restype`, are read from and written to the function itself.
+    '''
+
+    def __init__(self, function, name: str, counter: CallCounter):
+        object.__setattr__(self, '_function', function)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_counter', counter)
+
+    def __call__(self, *args):
+        self._counter.add(self._name)
+        return self._function(*args)
+
+    def __getattr__(self, name: str):
+        return getattr(self._function, name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self._function, name, value)
+
+# pylint: disable=R0903
+class _CountingLibrary:
+    '''
+    Library of libclang whose functions count their calls.
+    '''
+
+    def __init__(self, library, counter: CallCounter):
+        self._library = library
+        self._counter = counter
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._library, name)
+        if name.startswith('clang_'):
+            attribute = _CountedFunction(attribute, name, self._counter)
+            # later lookups do not reach `__getattr__`
+            setattr(self, name, attribute)
+        return attribute
+
+def _add_count(counts: dict[str, int], event: str, count: int):
+    counts[event] = counts.get(event, 0) + count
+
+def _sorted_counts(counts: dict[str, int]) -> dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+def _count_libclang_calls(counts: dict[str, int]) -> int:
+    return sum(count for event, count in counts.items() if event.startswith('clang_'))
+
+def _format_rows(rows: list[tuple[str, ...]]) -> list[str]:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        '  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    ]
@@ -2,14 +2,76 @@
 Main file of project.
 '''
 
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+import gzip
+import io
+import json
+import os
+import sys
+
 import click
 from cpp_stats.cpp_stats import CppStats
+from cpp_stats.ast.compilation import find_compilation_database
+from cpp_stats.ast.memory import parse_memory_size
+from cpp_stats.git_changes import resolve_revision
+from cpp_stats.progress import FORMATS, ProgressReporter
+
+def _parse_max_memory(_context, _param, value: str | None) -> int | None:
+    '''
+    Converts `--max-memory` option to bytes.
+    '''
+    if value is None:
+        return None
+    try:
+        return parse_memory_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+def _check_compilation_database(_context, _param, value: str | None) -> str | None:
+    '''
+    Checks that `--compile-commands` option points to compilation database.
+    '''
+    if value is None:
+        return None
+    try:
+        find_compilation_database('', value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    return value
 
 @click.command()
 @click.option('--report', default='report.xml',
-              help='Path to xml file where to store report.')
+              help='Path to xml file where to store report. '
+              'Report is compressed with gzip if path ends with .gz.')
+@click.option('--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of processes parsing files in parallel.')
+@click.option('--compile-commands', 'compilation_database', default=None,
+              callback=_check_compilation_database,
+              help='Path to compile_commands.json or its directory. '
+              'By default it is looked up in the root of the repository.')
+@click.option('--pch', 'precompiled_headers', is_flag=True, default=False,
+              help='Parse the most frequently included headers once into precompiled header.')
+@click.option('--attribute-headers', is_flag=True, default=False,
+              help='Analyze headers inside the first source that includes them.')
+@click.option('--cache-dir', default=None,
+              help='Directory where results of files are cached between runs.')
+@click.option('--since', default=None, metavar='REV',
+              help='Parse again only files changed since git revision REV '
+              'and files including them. Requires --cache-dir.')
+@click.option('--max-memory', default=None, metavar='SIZE', callback=_parse_max_memory,
+              help='Memory budget, e.g. 4G. Each translation unit is released right after '
+              'analysis and parallel parsing is throttled when memory nears the budget.')
+@click.option('--profile', default=None, metavar='PATH',
+              help='Path to JSON file where to store wall and CPU time '
+              'per phase, file and calculator.')
+@click.option('--count-calls', is_flag=True, default=False,
+              help='Print numbers of calls into libclang per calculator and file.')
+@click.option('--progress', default=None, type=click.Choice(FORMATS),
+              help='Print files done, LOC/s, current and slowest file and ETA to stderr '
+              'every few seconds, as text or as a JSON object per line.')
 @click.argument('path_to_repo')
-def main(path_to_repo, report):
+def main(path_to_repo, report, profile, count_calls, progress, **options):
     '''
     Main function of program that calculates metrics for a given 
     C/C++ repository and stores report in XML file.
@@ -17,10 +79,59 @@ def main(path_to_repo, report):
     Parameters:
     path_to_repo (str): Path to the repository.
     report (str): Path to xml file where to store report.
+    profile (str | None): Path to JSON file where to store profile of analysis.
+    count_calls (bool): Whether to print numbers of calls into libclang.
+    progress (str | None): Format of progress printed to stderr, `text` or `json`.
+    options: Options of analysis, see `AnalysisOptions`.
+    '''
+    reporter = None if progress is None else ProgressReporter(sys.stderr, progress)
+    try:
+        stats = CppStats(path_to_repo, True, profile is not None, count_calls, reporter,
+                         **options)
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+    if options['since'] is not None:
+        # unknown revision is reported before analysis starts
+        try:
+            resolve_revision(path_to_repo, options['since'])
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--since'") from e
+    with open_report(report) as f:
+        stats.write_xml(f)
+        f.write('\n')
+    if profile is not None:
+        with open(profile, 'w', encoding='utf-8') as f:
+            json.dump(stats.profile(), f, indent=4)
+            f.write('\n')
+    if count_calls:
+        click.echo(stats.call_counts().format_table(), err=True)
+
+@contextmanager
+def open_report(report: str) -> Iterator[TextIO]:
+    '''
+    Opens file for report, compressed with gzip if its name ends with `.gz`.
+    Report is written to a temporary file next to it, which replaces `report`
+    only if the block succeeds, so a failed analysis leaves no truncated report.
+
+    Parameters:
+    report (str): Path to report.
     '''
-    stats = CppStats(path_to_repo, True)
-    with open(report, "w", encoding="utf-8") as f:
-        click.echo(stats.as_xml(), file=f)
+    temp_path = f'{report}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as raw:
+            if report.endswith('.gz'):
+                binary = gzip.GzipFile(report, 'wb', fileobj=raw)
+            else:
+                binary = raw
+            with io.TextIOWrapper(binary, encoding='utf-8') as f:
+                yield f
+        os.replace(temp_path, report)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
 if __name__ == "__main__":
     # pylint: disable=E1120
@@ -0,0 +1,43 @@
+'''
+Module for aggregation of values of entities (files, classes, methods)
+into mean, max, min and sum.
+
+Value of each entity is calculated once and NaN values are masked out,
+then reductions run over plain lists with built-in functions.
+'''
+
+from itertools import chain
+from typing import Any, Callable, Iterable
+
+def collect_values(entities: Iterable[Any], value_source: Callable[[Any], Any]) -> list:
+    '''
+    Returns real parts of values of `entities` that are not NaN.
+
+    Parameters:
+    entities (Iterable[Any]): entities to aggregate.
+    value_source (Callable[[Any], Any]): returns value of entity.
+    '''
+    values = [value_source(entity).real for entity in entities]
+    # NaN is the only value that is not equal to itself
+    return [value for value in values if value == value]  # pylint: disable=R0124
+
+def mean_value(values: list, count: int):
+    '''
+    Returns sum of `values` divided by `count` or 0 if there are no entities.
+    `count` may include entities with NaN values.
+    '''
+    if count == 0:
+        return 0
+    return sum(values) / count
+
+def max_value(values: list, initial):
+    '''
+    Returns maximum of `values` and `initial`.
+    '''
+    return max(chain([initial], values))
+
+def min_value(values: list, default):
+    '''
+    Returns minimum of `values` or `default` if there are no values.
+    '''
+    return min(values, default=default)
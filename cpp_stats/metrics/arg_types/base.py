@@ -4,7 +4,10 @@ Contains base logic for work with argument types of methods.
 
 import clang.cindex
 
-from cpp_stats.metrics.utils import mangle_cursor_name
+from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.utils import mangle_cursor_name, has_function_body
+
+ARGUMENT_TYPES = 'ARGUMENT_TYPES'
 
 
 def _merge_class_data(lhv: dict[str, set[str]], rhv: dict[str, set[str]]):
@@ -25,14 +28,27 @@ def merge_argument_data(lhv: dict[str, dict[str, set[str]]], rhv: dict[str, dict
     '''
     result = {}
     for key, item in lhv.items():
-        result[key] = item
+        result[key] = dict(item)
     for key, item in rhv.items():
         if result.get(key, None) is None:
-            result[key] = item
+            result[key] = dict(item)
         else:
             result[key] = _merge_class_data(result[key], item)
     return result
 
+def merge_argument_data_into(target: dict[str, dict[str, set[str]]],
+                             source: dict[str, dict[str, set[str]]]):
+    '''
+    Merges dictionary `source` that contains set of argument types for each viewed method
+    for each viewed class into `target`.
+    `target` is updated in place, `source` is not changed.
+    '''
+    for key, item in source.items():
+        if target.get(key, None) is None:
+            target[key] = dict(item)
+        else:
+            target[key].update(item)
+
 def _get_set_of_argument_types(method: clang.cindex.Cursor) -> set[str]:
     '''
     Returns set of argument types for given method.
@@ -59,3 +75,61 @@ def get_argument_data(method: clang.cindex.Cursor):
             method.mangled_name: _get_set_of_argument_types(method)
         }
     }
+
+class ArgumentRecordsMetric(Metric):
+    '''
+    Stores set of argument types for each viewed method for each viewed class.
+    Records are shared between CAMC and NHD metrics.
+    '''
+
+    def __init__(self, data: dict[str, dict[str, set[str]]]):
+        super().__init__(ARGUMENT_TYPES)
+        self.data = data
+
+    def __add__(self, other):
+        if not isinstance(other, ArgumentRecordsMetric):
+            raise NotImplementedError
+        return ArgumentRecordsMetric(merge_argument_data(self.data, other.data))
+
+    def __iadd__(self, other):
+        if not isinstance(other, ArgumentRecordsMetric):
+            raise NotImplementedError
+        merge_argument_data_into(self.data, other.data)
+        return self
+
+class ArgumentRecordsCalculator(ClangMetricCalculator):
+    '''
+    Collects argument types of each viewed method.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return ArgumentRecordsMetric({})
+        return ArgumentRecordsMetric(get_argument_data(node))
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return (
+            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
+            and has_function_body(cursor)
+        )
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+        }
+
+    def needs_function_bodies(self) -> bool:
+        '''
+        Returns whether calculator uses bodies of functions and methods.
+        '''
+        return False
@@ -2,16 +2,28 @@
 Module for MEAN_CAMC, MAX_CAMC and MIN_CAMC metrics.
 '''
 
-import clang.cindex
-
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
 
-from cpp_stats.metrics.arg_types.base import merge_argument_data, get_argument_data
+from cpp_stats.metrics.arg_types.base import merge_argument_data, ArgumentRecordsCalculator
+from cpp_stats.metrics.aggregation import min_value
 
 MEAN_CAMC = 'MEAN_CAMC'
 MIN_CAMC = 'MIN_CAMC'
 MAX_CAMC = 'MAX_CAMC'
 
+def _calculate_camc(methods: dict[str, set[str]]):
+    all_types = set([])
+    for _, argument_types in methods.items():
+        all_types |= argument_types
+    class_value = 0
+    for _, argument_types in methods.items():
+        if len(all_types) * len(methods) == 0:
+            continue
+        class_value += (len(all_types.intersection(argument_types))
+                        / (len(all_types) * len(methods)))
+    return class_value
+
 class MeanCAMCMetric(Metric):
     '''
     Represents MEAN_CAMC metric.
@@ -52,28 +64,16 @@ class MeanCAMCMetric(Metric):
                          / (len(all_types) * len(class_methods)))
         return MEAN_CAMC, summ / n
 
-class MeanCAMCCalculator(ClangMetricCalculator):
+class MeanCAMCCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_CAMC.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanCAMCMetric({})
-        return MeanCAMCMetric(get_argument_data(node))
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MeanCAMCMetric(records[0].data)
 
 class MinCAMCMetric(Metric):
     '''
@@ -100,49 +100,19 @@ class MinCAMCMetric(Metric):
         '''
         Returns metric value.
         '''
-        value = None
-        if len(self.data) == 0:
-            return MIN_CAMC, 0
-        for _, class_methods in self.data.items():
-            all_types = set([])
-            for _, argument_types in class_methods.items():
-                all_types |= argument_types
-            class_value = 0
-            for _, argument_types in class_methods.items():
-                if len(all_types) * len(class_methods) == 0:
-                    continue
-                class_value += (len(all_types.intersection(argument_types))
-                         / (len(all_types) * len(class_methods)))
-            if value is None:
-                value = class_value
-            else:
-                value = min(value, class_value)
-        if value is None:
-            return MIN_CAMC, 0
-        return MIN_CAMC, value
-
-class MinCAMCCalculator(ClangMetricCalculator):
+        values = [_calculate_camc(class_methods) for class_methods in self.data.values()]
+        return MIN_CAMC, min_value(values, 0)
+
+class MinCAMCCalculator(DerivedMetricCalculator):
     '''
     Calculates MIN_CAMC.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MinCAMCMetric({})
-        return MinCAMCMetric(get_argument_data(node))
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MinCAMCMetric(records[0].data)
 
 class MaxCAMCMetric(Metric):
     '''
@@ -169,46 +139,16 @@ class MaxCAMCMetric(Metric):
         '''
         Returns metric value.
         '''
-        value = None
-        if len(self.data) == 0:
-            return MAX_CAMC, 0
-        for _, class_methods in self.data.items():
-            all_types = set([])
-            for _, argument_types in class_methods.items():
-                all_types |= argument_types
-            class_value = 0
-            for _, argument_types in class_methods.items():
-                if len(all_types) * len(class_methods) == 0:
-                    continue
-                class_value += (len(all_types.intersection(argument_types))
-                         / (len(all_types) * len(class_methods)))
-            if value is None:
-                value = class_value
-            else:
-                value = max(value, class_value)
-        if value is None:
-            return MAX_CAMC, 0
-        return MAX_CAMC, value
-
-class MaxCAMCCalculator(ClangMetricCalculator):
+        values = [_calculate_camc(class_methods) for class_methods in self.data.values()]
+        return MAX_CAMC, max(values, default=0)
+
+class MaxCAMCCalculator(DerivedMetricCalculator):
     '''
     Calculates MAX_CAMC.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxCAMCMetric({})
-        return MaxCAMCMetric(get_argument_data(node))
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MaxCAMCMetric(records[0].data)
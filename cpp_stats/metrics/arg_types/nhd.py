@@ -2,11 +2,11 @@
 Module for MEAN_NHD, MAX_NHD and MIN_NHD metrics.
 '''
 
-import clang.cindex
-
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
 
-from cpp_stats.metrics.arg_types.base import merge_argument_data, get_argument_data
+from cpp_stats.metrics.arg_types.base import merge_argument_data, ArgumentRecordsCalculator
+from cpp_stats.metrics.aggregation import mean_value, min_value
 
 MEAN_NHD = 'MEAN_NHD'
 MIN_NHD = 'MIN_NHD'
@@ -51,36 +51,19 @@ class MeanNHDMetric(Metric):
         '''
         Returns metric value.
         '''
-        summ = 0
-        n = len(self.data)
-        if n == 0:
-            return MEAN_NHD, 0
-        for _, class_methods in self.data.items():
-            summ += _calculate_nhd(class_methods)
-        return MEAN_NHD, summ / n
-
-class MeanNHDCalculator(ClangMetricCalculator):
+        values = [_calculate_nhd(class_methods) for class_methods in self.data.values()]
+        return MEAN_NHD, mean_value(values, len(values))
+
+class MeanNHDCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_NHD.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanNHDMetric({})
-        return MeanNHDMetric(get_argument_data(node))
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MeanNHDMetric(records[0].data)
 
 class MinNHDMetric(Metric):
     '''
@@ -107,41 +90,19 @@ class MinNHDMetric(Metric):
         '''
         Returns metric value.
         '''
-        value = None
-        if len(self.data) == 0:
-            return MIN_NHD, 0
-        for _, class_methods in self.data.items():
-            nhd = _calculate_nhd(class_methods)
-            if value is None:
-                value = nhd
-            else:
-                value = min(value, nhd)
-        if value is None:
-            return MIN_NHD, 0
-        return MIN_NHD, value
-
-class MinNHDCalculator(ClangMetricCalculator):
+        values = [_calculate_nhd(class_methods) for class_methods in self.data.values()]
+        return MIN_NHD, min_value(values, 0)
+
+class MinNHDCalculator(DerivedMetricCalculator):
     '''
     Calculates MIN_NHD.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MinNHDMetric({})
-        return MinNHDMetric(get_argument_data(node))
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MinNHDMetric(records[0].data)
 
 class MaxNHDMetric(Metric):
     '''
@@ -168,38 +129,16 @@ class MaxNHDMetric(Metric):
         '''
         Returns metric value.
         '''
-        value = None
-        if len(self.data) == 0:
-            return MAX_NHD, 0
-        for _, class_methods in self.data.items():
-            nhd = _calculate_nhd(class_methods)
-            if value is None:
-                value = nhd
-            else:
-                value = max(value, nhd)
-        if value is None:
-            return MAX_NHD, 0
-        return MAX_NHD, value
-
-class MaxNHDCalculator(ClangMetricCalculator):
+        values = [_calculate_nhd(class_methods) for class_methods in self.data.values()]
+        return MAX_NHD, max(values, default=0)
+
+class MaxNHDCalculator(DerivedMetricCalculator):
     '''
     Calculates MAX_NHD.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxNHDMetric({})
-        return MaxNHDMetric(get_argument_data(node))
+    def records(self) -> list[ClangMetricCalculator]:
+        return [ArgumentRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return (
-            cursor.kind == clang.cindex.CursorKind.CXX_METHOD
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MaxNHDMetric(records[0].data)
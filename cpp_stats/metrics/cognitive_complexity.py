@@ -5,10 +5,13 @@ Module for MEAN_COGNITIVE_COMPLEXITY and MAX_COGNITIVE_COMPLEXITY metrics.
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
+from cpp_stats.metrics.records import FileRecordsMetric
 from cpp_stats.metrics.utils import is_definition_of_func_or_method
 
 MEAN_COGNITIVE_COMPLEXITY = 'MEAN_COGNITIVE_COMPLEXITY'
 MAX_COGNITIVE_COMPLEXITY = 'MAX_COGNITIVE_COMPLEXITY'
+COGNITIVE_COMPLEXITY = 'COGNITIVE_COMPLEXITY'
 
 def __need_to_increase_value(node_kind: clang.cindex.CursorKind):
     '''
@@ -58,6 +61,39 @@ def _calculate_cognitive_complexity(node: clang.cindex.Cursor, depth = 0) -> int
         )
     return complexity
 
+class CognitiveComplexityRecordsCalculator(ClangMetricCalculator):
+    '''
+    Calculates cognitive complexity of each viewed function or method.
+    Records are shared between COGNITIVE_COMPLEXITY metrics.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return FileRecordsMetric(COGNITIVE_COMPLEXITY, {})
+        return FileRecordsMetric(
+            COGNITIVE_COMPLEXITY,
+            {node.location.file.name: [_calculate_cognitive_complexity(node)]}
+        )
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return is_definition_of_func_or_method(cursor)
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+            clang.cindex.CursorKind.FUNCTION_DECL,
+        }
+
 class MeanCognitiveComplexityMetric(Metric):
     '''
     Represents MEAN_COGNITIVE_COMPLEXITY metric.
@@ -89,25 +125,17 @@ class MeanCognitiveComplexityMetric(Metric):
             value = self.sum_value / self.cnt
         return MEAN_COGNITIVE_COMPLEXITY, value
 
-class MeanCognitiveComplexityCalculator(ClangMetricCalculator):
+class MeanCognitiveComplexityCalculator(DerivedMetricCalculator):
     '''
-    Calculates MEAN_NUMBER_OF_METHODS_PER_CLASS.
+    Calculates MEAN_COGNITIVE_COMPLEXITY.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanCognitiveComplexityMetric(0, 0)
-        return MeanCognitiveComplexityMetric(_calculate_cognitive_complexity(node), 1)
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [CognitiveComplexityRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return is_definition_of_func_or_method(cursor)
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MeanCognitiveComplexityMetric(sum(values), len(values))
 
 class MaxCognitiveComplexityMetric(Metric):
     '''
@@ -135,22 +163,14 @@ class MaxCognitiveComplexityMetric(Metric):
         '''
         return MAX_COGNITIVE_COMPLEXITY, self.value
 
-class MaxCognitiveComplexityCalculator(ClangMetricCalculator):
+class MaxCognitiveComplexityCalculator(DerivedMetricCalculator):
     '''
-    Calculates MAX_NUMBER_OF_METHODS_PER_CLASS.
+    Calculates MAX_COGNITIVE_COMPLEXITY.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxCognitiveComplexityMetric(0)
-        return MaxCognitiveComplexityMetric(_calculate_cognitive_complexity(node))
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [CognitiveComplexityRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return is_definition_of_func_or_method(cursor)
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MaxCognitiveComplexityMetric(max(values, default=0))
@@ -5,10 +5,13 @@ Module for MEAN_CYCLOMATIC_COMPLEXITY and MAX_CYCLOMATIC_COMPLEXITY metrics.
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
+from cpp_stats.metrics.records import FileRecordsMetric
 from cpp_stats.metrics.utils import is_definition_of_func_or_method
 
 MEAN_CYCLOMATIC_COMPLEXITY = 'MEAN_CYCLOMATIC_COMPLEXITY'
 MAX_CYCLOMATIC_COMPLEXITY = 'MAX_CYCLOMATIC_COMPLEXITY'
+CYCLOMATIC_COMPLEXITY = 'CYCLOMATIC_COMPLEXITY'
 
 def __need_to_increase(node: clang.cindex.Cursor):
     return node.kind in [
@@ -25,6 +28,39 @@ def _calculate_cyclomatic_complexity(node: clang.cindex.Cursor) -> int:
         complexity += __need_to_increase(child)
     return complexity
 
+class CyclomaticComplexityRecordsCalculator(ClangMetricCalculator):
+    '''
+    Calculates cyclomatic complexity of each viewed function or method.
+    Records are shared between CYCLOMATIC_COMPLEXITY metrics.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return FileRecordsMetric(CYCLOMATIC_COMPLEXITY, {})
+        return FileRecordsMetric(
+            CYCLOMATIC_COMPLEXITY,
+            {node.location.file.name: [_calculate_cyclomatic_complexity(node)]}
+        )
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return is_definition_of_func_or_method(cursor)
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+            clang.cindex.CursorKind.FUNCTION_DECL,
+        }
+
 class MeanCyclomaticComplexityMetric(Metric):
     '''
     Represents MEAN_CYCLOMATIC_COMPLEXITY metric.
@@ -59,25 +95,17 @@ class MeanCyclomaticComplexityMetric(Metric):
             value = self.sum_value / self.cnt
         return MEAN_CYCLOMATIC_COMPLEXITY, value
 
-class MeanCyclomaticComplexityCalculator(ClangMetricCalculator):
+class MeanCyclomaticComplexityCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_CYCLOMATIC_COMPLEXITY.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanCyclomaticComplexityMetric(0, 0)
-        return MeanCyclomaticComplexityMetric(_calculate_cyclomatic_complexity(node), 1)
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [CyclomaticComplexityRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return is_definition_of_func_or_method(cursor)
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MeanCyclomaticComplexityMetric(sum(values), len(values))
 
 class MaxCyclomaticComplexityMetric(Metric):
     '''
@@ -105,22 +133,14 @@ class MaxCyclomaticComplexityMetric(Metric):
         '''
         return MAX_CYCLOMATIC_COMPLEXITY, self.value
 
-class MaxCyclomaticComplexityCalculator(ClangMetricCalculator):
+class MaxCyclomaticComplexityCalculator(DerivedMetricCalculator):
     '''
     Calculates MAX_CYCLOMATIC_COMPLEXITY.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxCyclomaticComplexityMetric(0)
-        return MaxCyclomaticComplexityMetric(_calculate_cyclomatic_complexity(node))
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [CyclomaticComplexityRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return is_definition_of_func_or_method(cursor)
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MaxCyclomaticComplexityMetric(max(values, default=0))
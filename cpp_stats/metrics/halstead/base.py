@@ -7,6 +7,8 @@ import cmath
 from clang.cindex import CursorKind, Cursor
 
 from cpp_stats.metrics.utils import mangle_cursor_name
+from cpp_stats.metrics.tokens import get_token_spellings
+from cpp_stats.metrics.sources import source_store
 
 class HalsteadData:
     '''
@@ -20,6 +22,12 @@ class HalsteadData:
         self.N1 = N1
         self.N2 = N2
 
+    def copy(self):
+        '''
+        Returns copy that can be changed in place without changing this data.
+        '''
+        return HalsteadData(set(self.n1), set(self.n2), self.N1, self.N2)
+
     def __add__(self, other):
         if not isinstance(other, HalsteadData):
             raise NotImplementedError
@@ -30,6 +38,15 @@ class HalsteadData:
             self.N2 + other.N2
         )
 
+    def __iadd__(self, other):
+        if not isinstance(other, HalsteadData):
+            raise NotImplementedError
+        self.n1 |= other.n1
+        self.n2 |= other.n2
+        self.N1 += other.N1
+        self.N2 += other.N2
+        return self
+
     def program_vocabulary(self):
         '''
         Calculates Halstead program vocabulary.
@@ -88,11 +105,9 @@ def __get_spelling_from_file(cursor: Cursor) -> str:
     '''
     start = cursor.extent.start
     end = cursor.extent.end
-    with open(start.file.name, "r", encoding="utf-8") as source_code:
-        for _ in range(start.line):
-            cursor_str = source_code.readline()
-    cursor_str = cursor_str[start.column - 1: end.column - 1]
-    return cursor_str
+    if start.file is None:
+        return ''
+    return source_store.get(start.file.name).line_slice(start.line, start.column, end.column)
 
 
 def __is_literal(cursor):
@@ -115,11 +130,10 @@ def __get_literal_spelling(cursor: Cursor):
     '''
     Finds spelling of literal.
     '''
-    tokens = list(cursor.get_tokens())
+    tokens = get_token_spellings(cursor)
     if len(tokens) == 0:
         return __get_spelling_from_file(cursor)
-    op_token = tokens[0]
-    return op_token.spelling
+    return tokens[0]
 
 def __get_binary_operator_spelling(cursor):
     '''
@@ -127,23 +141,20 @@ def __get_binary_operator_spelling(cursor):
     '''
     children = list(cursor.get_children())
     left_child = children[0]
-    tokens = list(cursor.get_tokens())
-    left_tokens = list(left_child.get_tokens())
-    op_token_index = len(left_tokens)
+    tokens = get_token_spellings(cursor)
+    op_token_index = len(get_token_spellings(left_child))
     if len(tokens) <= op_token_index:
         return __get_spelling_from_file(cursor)
-    op_token = tokens[op_token_index]
-    return op_token.spelling
+    return tokens[op_token_index]
 
 def __get_unary_operator_spelling(cursor):
     '''
     Finds type of unary operator and returns its spelling.
     '''
-    tokens = list(cursor.get_tokens())
+    tokens = get_token_spellings(cursor)
     if len(tokens) == 0:
         return __get_spelling_from_file(cursor)
-    op_token = tokens[0]
-    return op_token.spelling
+    return tokens[0]
 
 def __find_remaining_operators(cursor: Cursor) -> HalsteadData:
     '''
@@ -151,9 +162,9 @@ def __find_remaining_operators(cursor: Cursor) -> HalsteadData:
     '''
     observed_tokens = [',', '::', ';']
     result = HalsteadData(set(), set(), 0, 0)
-    for token in cursor.get_tokens():
-        if token.spelling in observed_tokens:
-            result.n1 |= set([token.spelling])
+    for token in get_token_spellings(cursor):
+        if token in observed_tokens:
+            result.n1 |= set([token])
             result.N1 += 1
     return result
 
@@ -355,7 +366,7 @@ def create_data(node: Cursor) -> HalsteadData:
             result.N1 += 2
 
         if node.kind == CursorKind.PARM_DECL:
-            if len(list(node.get_tokens())) == 2:
+            if len(get_token_spellings(node)) == 2:
                 result.n1 |= set([node.type.spelling])
                 result.N1 += 1
             result.n2 |= set([mangle_cursor_name(node)])
@@ -368,7 +379,7 @@ def create_data(node: Cursor) -> HalsteadData:
             result.N1 += 1
 
         if node.kind == CursorKind.VAR_DECL:
-            if len(list(node.get_tokens())) == 2:
+            if len(get_token_spellings(node)) == 2:
                 result.n1 |= set([node.type.spelling])
                 result.N1 += 1
             result.n2 |= set([node.mangled_name])
@@ -444,10 +455,21 @@ def merge_data(lhv: dict[str, HalsteadData], rhv: dict[str, HalsteadData]):
     '''
     new_data = {}
     for file_name, halstead_data in lhv.items():
-        new_data[file_name] = halstead_data
+        new_data[file_name] = halstead_data.copy()
     for file_name, halstead_data in rhv.items():
         if new_data.get(file_name, None) is None:
-            new_data[file_name] = halstead_data
+            new_data[file_name] = halstead_data.copy()
         else:
-            new_data[file_name] += halstead_data
+            new_data[file_name] = new_data[file_name] + halstead_data
     return new_data
+
+def merge_data_into(target: dict[str, HalsteadData], source: dict[str, HalsteadData]):
+    '''
+    Merges halstead data from `source` into `target` according to file names.
+    `target` is updated in place, `source` is not changed.
+    '''
+    for file_name, halstead_data in source.items():
+        if target.get(file_name, None) is None:
+            target[file_name] = halstead_data.copy()
+        else:
+            target[file_name] += halstead_data
@@ -1,12 +1,58 @@
 '''
 Module for base halstead metrics.
 '''
-import math
-
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
 from cpp_stats.metrics.halstead import base
+from cpp_stats.metrics.aggregation import collect_values, mean_value, max_value
+
+HALSTEAD = 'HALSTEAD'
+
+class HalsteadRecordsMetric(Metric):
+    '''
+    Stores halstead data for each viewed file.
+    Records are shared between all halstead metrics.
+    '''
+
+    def __init__(self, data: dict[str, base.HalsteadData]):
+        super().__init__(HALSTEAD)
+        self.data = data
+
+    def __add__(self, other):
+        if not isinstance(other, HalsteadRecordsMetric):
+            raise NotImplementedError
+        return HalsteadRecordsMetric(
+            base.merge_data(self.data, other.data)
+        )
+
+    def __iadd__(self, other):
+        if not isinstance(other, HalsteadRecordsMetric):
+            raise NotImplementedError
+        base.merge_data_into(self.data, other.data)
+        return self
+
+class HalsteadRecordsCalculator(ClangMetricCalculator):
+    '''
+    Collects halstead data for each viewed file.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if node.kind.is_translation_unit():
+            return HalsteadRecordsMetric(
+            {
+                node.spelling: base.create_data(node)
+            }
+        )
+        return HalsteadRecordsMetric(
+            {
+                node.location.file.name: base.create_data(node)
+            }
+        )
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        return True
 
 class MeanHalsteadMetric(Metric):
     '''
@@ -26,16 +72,8 @@ class MeanHalsteadMetric(Metric):
         )
 
     def get(self) -> tuple[str, float]:
-        sum_vocabulary = 0
-        cnt_files = len(self.data)
-        for _, halstead_data in self.data.items():
-            if math.isnan(self._type.value_source(halstead_data).real):
-                continue
-            sum_vocabulary += self._type.value_source(halstead_data).real
-        value = 0
-        if cnt_files != 0:
-            value = sum_vocabulary / cnt_files
-        return self.name(), value
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), mean_value(values, len(self.data))
 
     @classmethod
     def value_source(cls, halstead_data: base.HalsteadData) -> float:
@@ -61,12 +99,8 @@ class MaxHalsteadMetric(Metric):
         )
 
     def get(self) -> tuple[str, float]:
-        result = 0.0
-        for _, halstead_data in self.data.items():
-            if math.isnan(self._type.value_source(halstead_data).real):
-                continue
-            result = max(result, self._type.value_source(halstead_data).real)
-        return self.name(), result
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), max_value(values, 0.0)
 
     @classmethod
     def value_source(cls, halstead_data: base.HalsteadData) -> float:
@@ -92,12 +126,8 @@ class SumHalsteadMetric(Metric):
         )
 
     def get(self) -> tuple[str, float]:
-        result = 0.0
-        for _, halstead_data in self.data.items():
-            if math.isnan(self._type.value_source(halstead_data).real):
-                continue
-            result += self._type.value_source(halstead_data).real
-        return self.name(), result
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), sum(values, 0.0)
 
     @classmethod
     def value_source(cls, halstead_data: base.HalsteadData) -> float:
@@ -105,7 +135,7 @@ class SumHalsteadMetric(Metric):
         Returns value used by MeanHalsteadMetric during calculations
         '''
 
-class HalsteadCalculator(ClangMetricCalculator):
+class HalsteadCalculator(DerivedMetricCalculator):
     '''
     Calculates abstract halstead metric.
     '''
@@ -114,18 +144,8 @@ class HalsteadCalculator(ClangMetricCalculator):
         super().__init__()
         self._metric_type = metric_type
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if node.kind.is_translation_unit():
-            return self._metric_type(
-            {
-                node.spelling: base.create_data(node)
-            }
-        )
-        return self._metric_type(
-            {
-                node.location.file.name: base.create_data(node)
-            }
-        )
+    def records(self) -> list[ClangMetricCalculator]:
+        return [HalsteadRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        return True
+    def from_records(self, records: list[Metric]) -> Metric:
+        return self._metric_type(records[0].data)
@@ -38,6 +38,12 @@ class LCOMClassData:
         self.method_data = method_data
         self.fields = fields
 
+    def copy(self):
+        '''
+        Returns copy that can be changed in place without changing this data.
+        '''
+        return LCOMClassData(self.class_name, dict(self.method_data), set(self.fields))
+
     def __add__(self, other):
         if not isinstance(other, LCOMClassData):
             raise NotImplementedError
@@ -50,6 +56,15 @@ class LCOMClassData:
             new_dict[key] = value
         return LCOMClassData(self.class_name, new_dict, self.fields | other.fields)
 
+    def __iadd__(self, other):
+        if not isinstance(other, LCOMClassData):
+            raise NotImplementedError
+        if self.class_name != other.class_name:
+            raise RuntimeError
+        self.method_data.update(other.method_data)
+        self.fields |= other.fields
+        return self
+
 def get_lcom_data(cursor: Cursor) -> LCOMClassData:
     '''
     Returns prepared data for LCOM calculations for given cursor.
@@ -81,10 +96,22 @@ def merge_class_lcom_data(lhv: dict[str, LCOMClassData], rhv: dict[str, LCOMClas
     '''
     new_dict = {}
     for key, value in lhv.items():
-        new_dict[key] = value
+        new_dict[key] = value.copy()
     for key, value in rhv.items():
         if new_dict.get(key, None) is None:
-            new_dict[key] = value
+            new_dict[key] = value.copy()
         else:
-            new_dict[key] += value
+            new_dict[key] = new_dict[key] + value
     return new_dict
+
+def merge_class_lcom_data_into(target: dict[str, LCOMClassData],
+                               source: dict[str, LCOMClassData]):
+    '''
+    Merges dictionary `source` into `target` by class names as keys.
+    `target` is updated in place, `source` is not changed.
+    '''
+    for key, value in source.items():
+        if target.get(key, None) is None:
+            target[key] = value.copy()
+        else:
+            target[key] += value
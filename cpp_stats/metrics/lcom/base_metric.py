@@ -1,12 +1,71 @@
 '''
 Module for base lcom metrics.
 '''
-import math
-
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
 from cpp_stats.metrics.lcom import base
+from cpp_stats.metrics.aggregation import collect_values, mean_value, max_value, min_value
+
+LCOM = 'LCOM'
+
+class LCOMRecordsMetric(Metric):
+    '''
+    Stores lcom data for each viewed class.
+    Records are shared between all lcom metrics.
+    '''
+
+    def __init__(self, data: dict[str, base.LCOMClassData]):
+        super().__init__(LCOM)
+        self.data = data
+
+    def __add__(self, other):
+        if not isinstance(other, LCOMRecordsMetric):
+            raise NotImplementedError
+        return LCOMRecordsMetric(
+            base.merge_class_lcom_data(self.data, other.data)
+        )
+
+    def __iadd__(self, other):
+        if not isinstance(other, LCOMRecordsMetric):
+            raise NotImplementedError
+        base.merge_class_lcom_data_into(self.data, other.data)
+        return self
+
+class LCOMRecordsCalculator(ClangMetricCalculator):
+    '''
+    Collects lcom data for each viewed class.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return LCOMRecordsMetric({})
+        data = base.get_lcom_data(node)
+        return LCOMRecordsMetric({
+            data.class_name: data
+        })
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Checks that given cursor can be used for calculation.
+        '''
+        return (
+            cursor.kind in [
+                clang.cindex.CursorKind.CXX_METHOD,
+                clang.cindex.CursorKind.FIELD_DECL
+            ]
+            and cursor.is_definition()
+        )
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+            clang.cindex.CursorKind.FIELD_DECL,
+        }
 
 # pylint: disable=R0801
 class MeanLCOMMetric(Metric):
@@ -30,16 +89,8 @@ class MeanLCOMMetric(Metric):
         '''
         Returns value of metric based on value_source.
         '''
-        summ = 0
-        cnt = len(self.data)
-        for _, lcom_data in self.data.items():
-            if math.isnan(self._type.value_source(lcom_data).real):
-                continue
-            summ += self._type.value_source(lcom_data).real
-        value = 0
-        if cnt != 0:
-            value = summ / cnt
-        return self.name(), value
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), mean_value(values, len(self.data))
 
     @classmethod
     def value_source(cls, lcom_data: base.LCOMClassData) -> float:
@@ -69,12 +120,8 @@ class MaxLCOMMetric(Metric):
         '''
         Returns value of metric based on value_source.
         '''
-        result = 0.0
-        for _, lcom_data in self.data.items():
-            if math.isnan(self._type.value_source(lcom_data).real):
-                continue
-            result = max(result, self._type.value_source(lcom_data).real)
-        return self.name(), result
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), max_value(values, 0.0)
 
     @classmethod
     def value_source(cls, lcom_data: base.LCOMClassData) -> float:
@@ -104,16 +151,8 @@ class MinLCOMMetric(Metric):
         '''
         Returns value of metric based on value_source.
         '''
-        result = None
-        for _, lcom_data in self.data.items():
-            value = self._type.value_source(lcom_data).real
-            if math.isnan(value):
-                continue
-            if result is None:
-                result = value
-            else:
-                result = min(result, value)
-        return self.name(), result
+        values = collect_values(self.data.values(), self._type.value_source)
+        return self.name(), min_value(values, None)
 
     @classmethod
     def value_source(cls, lcom_data: base.LCOMClassData) -> float:
@@ -121,7 +160,7 @@ class MinLCOMMetric(Metric):
         Returns value used by MinLCOMMetric during calculations
         '''
 
-class LCOMCalculator(ClangMetricCalculator):
+class LCOMCalculator(DerivedMetricCalculator):
     '''
     Calculates abstract lcom metric.
     '''
@@ -130,22 +169,8 @@ class LCOMCalculator(ClangMetricCalculator):
         super().__init__()
         self._metric_type = metric_type
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return self._metric_type({})
-        data = base.get_lcom_data(node)
-        return self._metric_type({
-            data.class_name: data
-        })
+    def records(self) -> list[ClangMetricCalculator]:
+        return [LCOMRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Checks that given cursor can be used for calculation.
-        '''
-        return (
-            cursor.kind in [
-                clang.cindex.CursorKind.CXX_METHOD,
-                clang.cindex.CursorKind.FIELD_DECL
-            ]
-            and cursor.is_definition()
-        )
+    def from_records(self, records: list[Metric]) -> Metric:
+        return self._metric_type(records[0].data)
@@ -5,14 +5,49 @@ Module for MEAN_LENGTH_OF_METHODS and MAX_LENGTH_OF_METHODS metrics.
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
+from cpp_stats.metrics.records import FileRecordsMetric
 
 MEAN_LENGTH_OF_METHODS = 'MEAN_LENGTH_OF_METHODS'
 MAX_LENGTH_OF_METHODS = 'MAX_LENGTH_OF_METHODS'
+LENGTH_OF_METHODS = 'LENGTH_OF_METHODS'
 
 def _length_of_method(method: clang.cindex.Cursor):
     assert method.kind == clang.cindex.CursorKind.CXX_METHOD
     return method.extent.end.line - method.extent.start.line + 1
 
+class LengthOfMethodsRecordsCalculator(ClangMetricCalculator):
+    '''
+    Calculates length of each viewed method.
+    Records are shared between LENGTH_OF_METHODS metrics.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return FileRecordsMetric(LENGTH_OF_METHODS, {})
+        return FileRecordsMetric(
+            LENGTH_OF_METHODS,
+            {node.location.file.name: [_length_of_method(node)]}
+        )
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and cursor.is_definition()
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+        }
+
 class MeanLengthOfMethodsMetric(Metric):
     '''
     Represents MEAN_LENGTH_OF_METHODS metric.
@@ -44,25 +79,17 @@ class MeanLengthOfMethodsMetric(Metric):
             value = self.length / self.cnt
         return MEAN_LENGTH_OF_METHODS, value
 
-class MeanLengthOfMethodsCalculator(ClangMetricCalculator):
+class MeanLengthOfMethodsCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_LENGTH_OF_METHODS.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanLengthOfMethodsMetric(0, 0)
-        return MeanLengthOfMethodsMetric(_length_of_method(node), 1)
+    def records(self) -> list[ClangMetricCalculator]:
+        return [LengthOfMethodsRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and cursor.is_definition()
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MeanLengthOfMethodsMetric(sum(values), len(values))
 
 class MaxLengthOfMethodsMetric(Metric):
     '''
@@ -90,22 +117,14 @@ class MaxLengthOfMethodsMetric(Metric):
         '''
         return MAX_LENGTH_OF_METHODS, self.length
 
-class MaxLengthOfMethodsCalculator(ClangMetricCalculator):
+class MaxLengthOfMethodsCalculator(DerivedMetricCalculator):
     '''
     Calculates MAX_LENGTH_OF_METHODS.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxLengthOfMethodsMetric(0)
-        return MaxLengthOfMethodsMetric(_length_of_method(node))
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [LengthOfMethodsRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and cursor.is_definition()
+    def from_records(self, records: list[Metric]) -> Metric:
+        values = records[0].values()
+        return MaxLengthOfMethodsMetric(max(values, default=0))
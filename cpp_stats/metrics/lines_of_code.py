@@ -3,8 +3,10 @@ Module for LINES_OF_CODE metric.
 '''
 
 from pathlib import Path
+import time
 
 from cpp_stats.metrics.metric_calculator import Metric, BasicMetricCalculator
+from cpp_stats.progress import ProgressReporter
 
 METRIC_NAME = 'LINES_OF_CODE'
 
@@ -39,11 +41,31 @@ class LinesOfCodeCalculator(BasicMetricCalculator):
     Calculates LINES_OF_CODE.
     '''
 
+    def __init__(self, progress: ProgressReporter | None = None):
+        '''
+        Initializes calculator.
+
+        Parameters:
+        progress (ProgressReporter | None): Reporter of counted files, phase `lines_of_code`.
+        '''
+        self._progress = progress
+
     def __call__(self, file_paths: list[Path]) -> Metric:
+        if self._progress is not None:
+            self._progress.start('lines_of_code', len(file_paths))
         cnt = 0
-        for file_path in file_paths:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                while f.readline():
-                    cnt += 1
+        try:
+            for file_path in file_paths:
+                started = time.perf_counter()
+                lines = 0
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    while f.readline():
+                        lines += 1
+                cnt += lines
+                if self._progress is not None:
+                    self._progress.file_done(str(file_path), time.perf_counter() - started, lines)
+        finally:
+            if self._progress is not None:
+                self._progress.finish()
         return LinesOfCodeMetric(cnt)
                 
\ No newline at end of file
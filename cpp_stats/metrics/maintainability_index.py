@@ -6,13 +6,18 @@ import math
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
-from cpp_stats.metrics.halstead.volume import MeanHalsteadVolumeCalculator
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
+from cpp_stats.metrics.records import FileRecordsMetric
+from cpp_stats.metrics.halstead.base import HalsteadData
+from cpp_stats.metrics.sources import source_store
+from cpp_stats.metrics.halstead.base_metric import HalsteadRecordsCalculator, HalsteadRecordsMetric
 from cpp_stats.metrics.halstead.volume import MeanHalsteadVolumeMetric
-from cpp_stats.metrics.cyclomatic_complexity import MeanCyclomaticComplexityCalculator
+from cpp_stats.metrics.cyclomatic_complexity import CyclomaticComplexityRecordsCalculator
 from cpp_stats.metrics.cyclomatic_complexity import MeanCyclomaticComplexityMetric
 
 MEAN_MAINTAINABILITY_INDEX = 'MEAN_MAINTAINABILITY_INDEX'
 MIN_MAINTAINABILITY_INDEX = 'MIN_MAINTAINABILITY_INDEX'
+LINES_OF_FILE = 'LINES_OF_FILE'
 
 def _merge_data(lhv: dict[str, (int, MeanHalsteadVolumeMetric, MeanCyclomaticComplexityMetric)],
                 rhv: dict[str, (int, MeanHalsteadVolumeMetric, MeanCyclomaticComplexityMetric)]):
@@ -35,6 +40,80 @@ def _merge_data(lhv: dict[str, (int, MeanHalsteadVolumeMetric, MeanCyclomaticCom
             )
     return new_data
 
+def _count_lines_of_file(file_name: str) -> int:
+    '''
+    Counts lines of file the same way as extent of its translation unit does.
+    '''
+    try:
+        return source_store.get(file_name).line_count()
+    except OSError:
+        return 0
+
+def _get_data(lines: FileRecordsMetric,
+              halstead: HalsteadRecordsMetric,
+              cyclomatic: FileRecordsMetric
+              ) -> dict[str, (int, MeanHalsteadVolumeMetric, MeanCyclomaticComplexityMetric)]:
+    '''
+    Combines records of lines, halstead data and cyclomatic complexity
+    into data for maintainability index according to file names.
+    Lines of headers analyzed inside including sources are counted from their contents.
+    '''
+    data = {}
+    for file_name in list(lines.data) + list(halstead.data):
+        if file_name in data:
+            continue
+        cyclomatic_values = cyclomatic.data.get(file_name, [])
+        if file_name in lines.data:
+            loc = sum(lines.data[file_name])
+        else:
+            loc = _count_lines_of_file(file_name)
+        data[file_name] = (
+            loc,
+            MeanHalsteadVolumeMetric({
+                file_name: halstead.data.get(file_name, HalsteadData(set(), set(), 0, 0))
+            }),
+            MeanCyclomaticComplexityMetric(sum(cyclomatic_values), len(cyclomatic_values))
+        )
+    return data
+
+class LinesOfFileRecordsCalculator(ClangMetricCalculator):
+    '''
+    Calculates number of lines of each parsed file.
+    Records are shared between MAINTAINABILITY_INDEX metrics.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return FileRecordsMetric(LINES_OF_FILE, {})
+        return FileRecordsMetric(
+            LINES_OF_FILE,
+            {node.spelling: [node.extent.end.line - node.extent.start.line + 1]}
+        )
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return cursor.kind == clang.cindex.CursorKind.TRANSLATION_UNIT
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.TRANSLATION_UNIT,
+        }
+
+    def needs_function_bodies(self) -> bool:
+        '''
+        Returns whether calculator uses bodies of functions and methods.
+        '''
+        return False
+
 class MeanMaintainabilityIndexMetric(Metric):
     '''
     Represents MEAN_MAINTAINABILITY_INDEX metric.
@@ -82,41 +161,20 @@ class MeanMaintainabilityIndexMetric(Metric):
             return MEAN_MAINTAINABILITY_INDEX, 0
         return MEAN_MAINTAINABILITY_INDEX, summ / n
 
-class MeanMaintainabilityIndexCalculator(ClangMetricCalculator):
+class MeanMaintainabilityIndexCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_MAINTAINABILITY_INDEX.
     '''
 
-    def __init__(self):
-        super().__init__()
-        self.__volume_calc = MeanHalsteadVolumeCalculator()
-        self.__cyclomatic_calc = MeanCyclomaticComplexityCalculator()
+    def records(self) -> list[ClangMetricCalculator]:
+        return [
+            LinesOfFileRecordsCalculator(),
+            HalsteadRecordsCalculator(),
+            CyclomaticComplexityRecordsCalculator()
+        ]
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        loc = 0
-        if node.kind == clang.cindex.CursorKind.TRANSLATION_UNIT:
-            loc = node.extent.end.line - node.extent.start.line + 1
-        if node.kind.is_translation_unit():
-            location = node.spelling
-        else:
-            location = node.location.file.name
-        return MeanMaintainabilityIndexMetric({
-            location: (
-                    loc,
-                    self.__volume_calc(node),
-                    self.__cyclomatic_calc(node)
-                )
-        })
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return True
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MeanMaintainabilityIndexMetric(_get_data(*records))
 
 class MinMaintainabilityIndexMetric(Metric):
     '''
@@ -161,38 +219,17 @@ class MinMaintainabilityIndexMetric(Metric):
             result = min(result, value)
         return MIN_MAINTAINABILITY_INDEX, result
 
-class MinMaintainabilityIndexCalculator(ClangMetricCalculator):
+class MinMaintainabilityIndexCalculator(DerivedMetricCalculator):
     '''
     Calculates MIN_MAINTAINABILITY_INDEX.
     '''
 
-    def __init__(self):
-        super().__init__()
-        self.__volume_calc = MeanHalsteadVolumeCalculator()
-        self.__cyclomatic_calc = MeanCyclomaticComplexityCalculator()
-
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        loc = 0
-        if node.kind == clang.cindex.CursorKind.TRANSLATION_UNIT:
-            loc = node.extent.end.line - node.extent.start.line + 1
-        if node.kind.is_translation_unit():
-            location = node.spelling
-        else:
-            location = node.location.file.name
-        return MinMaintainabilityIndexMetric({
-            location: (
-                    loc,
-                    self.__volume_calc(node),
-                    self.__cyclomatic_calc(node)
-                )
-        })
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [
+            LinesOfFileRecordsCalculator(),
+            HalsteadRecordsCalculator(),
+            CyclomaticComplexityRecordsCalculator()
+        ]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return True
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MinMaintainabilityIndexMetric(_get_data(*records))
@@ -29,6 +29,33 @@ class Metric:
         '''
         return self._name
 
+def reduce_metrics(metrics: list[Metric]) -> Metric | None:
+    '''
+    Sums `metrics` pairwise like a balanced tree, keeping their order.
+
+    Metrics that support in-place accumulation with `+=` are updated
+    in place, so `metrics` must not be used after reduction.
+
+    Parameters:
+    metrics (list[Metric]): metrics to sum.
+
+    Returns:
+    Metric | None: sum of metrics or `None` if `metrics` is empty.
+    '''
+    metrics = list(metrics)
+    while len(metrics) > 1:
+        reduced = []
+        for i in range(0, len(metrics) - 1, 2):
+            metric = metrics[i]
+            metric += metrics[i + 1]
+            reduced.append(metric)
+        if len(metrics) % 2 == 1:
+            reduced.append(metrics[-1])
+        metrics = reduced
+    if len(metrics) == 0:
+        return None
+    return metrics[0]
+
 # pylint: disable=R0903
 class BasicMetricCalculator:
     '''
@@ -72,3 +99,75 @@ class ClangMetricCalculator:
         Returns:
         bool: can cursor be used for calculation or not.
         '''
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        Cursors of other kinds are not passed to `__call__` during
+        AST traversal.
+
+        Returns:
+        set[clang.cindex.CursorKind] | None: kinds of cursors used by
+        this calculator or `None` if every cursor is used.
+        '''
+        return None
+
+    def needs_function_bodies(self) -> bool:
+        '''
+        Returns whether calculator uses statements inside bodies of
+        functions and methods. If no calculator needs them, bodies
+        are skipped during parsing.
+
+        Returns:
+        bool: are bodies of functions needed or not.
+        '''
+        return True
+
+class DerivedMetricCalculator(ClangMetricCalculator):
+    '''
+    Class for calculating specific metric from raw records shared
+    between metrics of one family.
+
+    Records are calculated by calculators returned by `records` once per
+    AST traversal regardless of how many metrics are derived from them.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        return self.from_records([calculator(node) for calculator in self.records()])
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        return any(calculator.validate_cursor(cursor) for calculator in self.records())
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        result = set()
+        for calculator in self.records():
+            kinds = calculator.cursor_kinds()
+            if kinds is None:
+                return None
+            result |= kinds
+        return result
+
+    def needs_function_bodies(self) -> bool:
+        return any(calculator.needs_function_bodies() for calculator in self.records())
+
+    def records(self) -> list[ClangMetricCalculator]:
+        '''
+        Returns calculators of raw records used by this metric.
+        Calculators of the same type are considered interchangeable,
+        so their records are calculated only once.
+
+        Returns:
+        list[ClangMetricCalculator]: calculators of records.
+        '''
+
+    def from_records(self, records: list[Metric]) -> Metric:
+        '''
+        Calculates metric from records.
+
+        Parameters:
+        records (list[Metric]): records accumulated by calculators
+        returned by `records` in the same order.
+
+        Returns:
+        Metric: Metric calculated from records.
+        '''
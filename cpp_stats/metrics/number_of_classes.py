@@ -53,3 +53,17 @@ class NumberOfClassesCalculator(ClangMetricCalculator):
         bool: can cursor be used for calculation or not.
         '''
         return cursor.kind == clang.cindex.CursorKind.CLASS_DECL and cursor.is_definition()
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CLASS_DECL,
+        }
+
+    def needs_function_bodies(self) -> bool:
+        '''
+        Returns whether calculator uses bodies of functions and methods.
+        '''
+        return False
@@ -5,20 +5,87 @@ Module for MEAN_NUMBER_OF_METHODS_PER_CLASS and MAX_NUMBER_OF_METHODS_PER_CLASS
 import clang.cindex
 
 from cpp_stats.metrics.metric_calculator import Metric, ClangMetricCalculator
-from cpp_stats.metrics.utils import mangle_cursor_name
+from cpp_stats.metrics.metric_calculator import DerivedMetricCalculator
+from cpp_stats.metrics.utils import mangle_cursor_name, has_function_body
+from cpp_stats.metrics.aggregation import mean_value, max_value
 
 MEAN_NUMBER_OF_METHODS_PER_CLASS = 'MEAN_NUMBER_OF_METHODS_PER_CLASS'
 MAX_NUMBER_OF_METHODS_PER_CLASS = 'MAX_NUMBER_OF_METHODS_PER_CLASS'
+NUMBER_OF_METHODS = 'NUMBER_OF_METHODS'
 
 def _merge_metric_data(lhv: dict[str, int], rhv: dict[str, int]):
-    new_data = lhv
-    for class_name, cnt in rhv.items():
-        if new_data.get(class_name, None) is None:
-            new_data[class_name] = cnt
-        else:
-            new_data[class_name] += cnt
+    new_data = dict(lhv)
+    _merge_metric_data_into(new_data, rhv)
     return new_data
 
+def _merge_metric_data_into(target: dict[str, int], source: dict[str, int]):
+    for class_name, cnt in source.items():
+        if target.get(class_name, None) is None:
+            target[class_name] = cnt
+        else:
+            target[class_name] += cnt
+
+class NumberOfMethodsRecordsMetric(Metric):
+    '''
+    Stores number of methods for each viewed class.
+    Records are shared between NUMBER_OF_METHODS_PER_CLASS metrics.
+    '''
+
+    def __init__(self, data: dict[str, int]):
+        '''
+        Initializes records.
+        
+        Parameters:
+        data (dict[str, int]): keys are the names of classes, values - number of methods.
+        '''
+        super().__init__(NUMBER_OF_METHODS)
+        self.data = data
+
+    def __add__(self, other):
+        if not isinstance(other, NumberOfMethodsRecordsMetric):
+            raise NotImplementedError
+        return NumberOfMethodsRecordsMetric(_merge_metric_data(self.data, other.data))
+
+    def __iadd__(self, other):
+        if not isinstance(other, NumberOfMethodsRecordsMetric):
+            raise NotImplementedError
+        _merge_metric_data_into(self.data, other.data)
+        return self
+
+class NumberOfMethodsRecordsCalculator(ClangMetricCalculator):
+    '''
+    Counts methods of each viewed class.
+    '''
+
+    def __call__(self, node: clang.cindex.Cursor) -> Metric:
+        if not self.validate_cursor(node):
+            return NumberOfMethodsRecordsMetric({})
+        return NumberOfMethodsRecordsMetric({mangle_cursor_name(node.semantic_parent): 1})
+
+    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
+        '''
+        Validates that given cursor can be used for calculation 
+        by this calculator in `__call__`.
+
+        Returns:
+        bool: can cursor be used for calculation or not.
+        '''
+        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and has_function_body(cursor)
+
+    def cursor_kinds(self) -> set[clang.cindex.CursorKind] | None:
+        '''
+        Returns kinds of cursors that can pass `validate_cursor`.
+        '''
+        return {
+            clang.cindex.CursorKind.CXX_METHOD,
+        }
+
+    def needs_function_bodies(self) -> bool:
+        '''
+        Returns whether calculator uses bodies of functions and methods.
+        '''
+        return False
+
 class MeanNumberOfMethodsMetric(Metric):
     '''
     Represents MEAN_NUMBER_OF_METHODS_PER_CLASS metric.
@@ -45,34 +112,19 @@ class MeanNumberOfMethodsMetric(Metric):
         '''
         Returns metric value.
         '''
-        sum_methods = 0
-        cnt_classes = len(self._data)
-        for _, cnt in self._data.items():
-            sum_methods += cnt
-        value = 0
-        if cnt_classes != 0:
-            value = sum_methods / cnt_classes
-        return MEAN_NUMBER_OF_METHODS_PER_CLASS, value
+        values = list(self._data.values())
+        return MEAN_NUMBER_OF_METHODS_PER_CLASS, mean_value(values, len(values))
 
-class MeanNumberOfMethodsCalculator(ClangMetricCalculator):
+class MeanNumberOfMethodsCalculator(DerivedMetricCalculator):
     '''
     Calculates MEAN_NUMBER_OF_METHODS_PER_CLASS.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MeanNumberOfMethodsMetric({})
-        return MeanNumberOfMethodsMetric({mangle_cursor_name(node.semantic_parent): 1})
+    def records(self) -> list[ClangMetricCalculator]:
+        return [NumberOfMethodsRecordsCalculator()]
 
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
-
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and cursor.is_definition()
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MeanNumberOfMethodsMetric(records[0].data)
 
 class MaxNumberOfMethodsMetric(Metric):
     '''
@@ -100,27 +152,15 @@ class MaxNumberOfMethodsMetric(Metric):
         '''
         Returns metric value.
         '''
-        max_value = 0
-        for cnt in self._data.values():
-            max_value = max(max_value, cnt)
-        return MAX_NUMBER_OF_METHODS_PER_CLASS, max_value
+        return MAX_NUMBER_OF_METHODS_PER_CLASS, max_value(self._data.values(), 0)
 
-class MaxNumberOfMethodsCalculator(ClangMetricCalculator):
+class MaxNumberOfMethodsCalculator(DerivedMetricCalculator):
     '''
     Calculates MAX_NUMBER_OF_METHODS_PER_CLASS.
     '''
 
-    def __call__(self, node: clang.cindex.Cursor) -> Metric:
-        if not self.validate_cursor(node):
-            return MaxNumberOfMethodsMetric({})
-        return MaxNumberOfMethodsMetric({mangle_cursor_name(node.semantic_parent): 1})
-
-    def validate_cursor(self, cursor: clang.cindex.Cursor) -> bool:
-        '''
-        Validates that given cursor can be used for calculation 
-        by this calculator in `__call__`.
+    def records(self) -> list[ClangMetricCalculator]:
+        return [NumberOfMethodsRecordsCalculator()]
 
-        Returns:
-        bool: can cursor be used for calculation or not.
-        '''
-        return cursor.kind == clang.cindex.CursorKind.CXX_METHOD and cursor.is_definition()
+    def from_records(self, records: list[Metric]) -> Metric:
+        return MaxNumberOfMethodsMetric(records[0].data)
@@ -0,0 +1,54 @@
+'''
+Module for raw records shared between metrics of one family.
+'''
+
+from cpp_stats.metrics.metric_calculator import Metric
+
+class FileRecordsMetric(Metric):
+    '''
+    Stores raw values calculated for functions, methods, classes and etc.
+    grouped by names of files where they are located.
+    '''
+
+    def __init__(self, name: str, data: dict[str, list[int]]):
+        '''
+        Initializes records.
+
+        Parameters:
+        name (str): name of records.
+        data (dict[str, list[int]]): values for each viewed file.
+        '''
+        super().__init__(name)
+        self.data = data
+
+    def __add__(self, other):
+        if not isinstance(other, FileRecordsMetric) or self.name() != other.name():
+            raise NotImplementedError
+        new_data = {}
+        for file_name, values in self.data.items():
+            new_data[file_name] = list(values)
+        for file_name, values in other.data.items():
+            if new_data.get(file_name, None) is None:
+                new_data[file_name] = list(values)
+            else:
+                new_data[file_name] += values
+        return FileRecordsMetric(self.name(), new_data)
+
+    def __iadd__(self, other):
+        if not isinstance(other, FileRecordsMetric) or self.name() != other.name():
+            raise NotImplementedError
+        for file_name, values in other.data.items():
+            if self.data.get(file_name, None) is None:
+                self.data[file_name] = list(values)
+            else:
+                self.data[file_name] += values
+        return self
+
+    def values(self) -> list[int]:
+        '''
+        Returns values of all viewed files.
+        '''
+        result = []
+        for values in self.data.values():
+            result += values
+        return result
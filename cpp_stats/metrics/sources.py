@@ -0,0 +1,110 @@
+'''
+Module for source text of parsed files shared between calculators.
+
+Each file is memory-mapped once and indexed by offsets of its lines,
+so text of any extent is sliced without reading the file again.
+'''
+
+from collections import OrderedDict
+import mmap
+
+from cpp_stats import instrumentation
+
+MAX_OPEN_FILES = 64
+
+class SourceFile:
+    '''
+    Memory-mapped file with offsets of its lines.
+    '''
+
+    def __init__(self, file_name: str):
+        '''
+        Maps file `file_name` into memory.
+
+        Parameters:
+        file_name (str): path to the file.
+
+        Raises:
+        OSError: if file can not be read.
+        '''
+        with open(file_name, 'rb') as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files can not be mapped
+                self._data = b''
+        self._line_offsets = [0]
+        position = self._data.find(b'\n')
+        while position != -1:
+            self._line_offsets.append(position + 1)
+            position = self._data.find(b'\n', position + 1)
+
+    def line_count(self) -> int:
+        '''
+        Returns number of lines, the same as extent of translation unit spans.
+        '''
+        return len(self._line_offsets)
+
+    def line_slice(self, line: int, start_column: int, end_column: int) -> str:
+        '''
+        Returns text of line `line` from column `start_column` until column `end_column`.
+        Lines and columns are counted from 1 like in locations of libclang.
+        '''
+        if line < 1 or line > len(self._line_offsets):
+            return ''
+        line_start = self._line_offsets[line - 1]
+        if line < len(self._line_offsets):
+            line_end = self._line_offsets[line]
+        else:
+            line_end = len(self._data)
+        start = min(line_start + max(start_column - 1, 0), line_end)
+        end = min(line_start + max(end_column - 1, 0), line_end)
+        text = self._data[start:end].decode('utf-8', errors='replace')
+        return text.replace('\r\n', '\n')
+
+    def close(self):
+        '''
+        Unmaps file.
+        '''
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+class SourceStore:
+    '''
+    Keeps the most recently used files memory-mapped,
+    at most `max_open_files` of them at once.
+    '''
+
+    def __init__(self, max_open_files: int = MAX_OPEN_FILES):
+        self._max_open_files = max_open_files
+        self._files = OrderedDict()
+
+    def get(self, file_name: str) -> SourceFile:
+        '''
+        Returns mapped file `file_name`, it is mapped on first use.
+
+        Raises:
+        OSError: if file can not be read.
+        '''
+        source_file = self._files.get(file_name, None)
+        if source_file is not None:
+            self._files.move_to_end(file_name)
+            return source_file
+        source_file = SourceFile(file_name)
+        if instrumentation.active_counter is not None:
+            instrumentation.active_counter.add(instrumentation.SOURCE_FILE_OPENS)
+        self._files[file_name] = source_file
+        if len(self._files) > self._max_open_files:
+            _, evicted = self._files.popitem(last=False)
+            evicted.close()
+        return source_file
+
+    def clear(self):
+        '''
+        Unmaps all files.
+        '''
+        for source_file in self._files.values():
+            source_file.close()
+        self._files.clear()
+
+source_store = SourceStore()
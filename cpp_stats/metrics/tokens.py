@@ -0,0 +1,99 @@
+'''
+Module for tokens of parsed files shared between calculators.
+
+Each file of a translation unit is tokenized once, later lookups of tokens
+of cursors are answered from the table without crossing into libclang.
+Cursors whose extents come from macro expansions are tokenized by libclang,
+because it tokenizes spelling of such ranges, e.g. arguments or definition of macro.
+'''
+
+from bisect import bisect_left
+import os
+import weakref
+
+import clang.cindex
+
+from cpp_stats import instrumentation
+
+_tables = weakref.WeakKeyDictionary()
+
+# raw encoding of a location inside a macro expansion has this bit set
+_MACRO_ID_BIT = 1 << 31
+
+# pylint: disable=R0903
+class TokenTable:
+    '''
+    Stores spellings of all tokens of a file ordered by their offsets.
+    '''
+
+    def __init__(self, translation_unit: clang.cindex.TranslationUnit, file: clang.cindex.File):
+        '''
+        Tokenizes `file` of `translation_unit`.
+
+        Parameters:
+        translation_unit (clang.cindex.TranslationUnit): translation unit containing file.
+        file (clang.cindex.File): file to tokenize.
+        '''
+        self.starts = []
+        self.ends = []
+        self.spellings = []
+        try:
+            size = os.path.getsize(file.name)
+        except OSError:
+            return
+        extent = clang.cindex.SourceRange.from_locations(
+            clang.cindex.SourceLocation.from_offset(translation_unit, file, 0),
+            clang.cindex.SourceLocation.from_offset(translation_unit, file, size)
+        )
+        for token in translation_unit.get_tokens(extent=extent):
+            token_extent = token.extent
+            self.starts.append(token_extent.start.offset)
+            self.ends.append(token_extent.end.offset)
+            self.spellings.append(token.spelling)
+        if instrumentation.active_counter is not None:
+            instrumentation.active_counter.add(instrumentation.TOKENS, len(self.spellings))
+
+    def between(self, start: int, end: int) -> list[str]:
+        '''
+        Returns spellings of tokens like libclang tokenizes range from `start` to `end`:
+        tokens are taken from `start` until a token that ends at or after `end`.
+        '''
+        first = bisect_left(self.starts, start)
+        if first == len(self.starts):
+            return []
+        last = min(bisect_left(self.ends, end, first), len(self.ends) - 1)
+        return self.spellings[first:last + 1]
+
+def get_token_table(translation_unit: clang.cindex.TranslationUnit,
+                    file: clang.cindex.File) -> TokenTable:
+    '''
+    Returns token table of `file`, which is built once per translation unit.
+
+    Parameters:
+    translation_unit (clang.cindex.TranslationUnit): translation unit containing file.
+    file (clang.cindex.File): file of tokens.
+    '''
+    tables = _tables.setdefault(translation_unit, {})
+    table = tables.get(file.name, None)
+    if table is None:
+        table = TokenTable(translation_unit, file)
+        tables[file.name] = table
+    return table
+
+def get_token_spellings(cursor: clang.cindex.Cursor) -> list[str]:
+    '''
+    Returns spellings of tokens of `cursor`, same as spellings of `cursor.get_tokens()`.
+
+    Parameters:
+    cursor (clang.cindex.Cursor): cursor of tokens.
+    '''
+    extent = cursor.extent
+    start = extent.start
+    end = extent.end
+    if (start.int_data | end.int_data) & _MACRO_ID_BIT:
+        return [token.spelling for token in cursor.get_tokens()]
+    start_file = start.file
+    end_file = end.file
+    if start_file is None or end_file is None or start_file.name != end_file.name:
+        return []
+    return get_token_table(cursor.translation_unit, start_file).between(start.offset, end.offset)
@@ -2,23 +2,52 @@
 Module for helper functions
 '''
 
+import sys
+import weakref
+
 import clang.cindex
 
+from cpp_stats.metrics.tokens import get_token_table
+
+_names = weakref.WeakKeyDictionary()
+
 def mangle_cursor_name(node: clang.cindex.Cursor) -> str:
     '''
     Returns string that contains full name of node with parent classes, namespaces and etc.
     
     Example:
     `::ThreeDRenderer::Camera`
+
+    Names are cached per translation unit, so every parent is resolved once.
     
     Parameters:
     node (clang.cindex.Cursor): cursor for which mangled name is being calculated.
     '''
     if node is None:
         return ""
-    if node.kind == clang.cindex.CursorKind.TRANSLATION_UNIT:
-        return ""
-    return mangle_cursor_name(node.semantic_parent) + '::' + node.displayname
+    names = _names.setdefault(node.translation_unit, {})
+    unnamed = []
+    name = ""
+    cursor = node
+    while cursor is not None and cursor.kind != clang.cindex.CursorKind.TRANSLATION_UNIT:
+        cached = names.get(_get_cursor_key(cursor), None)
+        if cached is not None:
+            name = cached
+            break
+        unnamed.append(cursor)
+        cursor = cursor.semantic_parent
+    for cursor in reversed(unnamed):
+        name = sys.intern(name + '::' + cursor.displayname)
+        names[_get_cursor_key(cursor)] = name
+    return name
+
+def _get_cursor_key(cursor: clang.cindex.Cursor) -> tuple:
+    '''
+    Returns key that identifies cursor inside its translation unit without calling libclang.
+    Cursors are not stored, so cache of names does not keep translation unit alive.
+    '''
+    # pylint: disable=W0212
+    return (cursor._kind_id, cursor.xdata, *cursor.data)
 
 def is_definition_of_func_or_method(node: clang.cindex.Cursor) -> bool:
     '''
@@ -35,3 +64,34 @@ def is_definition_of_func_or_method(node: clang.cindex.Cursor) -> bool:
         ]
         and node.is_definition()
     )
+
+_BODY_LOOKAHEAD = 256
+
+def has_function_body(node: clang.cindex.Cursor) -> bool:
+    '''
+    Says whether function or method has body.
+
+    Unlike `is_definition`, works also for translation units parsed with
+    `PARSE_SKIP_FUNCTION_BODIES`, where skipped bodies are not part of the AST:
+    tokens after the declarator tell definition (`{`, `try` or constructor
+    initializers) from declaration (`;` or `= 0`, `= default`, `= delete`).
+
+    Parameters:
+    node (clang.cindex.Cursor): cursor of function or method to check.
+    '''
+    if node.is_definition():
+        return True
+    end = node.extent.end
+    if end.file is None:
+        return False
+    bound = end.offset + _BODY_LOOKAHEAD
+    if node.lexical_parent is not None and node.lexical_parent.extent.end.file is not None:
+        bound = min(bound, node.lexical_parent.extent.end.offset)
+    if bound <= end.offset:
+        return False
+    for token in get_token_table(node.translation_unit, end.file).between(end.offset, bound):
+        if token in ('{', 'try', ':'):
+            return True
+        if token in (';', '=', '}'):
+            return False
+    return False
@@ -0,0 +1,107 @@
+'''
+Module for measuring where time of analysis goes.
+
+Wall and CPU time are accumulated per phase of analysis, per file and per calculator.
+Profiles of worker processes are merged into the profile of the main process,
+so times of parallel phases are summed over workers.
+'''
+
+from contextlib import contextmanager
+from typing import Iterator
+import time
+
+DEFAULT_TOP_FILES = 10
+
+class Profiler:
+    '''
+    Accumulates wall time, CPU time and number of measurements
+    as `[wall, cpu, count]` lists keyed by phases, files and calculators.
+    '''
+
+    def __init__(self):
+        self.phases = {}
+        self.files = {}
+        self.calculators = {}
+
+    @contextmanager
+    def measure(self, phase: str, file_path: str | None = None) -> Iterator[None]:
+        '''
+        Measures time of the block as `phase`, also for `file_path` if it is given.
+        '''
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            _add_timing(self.phases, phase, wall, cpu)
+            if file_path is not None:
+                _add_timing(self.files.setdefault(file_path, {}), phase, wall, cpu)
+
+    def add_calculator(self, name: str, wall: float, cpu: float):
+        '''
+        Adds time of one call of calculator `name`.
+        '''
+        _add_timing(self.calculators, name, wall, cpu)
+
+    def merge(self, other: 'Profiler'):
+        '''
+        Adds all times measured by `other`.
+        '''
+        _merge_timings(self.phases, other.phases)
+        _merge_timings(self.calculators, other.calculators)
+        for file_path, phases in other.files.items():
+            _merge_timings(self.files.setdefault(file_path, {}), phases)
+
+    def report(self, top_files: int = DEFAULT_TOP_FILES) -> dict:
+        '''
+        Returns profile that can be stored as JSON.
+
+        Parameters:
+        top_files (int): Number of the slowest files listed separately.
+        '''
+        files = {
+            file_path: _to_json(phases)
+            for file_path, phases in sorted(self.files.items())
+        }
+        slowest_files = sorted(
+            files.items(),
+            key=lambda item: sum(timing['wall'] for timing in item[1].values()),
+            reverse=True
+        )[:top_files]
+        return {
+            'phases': _to_json(self.phases),
+            'calculators': _to_json(self.calculators),
+            'files': files,
+            'slowest_files': [
+                {
+                    'file': file_path,
+                    'wall': sum(timing['wall'] for timing in phases.values()),
+                    'cpu': sum(timing['cpu'] for timing in phases.values()),
+                }
+                for file_path, phases in slowest_files
+            ],
+        }
+
+def _add_timing(timings: dict[str, list], name: str, wall: float, cpu: float):
+    timing = timings.get(name, None)
+    if timing is None:
+        timings[name] = [wall, cpu, 1]
+    else:
+        timing[0] += wall
+        timing[1] += cpu
+        timing[2] += 1
+
+def _merge_timings(timings: dict[str, list], other: dict[str, list]):
+    for name, (wall, cpu, count) in other.items():
+        timing = timings.setdefault(name, [0.0, 0.0, 0])
+        timing[0] += wall
+        timing[1] += cpu
+        timing[2] += count
+
+def _to_json(timings: dict[str, list]) -> dict[str, dict]:
+    return {
+        name: {'wall': wall, 'cpu': cpu, 'count': count}
+        for name, (wall, cpu, count) in sorted(timings.items())
+    }
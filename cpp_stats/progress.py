@@ -0,0 +1,181 @@
+'''
+Module for reporting progress and throughput of long analyses.
+
+Analysis only increments counters of the reporter, lines are written by
+a background thread every few seconds, so reporting costs nearly nothing per file.
+Files analyzed in worker processes are reported by the main process
+when their results arrive, so the same reporter works for any number of jobs.
+'''
+
+from typing import TextIO
+import json
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 5.0
+
+TEXT = 'text'
+JSON = 'json'
+FORMATS = [TEXT, JSON]
+
+# pylint: disable=R0902
+class ProgressReporter:
+    '''
+    Tracks files done out of total, lines of code per second, current file,
+    estimated time left and the slowest file of a phase, e.g. `analysis`.
+    '''
+
+    def __init__(self, stream: TextIO = sys.stderr, log_format: str = TEXT,
+                 interval: float = DEFAULT_INTERVAL):
+        '''
+        Initializes reporter.
+
+        Parameters:
+        stream (TextIO): Stream lines are written to.
+        log_format (str): `text` for lines read by people, `json` for a JSON object per line.
+        interval (float): Seconds between lines written while a phase runs.
+
+        Raises:
+        ValueError: if format is unknown or interval is not positive.
+        '''
+        if log_format not in FORMATS:
+            raise ValueError(f'unknown progress format: {log_format}')
+        if interval <= 0:
+            raise ValueError('interval of progress must be positive')
+        self._stream = stream
+        self._log_format = log_format
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.phase = None
+        self.total = 0
+        self.done = 0
+        self.lines = 0
+        self.started = None
+        # file being analyzed with time it started and the slowest file with its time,
+        # tuples are replaced as a whole because another thread reads them
+        self.current = None
+        self.slowest = None
+
+    def start(self, phase: str, total: int = 0):
+        '''
+        Starts `phase` with `total` files and writes lines until `finish` is called.
+        '''
+        self.phase = phase
+        self.total = total
+        self.done = 0
+        self.lines = 0
+        self.started = time.perf_counter()
+        self.current = None
+        self.slowest = None
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._write_periodically, daemon=True)
+        self._thread.start()
+
+    def add_files(self, count: int):
+        '''
+        Adds `count` files to total of the phase.
+        '''
+        self.total += count
+
+    def file_started(self, file_path: str):
+        '''
+        Marks `file_path` as the file being analyzed.
+        '''
+        self.current = (file_path, time.perf_counter())
+
+    def file_done(self, file_path: str, seconds: float | None, lines: int):
+        '''
+        Marks `file_path` as analyzed.
+
+        Parameters:
+        file_path (str): Path to analyzed file.
+        seconds (float | None): Time of analysis, since `file_started` if `None`.
+        lines (int): Lines of the file, known to the analysis, so the file is not read again.
+        '''
+        if seconds is None:
+            seconds = time.perf_counter() - self.current[1]
+        self.done += 1
+        self.lines += lines
+        if self.slowest is None or seconds > self.slowest[1]:
+            self.slowest = (file_path, seconds)
+        if self.current is None or self.current[0] != file_path:
+            # files analyzed in workers are reported when they are done
+            self.current = (file_path, time.perf_counter())
+
+    def finish(self):
+        '''
+        Stops the phase and writes its final line.
+        '''
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self.current = None
+        self._write()
+
+    def snapshot(self) -> dict:
+        '''
+        Returns state of the phase that can be stored as JSON.
+        '''
+        elapsed = time.perf_counter() - self.started
+        eta = None
+        if 0 < self.done <= self.total:
+            eta = elapsed / self.done * (self.total - self.done)
+        current = self.current
+        if current is not None:
+            current = {'file': current[0], 'seconds': time.perf_counter() - current[1]}
+        slowest = self.slowest
+        if slowest is not None:
+            slowest = {'file': slowest[0], 'seconds': slowest[1]}
+        return {
+            'phase': self.phase,
+            'done': self.done,
+            'total': self.total,
+            'lines': self.lines,
+            'elapsed': elapsed,
+            'lines_per_second': self.lines / elapsed if elapsed > 0 else 0.0,
+            'eta': eta,
+            'current': current,
+            'slowest': slowest,
+        }
+
+    def format_line(self) -> str:
+        '''
+        Returns state of the phase as a line in format of the reporter.
+        '''
+        state = self.snapshot()
+        if self._log_format == JSON:
+            return json.dumps(state)
+        parts = [
+            f'cpp-stats: {state["phase"]} {state["done"]}/{state["total"]} files',
+            f'{state["lines_per_second"]:.0f} LOC/s',
+            f'elapsed {_format_duration(state["elapsed"])}',
+        ]
+        if state['eta'] is not None and state['done'] < state['total']:
+            parts.append(f'ETA {_format_duration(state["eta"])}')
+        if state['current'] is not None:
+            current = state['current']
+            parts.append(f'current {current["file"]} ({current["seconds"]:.1f}s)')
+        if state['slowest'] is not None:
+            slowest = state['slowest']
+            parts.append(f'slowest {slowest["file"]} ({slowest["seconds"]:.1f}s)')
+        return ', '.join(parts)
+
+    def _write_periodically(self):
+        while not self._stopped.wait(self._interval):
+            self._write()
+
+    def _write(self):
+        line = self.format_line()
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02}:{seconds:02}'
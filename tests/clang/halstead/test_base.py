@@ -3,7 +3,7 @@ import pathlib
 import platform
 
 from cpp_stats.metrics.halstead.base import HalsteadData
-from cpp_stats.metrics.halstead.base import create_data, merge_data
+from cpp_stats.metrics.halstead.base import create_data, merge_data, merge_data_into
 from cpp_stats.metrics.halstead.base import __get_binary_operator_spelling
 from cpp_stats.metrics.halstead.base import __get_literal_spelling
 from cpp_stats.metrics.halstead.base import __get_unary_operator_spelling
@@ -197,6 +197,60 @@ def test_merge_data():
     assert expected['file2'].__dict__ == actual['file2'].__dict__
     assert expected['file3'].__dict__ == actual['file3'].__dict__
 
+def test_merge_data_does_not_change_arguments():
+    h1 = HalsteadData(set(['n1']), set(['n1']), 1, 1)
+    h2 = HalsteadData(set(['n2']), set(['n2']), 1, 1)
+    expected = {'n1'}
+
+    merge_data({"file1": h1}, {"file1": h2})
+
+    assert expected == h1.n1
+
+def test_merged_data_does_not_share_arguments():
+    h1 = HalsteadData(set(['n1']), set(['n1']), 1, 1)
+    h2 = HalsteadData(set(['n2']), set(['n2']), 1, 1)
+    h3 = HalsteadData(set(['n3']), set(['n3']), 1, 1)
+
+    merged = merge_data({"file1": h1}, {"file2": h2})
+    merge_data_into(merged, {"file1": h3, "file2": h3})
+
+    assert {'n1'} == h1.n1
+    assert {'n2'} == h2.n1
+    assert 1 == h1.N1
+    assert 1 == h2.N1
+
+def test_merge_data_into_does_not_change_source():
+    h1 = HalsteadData(set(['n1']), set(['n1']), 1, 1)
+    h2 = HalsteadData(set(['n2']), set(['n2']), 1, 1)
+    target = {}
+
+    merge_data_into(target, {"file1": h1})
+    merge_data_into(target, {"file1": h2})
+
+    assert {'n1'} == h1.n1
+    assert 1 == h1.N1
+
+def test_merge_data_into():
+    h1 = HalsteadData(set(['n1', 'n2']), set(['n1', 'n2']), 2, 2)
+    h2 = HalsteadData(set(['n3', 'n2']), set(['n3', 'n2']), 2, 2)
+    h3 = HalsteadData(set(['n1', 'n3']), set(['n1', 'n3']), 2, 2)
+    target = {
+        "file1": h1,
+        "file2": h2,
+    }
+    expected = {
+        "file1": HalsteadData(set(['n1', 'n2', 'n3']), set(['n1', 'n2', 'n3']), 4, 4),
+        "file2": HalsteadData(set(['n3', 'n2']), set(['n3', 'n2']), 2, 2),
+        "file3": HalsteadData(set(['n1', 'n3']), set(['n1', 'n3']), 2, 2)
+    }
+
+    merge_data_into(target, {"file1": h3, "file3": h3})
+
+    assert list(expected) == list(target)
+    for file_name, halstead_data in expected.items():
+        assert halstead_data.__dict__ == target[file_name].__dict__
+    assert target['file1'] is h1
+
 def test_get_binary_operator_spelling_1(clang_index: clang.cindex.Index):
     tu = clang_index.parse("./tests/data/analyze/halstead/spelling/binary_operator_1.hpp",
                            args=['-x', 'c++'])
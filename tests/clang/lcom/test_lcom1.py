@@ -2,6 +2,7 @@ import pytest
 import pathlib
 
 from cpp_stats.metrics.lcom.lcom1 import MeanLCOM1Calculator, MaxLCOM1Calculator
+from cpp_stats.metrics.lcom.base import LCOMClassData, LCOMMethodData, merge_class_lcom_data_into
 from cpp_stats.ast.ast_tree import analyze_ast
 
 import clang.cindex
@@ -37,3 +38,26 @@ def test_max_metric_calculator(clang_index: clang.cindex.Index):
 
     _, actual = result["MAX_LCOM1"].get()
     assert abs(expected - actual) < EPS
+
+def test_merge_class_lcom_data_into():
+    target = {"A": LCOMClassData("A", {"m1": LCOMMethodData("m1")}, {"f1"})}
+    source = {
+        "A": LCOMClassData("A", {"m2": LCOMMethodData("m2")}, {"f2"}),
+        "B": LCOMClassData("B", {}, {"f1"})
+    }
+
+    merge_class_lcom_data_into(target, source)
+
+    assert sorted(target) == ["A", "B"]
+    assert sorted(target["A"].method_data) == ["m1", "m2"]
+    assert target["A"].fields == {"f1", "f2"}
+
+def test_merge_class_lcom_data_into_does_not_change_source():
+    source = {"A": LCOMClassData("A", {"m1": LCOMMethodData("m1")}, {"f1"})}
+    target = {}
+
+    merge_class_lcom_data_into(target, source)
+    merge_class_lcom_data_into(target, {"A": LCOMClassData("A", {"m2": LCOMMethodData("m2")}, {"f2"})})
+
+    assert sorted(source["A"].method_data) == ["m1"]
+    assert source["A"].fields == {"f1"}
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+
+from cpp_stats.profiling import Profiler
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_profile_covers_files_and_calculators(analyze_repo, jobs: int):
+    repo_path = Path('./tests/data/analyze')
+    files = sorted(repo_path.glob('*.hpp'))
+    profiler = Profiler()
+
+    analyze_repo(repo_path, files, profiler=profiler, jobs=jobs, metrics=['NUMBER_OF_CLASSES'])
+    report = profiler.report(top_files=3)
+
+    assert {'compilation_commands', 'parse', 'traversal', 'merge'} == set(report['phases'])
+    assert len(files) == report['phases']['parse']['count']
+    assert sorted(str(file) for file in files) == list(report['files'])
+    assert ['NUMBER_OF_CLASSES'] == list(report['calculators'])
+    assert 3 == len(report['slowest_files'])
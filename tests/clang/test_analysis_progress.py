@@ -0,0 +1,42 @@
+from pathlib import Path
+import io
+import json
+
+import pytest
+
+from cpp_stats.progress import ProgressReporter
+
+@pytest.mark.parametrize("options", [
+    {'jobs': 1},
+    {'jobs': 2},
+    {'jobs': 2, 'max_memory': 1 << 40},
+    {'jobs': 2, 'attribute_headers': True},
+])
+def test_progress_counts_all_files(analyze_repo, options: dict):
+    repo_path = Path('./tests/data/analyze')
+    files = sorted(repo_path.glob('*.hpp'))
+    stream = io.StringIO()
+
+    analyze_repo(repo_path, files, progress=ProgressReporter(stream, 'json'),
+                 metrics=['NUMBER_OF_CLASSES'], **options)
+    state = json.loads(stream.getvalue().splitlines()[-1])
+
+    assert 'analysis' == state['phase']
+    assert len(files) == state['done'] == state['total']
+    assert sum(len(file.read_text(encoding='utf-8').splitlines()) for file in files) \
+        == state['lines']
+    assert state['slowest']['file'] in [str(file) for file in files]
+
+def test_cached_files_are_reported(analyze_repo, tmp_path: Path):
+    repo_path = Path('./tests/data/analyze')
+    files = sorted(repo_path.glob('*.hpp'))
+    options = {'metrics': ['NUMBER_OF_CLASSES'], 'cache_dir': str(tmp_path)}
+    analyze_repo(repo_path, files, **options)
+    stream = io.StringIO()
+
+    analyze_repo(repo_path, files, progress=ProgressReporter(stream, 'json'), **options)
+    state = json.loads(stream.getvalue().splitlines()[-1])
+
+    assert len(files) == state['done'] == state['total']
+    assert sum(len(file.read_text(encoding='utf-8').splitlines()) for file in files) \
+        == state['lines']
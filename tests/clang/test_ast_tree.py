@@ -4,7 +4,18 @@ import pytest
 import clang.cindex
 
 from cpp_stats.metrics.number_of_classes import NumberOfClassesCalculator, METRIC_NAME
-from cpp_stats.ast.ast_tree import analyze_ast, _analyze_children
+from cpp_stats.metrics.cyclomatic_complexity import MeanCyclomaticComplexityCalculator
+from cpp_stats.metrics.cyclomatic_complexity import MaxCyclomaticComplexityCalculator
+from cpp_stats.metrics.cyclomatic_complexity import MEAN_CYCLOMATIC_COMPLEXITY, MAX_CYCLOMATIC_COMPLEXITY
+from cpp_stats.ast.ast_tree import analyze_ast, _analyze_children, _build_dispatch_table
+from cpp_stats.ast.ast_tree import _extract_nodes
+from cpp_stats.ast.ast_tree import get_parse_options
+from cpp_stats.ast.ast_tree import _get_traversed_calculators, _split_into_shards
+from cpp_stats.ast.options import AnalysisOptions
+from cpp_stats.metrics.halstead.volume import MeanHalsteadVolumeCalculator
+from cpp_stats.metrics.lcom.lcom4 import MeanLCOM4Calculator
+from cpp_stats.metrics.arg_types.camc import MeanCAMCCalculator
+from cpp_stats.metrics.maintainability_index import MeanMaintainabilityIndexCalculator
 
 def test_when_nested_then_check_nested_class(clang_index: clang.cindex.Index):
     files = [Path('./tests/data/analyze/nested.hpp')]
@@ -15,3 +26,152 @@ def test_when_nested_then_check_nested_class(clang_index: clang.cindex.Index):
 
     _, actual = result[METRIC_NAME].get()
     assert expected == actual
+
+def test_dispatch_table_groups_calculators_by_cursor_kind(clang_index: clang.cindex.Index):
+    calculator = NumberOfClassesCalculator()
+
+    table = _build_dispatch_table({METRIC_NAME: calculator})
+
+    assert table[clang.cindex.CursorKind.CLASS_DECL] == [(METRIC_NAME, calculator)]
+    assert table[clang.cindex.CursorKind.CXX_METHOD] == []
+
+def test_when_no_matching_cursors_then_metric_is_present(clang_index: clang.cindex.Index):
+    files = [Path('./tests/data/analyze/cyclomatic_complexity.hpp')]
+    calculators = {METRIC_NAME: NumberOfClassesCalculator()}
+    expected = 0
+
+    result = analyze_ast(clang_index, "./tests/data/analyze/", files, calculators)
+
+    _, actual = result[METRIC_NAME].get()
+    assert expected == actual
+
+def test_when_metrics_of_one_family_then_records_are_calculated_once():
+    calculators = {
+        MEAN_CYCLOMATIC_COMPLEXITY: MeanCyclomaticComplexityCalculator(),
+        MAX_CYCLOMATIC_COMPLEXITY: MaxCyclomaticComplexityCalculator(),
+        METRIC_NAME: NumberOfClassesCalculator(),
+    }
+
+    actual = _get_traversed_calculators(calculators)
+
+    assert len(actual) == 2
+    assert isinstance(actual[METRIC_NAME], NumberOfClassesCalculator)
+
+def test_derived_metrics_of_one_family(clang_index: clang.cindex.Index):
+    files = [Path('./tests/data/analyze/cyclomatic_complexity.hpp')]
+    calculators = {
+        MEAN_CYCLOMATIC_COMPLEXITY: MeanCyclomaticComplexityCalculator(),
+        MAX_CYCLOMATIC_COMPLEXITY: MaxCyclomaticComplexityCalculator(),
+    }
+
+    result = analyze_ast(clang_index, "./tests/data/analyze/", files, calculators)
+
+    assert result[MEAN_CYCLOMATIC_COMPLEXITY].cnt != 0
+    assert result[MAX_CYCLOMATIC_COMPLEXITY].value == 5
+
+def test_parallel_analysis_equals_serial(clang_index: clang.cindex.Index):
+    files = sorted(Path('./tests/data/analyze').rglob('*.hpp'))
+    calculators = {
+        METRIC_NAME: NumberOfClassesCalculator(),
+        MEAN_CYCLOMATIC_COMPLEXITY: MeanCyclomaticComplexityCalculator(),
+        MAX_CYCLOMATIC_COMPLEXITY: MaxCyclomaticComplexityCalculator(),
+        'MEAN_HALSTEAD_VOLUME': MeanHalsteadVolumeCalculator(),
+        'MEAN_LCOM4': MeanLCOM4Calculator(),
+        'MEAN_CAMC': MeanCAMCCalculator(),
+        'MEAN_MAINTAINABILITY_INDEX': MeanMaintainabilityIndexCalculator(),
+    }
+    serial = analyze_ast(clang_index, "./tests/data/analyze/", files, calculators)
+    expected = {name: metric.get() for name, metric in serial.items()}
+
+    parallel = analyze_ast(
+        clang_index, "./tests/data/analyze/", files, calculators, AnalysisOptions(jobs=3)
+    )
+    actual = {name: metric.get() for name, metric in parallel.items()}
+
+    assert expected == actual
+
+def test_split_into_shards_keeps_order():
+    files = [Path(f'file{i}.cpp') for i in range(10)]
+
+    shards = _split_into_shards(files, 2)
+
+    assert len(shards) == 5
+    assert [file for shard in shards for file in shard] == files
+
+def test_structural_metrics_skip_function_bodies():
+    calculators = _get_traversed_calculators({
+        METRIC_NAME: NumberOfClassesCalculator(),
+        'MEAN_CAMC': MeanCAMCCalculator(),
+    })
+    expected = (clang.cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+                | clang.cindex.TranslationUnit.PARSE_INCOMPLETE)
+
+    actual = get_parse_options(calculators, True)
+
+    assert expected == actual
+
+def test_function_bodies_are_parsed_by_default():
+    calculators = _get_traversed_calculators({
+        METRIC_NAME: NumberOfClassesCalculator(),
+        'MEAN_CAMC': MeanCAMCCalculator(),
+    })
+    expected = clang.cindex.TranslationUnit.PARSE_NONE
+
+    actual = get_parse_options(calculators)
+
+    assert expected == actual
+
+def test_body_metrics_parse_function_bodies():
+    calculators = _get_traversed_calculators({
+        METRIC_NAME: NumberOfClassesCalculator(),
+        MEAN_CYCLOMATIC_COMPLEXITY: MeanCyclomaticComplexityCalculator(),
+    })
+    expected = clang.cindex.TranslationUnit.PARSE_NONE
+
+    actual = get_parse_options(calculators, True)
+
+    assert expected == actual
+
+def test_only_requested_metrics_are_calculated(clang_index: clang.cindex.Index):
+    files = [Path('./tests/data/analyze/cyclomatic_complexity.hpp')]
+    calculators = {
+        METRIC_NAME: NumberOfClassesCalculator(),
+        MAX_CYCLOMATIC_COMPLEXITY: MaxCyclomaticComplexityCalculator(),
+    }
+    expected = [METRIC_NAME]
+
+    result = analyze_ast(clang_index, "./tests/data/analyze/", files, calculators,
+                         AnalysisOptions(metrics=[METRIC_NAME]))
+
+    assert expected == list(result)
+
+def _walk_in_file(cursor: clang.cindex.Cursor, file_name: str):
+    for child in cursor.get_children():
+        if child.location.file is None or child.location.file.name != file_name:
+            continue
+        yield child
+        yield from _walk_in_file(child, file_name)
+
+def test_extracted_nodes_are_in_preorder(clang_index: clang.cindex.Index):
+    file_name = './tests/data/analyze/cognitive_complexity.hpp'
+    translation_unit = clang_index.parse(file_name, args=['-x', 'c++'])
+    result = {}
+    table = {kind: [('ALL', None)] for kind in clang.cindex.CursorKind.get_all_kinds()}
+    expected = [
+        (cursor.kind, cursor.spelling, cursor.extent.start.offset)
+        for cursor in _walk_in_file(translation_unit.cursor, file_name)
+    ]
+
+    actual = _extract_nodes({file_name: result}, table, translation_unit.cursor)
+
+    assert expected == [
+        (cursor.kind, cursor.spelling, cursor.extent.start.offset) for _, _, cursor in actual
+    ]
+    assert all(node_result is result for node_result, _, _ in actual)
+
+def test_errors_of_calculators_are_raised(clang_index: clang.cindex.Index):
+    file_name = './tests/data/analyze/nested.hpp'
+    translation_unit = clang_index.parse(file_name, args=['-x', 'c++'])
+
+    with pytest.raises(KeyError):
+        _extract_nodes({file_name: {}}, {}, translation_unit.cursor)
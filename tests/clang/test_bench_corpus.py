@@ -0,0 +1,25 @@
+from pathlib import Path
+
+import clang.cindex
+
+from cpp_stats.bench.corpus import CorpusOptions, generate_corpus
+from cpp_stats.bench.scenarios import run_benchmarks
+
+def test_corpus_parses_without_errors(clang_index: clang.cindex.Index, tmp_path: Path):
+    generate_corpus(tmp_path, CorpusOptions(files=3, nesting_depth=4))
+
+    for file in sorted(tmp_path.joinpath('src').glob('*.cpp')):
+        translation_unit = clang_index.parse(str(file), args=['-x', 'c++'])
+        errors = [
+            diagnostic for diagnostic in translation_unit.diagnostics
+            if diagnostic.severity >= clang.cindex.Diagnostic.Error
+        ]
+        assert not errors, [str(error) for error in errors]
+
+def test_run_clang_scenarios(clang_index: clang.cindex.Index, tmp_path: Path):
+    generate_corpus(tmp_path, CorpusOptions(files=2, classes_per_file=1, methods_per_class=2))
+
+    results = run_benchmarks(tmp_path, ['family:number_of_classes', 'report'], repeat=1)
+
+    assert ['family:number_of_classes', 'report'] == list(results['scenarios'])
+    assert results['environment']['libclang'] is not None
@@ -0,0 +1,151 @@
+from pathlib import Path
+import os
+import subprocess
+
+import pytest
+
+from cpp_stats.ast.cache import get_cache_args
+from cpp_stats.ast.options import AnalysisOptions
+
+_SOURCES = {
+    'shape.hpp':
+        '#pragma once\n'
+        'class Shape {\n'
+        'public:\n'
+        '    int side(int x) { if (x > 0) { return x; } return -x; }\n'
+        '};\n',
+    'a.cpp':
+        '#include "shape.hpp"\n'
+        'class A { int g(Shape s) { return s.side(2); } };\n',
+    'b.cpp':
+        'int b(int x) { return x > 0 ? 1 : 0; }\n',
+}
+
+@pytest.mark.parametrize("options", [
+    {},
+    {'jobs': 2},
+    {'attribute_headers': True},
+    {'precompiled_headers': True},
+])
+def test_cached_results_are_equal_to_uncached(analyze_repo, write_repo, tmp_path: Path,
+                                              options: dict):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, _SOURCES)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    expected = analyze_repo(repo_path, files, **options)
+
+    cold = analyze_repo(repo_path, files, cache_dir=cache_dir, **options)
+    warm = analyze_repo(repo_path, files, cache_dir=cache_dir, **options)
+
+    assert expected == cold
+    assert expected == warm
+
+def test_unchanged_files_are_not_parsed(analyze_repo, write_repo, parsed_files: list[str],
+                                        tmp_path: Path):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, _SOURCES)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    analyze_repo(repo_path, files, cache_dir=cache_dir)
+    parsed_files.clear()
+
+    analyze_repo(repo_path, files, cache_dir=cache_dir)
+
+    assert not parsed_files
+
+def test_changed_header_invalidates_including_files(analyze_repo, write_repo,
+                                                    parsed_files: list[str], tmp_path: Path):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, _SOURCES)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    analyze_repo(repo_path, files, cache_dir=cache_dir)
+    repo_path.joinpath('shape.hpp').write_text(
+        '#pragma once\n'
+        'class Shape {\n'
+        'public:\n'
+        '    int side(int x) { return x; }\n'
+        '    int area(int x) { return x * x; }\n'
+        '};\n',
+        encoding='utf-8'
+    )
+    parsed_files.clear()
+
+    actual = analyze_repo(repo_path, files, cache_dir=cache_dir)
+
+    assert ['shape.hpp', 'a.cpp'] == parsed_files
+    assert analyze_repo(repo_path, files) == actual
+
+def test_get_cache_args_drops_precompiled_header():
+    args = ['-x', 'c++', '-include-pch', '/tmp/cpp-stats-1/cpp_stats_pch.pch', '-I', 'include']
+    expected = ['-x', 'c++', '-I', 'include']
+
+    assert expected == get_cache_args(args)
+
+def _commit_repo(repo_path: Path):
+    git = ['git', '-C', str(repo_path), '-c', 'user.name=test', '-c', 'user.email=test@test']
+    subprocess.run(git + ['init', '-q'], check=True)
+    subprocess.run(git + ['add', '.'], check=True)
+    subprocess.run(git + ['commit', '-q', '-m', 'initial'], check=True)
+
+def test_since_parses_only_changed_files(analyze_repo, write_repo, parsed_files: list[str],
+                                         tmp_path: Path):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, _SOURCES)
+    _commit_repo(repo_path)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    analyze_repo(repo_path, files, cache_dir=cache_dir, since='HEAD')
+    repo_path.joinpath('shape.hpp').write_text(
+        '#pragma once\n'
+        'class Shape { public: int side(int x) { return x; } };\n',
+        encoding='utf-8'
+    )
+    # checkout changes modification time of files without changing them
+    os.utime(repo_path.joinpath('b.cpp'), ns=(0, 0))
+    parsed_files.clear()
+
+    actual = analyze_repo(repo_path, files, cache_dir=cache_dir, since='HEAD')
+
+    assert ['shape.hpp', 'a.cpp'] == parsed_files
+    assert analyze_repo(repo_path, files) == actual
+
+def test_since_checks_results_of_uncommitted_edits(analyze_repo, write_repo, tmp_path: Path):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, _SOURCES)
+    _commit_repo(repo_path)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    expected = analyze_repo(repo_path, files, cache_dir=cache_dir)
+    repo_path.joinpath('shape.hpp').write_text(
+        _SOURCES['shape.hpp'] + 'class Edited {};\n',
+        encoding='utf-8'
+    )
+    edited = analyze_repo(repo_path, files, cache_dir=cache_dir, since='HEAD')
+    subprocess.run(['git', '-C', str(repo_path), 'checkout', '-q', '--', 'shape.hpp'],
+                   check=True)
+
+    actual = analyze_repo(repo_path, files, cache_dir=cache_dir, since='HEAD')
+
+    assert expected != edited
+    assert expected == actual
+
+def test_since_checks_untracked_includes(analyze_repo, write_repo, tmp_path: Path):
+    repo_path = tmp_path.joinpath('repo')
+    files = write_repo(repo_path, {
+        '.gitignore': 'gen/\n',
+        'gen/config.h': '#define SCALE 2\n',
+        'main.cpp': '#include "gen/config.h"\nint scale(int x) { return x * SCALE; }\n',
+    })
+    _commit_repo(repo_path)
+    cache_dir = str(tmp_path.joinpath('cache'))
+    analyze_repo(repo_path, files[2:], cache_dir=cache_dir, since='HEAD')
+    repo_path.joinpath('gen', 'config.h').write_text(
+        '#define SCALE (x > 0 ? x + 1 : 2 * x - 1)\n',
+        encoding='utf-8'
+    )
+    expected = analyze_repo(repo_path, files[2:])
+
+    actual = analyze_repo(repo_path, files[2:], cache_dir=cache_dir, since='HEAD')
+
+    assert expected == actual
+
+def test_since_requires_cache_dir():
+    with pytest.raises(ValueError):
+        AnalysisOptions(since='HEAD')
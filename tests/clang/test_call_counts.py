@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+import clang.cindex
+
+from cpp_stats import instrumentation
+from cpp_stats.instrumentation import CallCounter
+
+_REPO_PATH = Path('./tests/data/analyze')
+_FILES = sorted(_REPO_PATH.glob('*.hpp'))
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_calls_are_counted_per_file_and_calculator(analyze_repo, jobs: int):
+    call_counter = CallCounter()
+    expected = analyze_repo(_REPO_PATH, _FILES)
+
+    actual = analyze_repo(_REPO_PATH, _FILES, call_counter=call_counter, jobs=jobs)
+    report = call_counter.report()
+
+    assert expected == actual
+    assert len(_FILES) == report['events']['clang_parseTranslationUnit']
+    assert report['events'][instrumentation.CURSORS_VISITED] > 0
+    assert report['events'][instrumentation.TOKENS] > 0
+    assert 'NUMBER_OF_CLASSES' in report['calculators']
+    assert sorted(str(file) for file in _FILES) == [
+        name for name in report['files'] if name != '-'
+    ]
+
+def test_counting_stops_after_analysis(analyze_repo):
+    library = clang.cindex.conf.lib
+
+    analyze_repo(_REPO_PATH, _FILES, call_counter=CallCounter())
+
+    assert library is clang.cindex.conf.lib
+    assert instrumentation.active_counter is None
+
+def test_cursors_visited_are_the_same_in_parallel(analyze_repo):
+    serial = CallCounter()
+    parallel = CallCounter()
+
+    analyze_repo(_REPO_PATH, _FILES, call_counter=serial)
+    analyze_repo(_REPO_PATH, _FILES, call_counter=parallel, jobs=2)
+
+    assert (serial.report()['events'][instrumentation.CURSORS_VISITED]
+            == parallel.report()['events'][instrumentation.CURSORS_VISITED])
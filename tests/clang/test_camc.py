@@ -2,6 +2,7 @@ import pytest
 import pathlib
 
 from cpp_stats.metrics.arg_types.camc import MeanCAMCCalculator, MinCAMCCalculator, MaxCAMCCalculator
+from cpp_stats.metrics.arg_types.base import merge_argument_data, merge_argument_data_into
 from cpp_stats.ast.ast_tree import analyze_ast
 
 import clang.cindex
@@ -52,3 +53,26 @@ def test_min_metric_calculator(clang_index: clang.cindex.Index):
 
     _, actual = result["MIN_CAMC"].get()
     assert abs(expected - actual) < EPS
+
+def test_merge_argument_data_into():
+    target = {"A": {"m1": {"int"}}, "B": {"m1": {"char"}}}
+    source = {"A": {"m2": {"float"}}, "C": {"m1": {"int"}}}
+    expected = {
+        "A": {"m1": {"int"}, "m2": {"float"}},
+        "B": {"m1": {"char"}},
+        "C": {"m1": {"int"}}
+    }
+
+    merge_argument_data_into(target, source)
+
+    assert expected == target
+
+def test_merge_argument_data_does_not_change_arguments():
+    lhv = {"A": {"m1": {"int"}}}
+    rhv = {"B": {"m1": {"char"}}}
+
+    merged = merge_argument_data(lhv, rhv)
+    merge_argument_data_into(merged, {"A": {"m2": {"float"}}, "B": {"m2": {"int"}}})
+
+    assert {"A": {"m1": {"int"}}} == lhv
+    assert {"B": {"m1": {"char"}}} == rhv
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import clang.cindex
+
+from cpp_stats.metrics.number_of_classes import NumberOfClassesCalculator, METRIC_NAME
+from cpp_stats.ast.ast_tree import analyze_ast
+from cpp_stats.ast.compilation import get_parse_commands
+from cpp_stats.ast.options import AnalysisOptions
+
+def _get_sources(repo_path: Path) -> dict[str, str]:
+    return {
+        'include/base.hpp': 'class Base {};\n',
+        'src/main.cpp':
+            '#include "base.hpp"\n'
+            '#ifdef WITH_DERIVED\n'
+            'class Derived : public Base {};\n'
+            '#endif\n',
+        'build/compile_commands.json': json.dumps([{
+            'directory': str(repo_path.joinpath('build')),
+            'command': 'c++ -I../include -DWITH_DERIVED -o main.o -c ../src/main.cpp',
+            'file': '../src/main.cpp'
+        }]),
+    }
+
+def test_files_use_flags_from_compilation_database(clang_index: clang.cindex.Index,
+                                                   write_repo, tmp_path: Path):
+    write_repo(tmp_path, _get_sources(tmp_path))
+    build_path = tmp_path.joinpath('build')
+    files = [tmp_path.joinpath('src', 'main.cpp')]
+    calculators = {METRIC_NAME: NumberOfClassesCalculator()}
+    expected = 1
+
+    result = analyze_ast(clang_index, str(tmp_path), files, calculators,
+                         AnalysisOptions(compilation_database=str(build_path)))
+
+    _, actual = result[METRIC_NAME].get()
+    assert expected == actual
+
+def test_headers_use_interpolated_flags(clang_index: clang.cindex.Index, write_repo,
+                                        tmp_path: Path):
+    write_repo(tmp_path, _get_sources(tmp_path))
+    build_path = tmp_path.joinpath('build')
+    files = [tmp_path.joinpath('src', 'main.cpp'), tmp_path.joinpath('include', 'base.hpp')]
+
+    commands = get_parse_commands(str(tmp_path), files, str(build_path))
+
+    main_path, main_args = commands[0]
+    header_path, header_args = commands[1]
+    assert main_path == str(files[0])
+    assert '-DWITH_DERIVED' in main_args
+    assert '-c' not in main_args and 'main.o' not in main_args
+    assert header_path == str(files[1])
+    assert '-DWITH_DERIVED' in header_args
+    assert header_path not in header_args
+
+def test_files_without_compilation_database_use_inferred_args(clang_index: clang.cindex.Index,
+                                                              write_repo, tmp_path: Path):
+    write_repo(tmp_path, _get_sources(tmp_path))
+    files = [tmp_path.joinpath('src', 'main.cpp')]
+    expected_dirs = [tmp_path, tmp_path / 'build', tmp_path / 'include', tmp_path / 'src']
+
+    [(actual_path, actual_args)] = get_parse_commands(str(tmp_path), files)
+
+    assert str(files[0]) == actual_path
+    assert ['-x', 'c++'] == actual_args[:2]
+    assert ['-I'] * len(expected_dirs) == actual_args[2::2]
+    assert sorted(str(path) for path in expected_dirs) == sorted(actual_args[3::2])
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+_SOURCES = {
+    'include/shape.hpp':
+        '#pragma once\n'
+        'class Shape {\n'
+        'public:\n'
+        '    int side(int x) { if (x > 0) { return x; } return -x; }\n'
+        '    int area(int x) { return side(x) * side(x); }\n'
+        '};\n',
+    'src/a.cpp':
+        '#include "shape.hpp"\n'
+        'class A { int g(Shape s) { return s.area(2); } };\n',
+    'include/lonely.hpp':
+        'class Lonely { int f() { return 1; } };\n',
+    'src/b.cpp':
+        '#include "shape.hpp"\n'
+        'int b(Shape s) { return s.side(1) > 0 ? 1 : 0; }\n',
+}
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_header_attribution_does_not_change_metrics(analyze_repo, write_repo,
+                                                    tmp_path: Path, jobs: int):
+    files = write_repo(tmp_path, _SOURCES)
+    expected = analyze_repo(tmp_path, files)
+
+    actual = analyze_repo(tmp_path, files, jobs=jobs, attribute_headers=True)
+
+    assert expected == actual
+
+def test_included_headers_are_not_parsed(analyze_repo, write_repo, parsed_files: list[str],
+                                         tmp_path: Path):
+    files = write_repo(tmp_path, _SOURCES)
+    expected = ['a.cpp', 'b.cpp', 'lonely.hpp']
+
+    analyze_repo(tmp_path, files, attribute_headers=True)
+
+    assert expected == parsed_files
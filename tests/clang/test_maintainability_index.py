@@ -7,7 +7,9 @@ from cpp_stats.metrics.maintainability_index import MeanMaintainabilityIndexMetr
 from cpp_stats.metrics.maintainability_index import MeanHalsteadVolumeMetric, MeanCyclomaticComplexityMetric
 from cpp_stats.metrics.maintainability_index import _merge_data
 from cpp_stats.metrics.halstead.base import HalsteadData
-from cpp_stats.ast.ast_tree import analyze_ast
+from cpp_stats.metrics.halstead.volume import MeanHalsteadVolumeCalculator
+from cpp_stats.metrics.cyclomatic_complexity import MeanCyclomaticComplexityCalculator
+from cpp_stats.ast.ast_tree import analyze_ast, _get_traversed_calculators
 
 import clang.cindex
 
@@ -150,3 +152,16 @@ def test_mean_metric_calculator(clang_index: clang.cindex.Index):
 
     _, actual = result["MEAN_MAINTAINABILITY_INDEX"].get()
     assert abs(expected - actual) < EPS
+
+def test_maintainability_index_shares_records_with_other_metrics():
+    calculators = {
+        "MEAN_MAINTAINABILITY_INDEX": MeanMaintainabilityIndexCalculator(),
+        "MIN_MAINTAINABILITY_INDEX": MinMaintainabilityIndexCalculator(),
+        "MEAN_HALSTEAD_VOLUME": MeanHalsteadVolumeCalculator(),
+        "MEAN_CYCLOMATIC_COMPLEXITY": MeanCyclomaticComplexityCalculator(),
+    }
+    expected = 3
+
+    actual = len(_get_traversed_calculators(calculators))
+
+    assert expected == actual
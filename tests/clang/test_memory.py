@@ -0,0 +1,44 @@
+from pathlib import Path
+import gc
+
+import pytest
+import clang.cindex
+
+from cpp_stats.ast.memory import dispose_translation_unit
+
+_REPO_PATH = Path('./tests/data/analyze')
+_FILES = sorted(_REPO_PATH.rglob('*.cpp')) + sorted(_REPO_PATH.rglob('*.hpp'))
+
+@pytest.mark.parametrize("options", [
+    {'max_memory': 1},
+    {'max_memory': 1024 ** 4},
+    {'max_memory': 1, 'jobs': 2},
+    {'max_memory': 1024 ** 4, 'jobs': 2},
+    {'max_memory': 1, 'attribute_headers': True},
+])
+def test_results_within_memory_budget_are_equal(analyze_repo, options: dict):
+    expected = analyze_repo(_REPO_PATH, _FILES)
+
+    actual = analyze_repo(_REPO_PATH, _FILES, **options)
+
+    assert expected == actual
+
+def test_no_cursors_are_kept_after_analysis(analyze_repo):
+    analyze_repo(_REPO_PATH, _FILES, max_memory=1)
+    gc.collect()
+
+    kept = [
+        obj for obj in gc.get_objects()
+        if isinstance(obj, (clang.cindex.Cursor, clang.cindex.TranslationUnit))
+    ]
+
+    assert not kept
+
+def test_disposed_translation_unit_can_be_collected(clang_index: clang.cindex.Index):
+    translation_unit = clang_index.parse('./tests/data/analyze/definition.hpp', args=['-x', 'c++'])
+
+    dispose_translation_unit(translation_unit)
+
+    assert translation_unit.obj is None
+    del translation_unit
+    gc.collect()
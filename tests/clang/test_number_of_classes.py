@@ -1,5 +1,8 @@
+from pathlib import Path
+
 import pytest
 
+from cpp_stats.cpp_stats import CppStats
 from cpp_stats.metrics.metric_calculator import Metric
 from cpp_stats.metrics.number_of_classes import NumberOfClassesCalculator, NumberOfClassesMetric
 
@@ -54,3 +57,29 @@ def test_when_declaration_then_assert_not_class(clang_index: clang.cindex.Index)
 
     _, actual = metric.get()
     assert expected == actual
+
+@pytest.mark.parametrize("metric_name, expected", [
+    ('NUMBER_OF_CLASSES', 2),
+    ('MEAN_NUMBER_OF_METHODS_PER_CLASS', 1.5),
+])
+def test_local_classes_are_counted_alone_and_in_report(clang_index: clang.cindex.Index,
+                                                        write_repo, tmp_path: Path,
+                                                        metric_name: str, expected: float):
+    write_repo(tmp_path, {
+        'local.cpp': 'class A {\n'
+                     'public:\n'
+                     '    void a() {}\n'
+                     '};\n'
+                     'void f() {\n'
+                     '    class B {\n'
+                     '    public:\n'
+                     '        void b1() {}\n'
+                     '        void b2() {}\n'
+                     '    };\n'
+                     '}\n',
+    })
+
+    _, alone = CppStats(str(tmp_path), True, metrics=[metric_name]).metric(metric_name)
+    _, in_report = CppStats(str(tmp_path), True).metric(metric_name)
+
+    assert expected == alone == in_report
@@ -1,8 +1,12 @@
 import pytest
+from pathlib import Path
 
 from cpp_stats.metrics.metric_calculator import Metric
 from cpp_stats.metrics.number_of_methods import MeanNumberOfMethodsCalculator, MaxNumberOfMethodsCalculator
 from cpp_stats.metrics.number_of_methods import MeanNumberOfMethodsMetric, MaxNumberOfMethodsMetric, _merge_metric_data
+from cpp_stats.metrics.number_of_methods import MEAN_NUMBER_OF_METHODS_PER_CLASS
+from cpp_stats.ast.ast_tree import analyze_ast
+from cpp_stats.ast.options import AnalysisOptions
 
 import clang.cindex
 
@@ -25,6 +29,17 @@ def test_merge_mean_metric_data():
 
     assert expected == actual
 
+def test_merge_metric_data_does_not_change_arguments():
+    m1 = MeanNumberOfMethodsMetric({'name1': 1})
+    m2 = MeanNumberOfMethodsMetric({'name1': 3, 'name2': 1})
+    expected = {'name1': 1}
+
+    m3 = m1 + m2
+    m3 += MeanNumberOfMethodsMetric({'name3': 1})
+
+    assert expected == m1._data
+    assert {'name1': 3, 'name2': 1} == m2._data
+
 def test_merge_max_metric_data():
     m1 = MaxNumberOfMethodsMetric({
         'name1': 1,
@@ -158,3 +173,35 @@ def test_not_valid_cursor_for_max(clang_index: clang.cindex.Index):
     actual = calc(cls)._data
 
     assert expected == actual
+
+@pytest.mark.parametrize("options", [
+    clang.cindex.TranslationUnit.PARSE_NONE,
+    clang.cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+])
+def test_only_methods_with_bodies_are_counted(clang_index: clang.cindex.Index, options: int):
+    tu = clang_index.parse("./tests/data/analyze/declaration_and_definition.hpp",
+                           args=['-x', 'c++'], options=options)
+    calc = MeanNumberOfMethodsCalculator()
+    expected = {
+        'method1(int)': [False, True],
+        'method2()': [False],
+        'method3()': [True]
+    }
+
+    actual = {}
+    for child in tu.cursor.walk_preorder():
+        if child.kind == clang.cindex.CursorKind.CXX_METHOD:
+            actual.setdefault(child.displayname, []).append(calc.validate_cursor(child))
+
+    assert expected == actual
+
+def test_number_of_methods_without_function_bodies(clang_index: clang.cindex.Index):
+    files = [Path("./tests/data/analyze/declaration_and_definition.hpp")]
+    expected = 2
+
+    result = analyze_ast(clang_index, "./tests/data/analyze/", files,
+                         {MEAN_NUMBER_OF_METHODS_PER_CLASS: MeanNumberOfMethodsCalculator()},
+                         AnalysisOptions(skip_function_bodies=True))
+
+    _, actual = result[MEAN_NUMBER_OF_METHODS_PER_CLASS].get()
+    assert expected == actual
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import clang.cindex
+
+from cpp_stats.metrics.number_of_classes import NumberOfClassesCalculator, METRIC_NAME
+from cpp_stats.metrics.cyclomatic_complexity import MaxCyclomaticComplexityCalculator
+from cpp_stats.metrics.cyclomatic_complexity import MAX_CYCLOMATIC_COMPLEXITY
+from cpp_stats.ast.ast_tree import analyze_ast
+from cpp_stats.ast.options import AnalysisOptions
+from cpp_stats.ast.precompiled_header import get_frequent_includes, use_precompiled_header
+
+_SOURCES = {
+    'common.hpp':
+        '#pragma once\n'
+        'class Common { int f(int x) { if (x) { return 1; } return 0; } };\n',
+    'a.cpp':
+        '#include <vector>\n#include "common.hpp"\nclass A : public Common {};\n',
+    'b.cpp':
+        '#include "common.hpp"\n#include <vector>\n#include <map>\nclass B {};\n',
+}
+
+def test_frequent_includes_keep_order_of_appearance(write_repo, tmp_path: Path):
+    files = write_repo(tmp_path, _SOURCES)
+    expected = ['<vector>', '"common.hpp"']
+
+    actual = get_frequent_includes(files)
+
+    assert expected == actual
+
+def test_files_of_precompiled_header_are_parsed_without_it(clang_index: clang.cindex.Index,
+                                                           write_repo, tmp_path: Path):
+    files = write_repo(tmp_path, _SOURCES)
+    args = ['-x', 'c++', '-I', str(tmp_path)]
+    commands = [(str(file), args) for file in files]
+
+    actual, dependencies = use_precompiled_header(clang_index, commands, str(tmp_path))
+
+    assert actual[0] == commands[0]
+    assert '-include-pch' in actual[1][1]
+    assert '-include-pch' in actual[2][1]
+    assert str(files[0]) in dependencies
+
+def test_precompiled_header_does_not_change_metrics(clang_index: clang.cindex.Index,
+                                                    write_repo, tmp_path: Path):
+    files = write_repo(tmp_path, _SOURCES)
+    calculators = {
+        METRIC_NAME: NumberOfClassesCalculator(),
+        MAX_CYCLOMATIC_COMPLEXITY: MaxCyclomaticComplexityCalculator()
+    }
+    serial = analyze_ast(clang_index, str(tmp_path), files, calculators)
+    expected = {name: metric.get() for name, metric in serial.items()}
+
+    result = analyze_ast(clang_index, str(tmp_path), files, calculators,
+                         AnalysisOptions(precompiled_headers=True))
+    actual = {name: metric.get() for name, metric in result.items()}
+
+    assert expected == actual
+    assert expected[METRIC_NAME] == (METRIC_NAME, 3)
+
+_SAME_NAMED_SOURCES = {
+    'a/util.h':
+        '#ifndef UTIL_H\n#define UTIL_H\n'
+        'class Util { public: int f(int x) { return x + 1; } };\n'
+        '#endif\n',
+    'a/x.cpp':
+        '#include "util.h"\nint x(Util u) { return u.f(1); }\n',
+    'b/util.h':
+        '#ifndef UTIL_H\n#define UTIL_H\n'
+        'struct Point { int x; int y; };\n'
+        'inline int norm(Point p) { if (p.x > p.y) { return p.x * p.x; } return p.y * p.y; }\n'
+        '#endif\n',
+    'b/y.cpp':
+        '#include "util.h"\nint y(Point p) { return norm(p) + p.x; }\n',
+}
+
+def test_files_finding_other_header_are_parsed_without_precompiled_header(
+        clang_index: clang.cindex.Index, write_repo, tmp_path: Path):
+    files = write_repo(tmp_path, _SAME_NAMED_SOURCES)
+    args = ['-x', 'c++', '-I', str(tmp_path / 'a'), '-I', str(tmp_path / 'b')]
+    commands = [(str(file), args) for file in files]
+
+    actual, _ = use_precompiled_header(clang_index, commands, str(tmp_path))
+
+    assert '-include-pch' in actual[1][1]
+    assert actual[3] == commands[3]
+
+def test_precompiled_header_with_same_named_headers_does_not_change_metrics(
+        analyze_repo, write_repo, tmp_path: Path):
+    files = write_repo(tmp_path, _SAME_NAMED_SOURCES)
+    expected = analyze_repo(tmp_path, files)
+
+    actual = analyze_repo(tmp_path, files, precompiled_headers=True)
+
+    assert expected == actual
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+import clang.cindex
+
+from cpp_stats.metrics.tokens import get_token_spellings, get_token_table
+
+def _walk(cursor: clang.cindex.Cursor):
+    for child in cursor.get_children():
+        yield child
+        yield from _walk(child)
+
+@pytest.mark.parametrize("file_name", [
+    'tests/data/analyze/halstead/wiki/wiki.hpp',
+    'tests/data/analyze/halstead/spelling/binary_operator_1.hpp',
+    'tests/data/analyze/cognitive_complexity.hpp',
+    'tests/data/analyze/methods.hpp',
+    'tests/data/analyze/halstead/spelling/macro.hpp',
+])
+def test_token_spellings_are_equal_to_tokens_of_cursor(clang_index: clang.cindex.Index,
+                                                       file_name: str):
+    translation_unit = clang_index.parse(file_name, args=['-x', 'c++'])
+
+    for cursor in _walk(translation_unit.cursor):
+        if cursor.location.file is None or cursor.location.file.name != file_name:
+            continue
+        expected = [token.spelling for token in cursor.get_tokens()]
+
+        actual = get_token_spellings(cursor)
+
+        assert expected == actual
+
+def test_token_table_is_built_once(clang_index: clang.cindex.Index, tmp_path: Path):
+    file_path = tmp_path.joinpath('a.cpp')
+    file_path.write_text('int a = 1;\nint b = a + 2;\n', encoding='utf-8')
+    translation_unit = clang_index.parse(str(file_path))
+    file = translation_unit.get_file(str(file_path))
+
+    table = get_token_table(translation_unit, file)
+
+    assert table is get_token_table(translation_unit, file)
+    assert ['int', 'a', '=', '1', ';', 'int', 'b', '=', 'a', '+', '2', ';'] == table.spellings
+    assert ['b', '=', 'a'] == table.between(15, 20)
+
+def test_halstead_of_macros_is_unchanged(analyze_repo):
+    repo_path = Path('./tests/data/analyze/halstead/spelling')
+    # values calculated with tokens of every cursor taken from `cursor.get_tokens()`
+    expected = {
+        'MAX_HALSTEAD_PROGRAM_VOCABULARY': 19,
+        'MAX_HALSTEAD_PROGRAM_LENGTH': 40,
+        'MAX_HALSTEAD_DIFFICULTY': 13.0,
+        'MIN_MAINTAINABILITY_INDEX': 105.22048107473444,
+    }
+
+    actual = analyze_repo(repo_path, [repo_path.joinpath('macro.hpp')], metrics=list(expected))
+
+    assert expected == pytest.approx(actual)
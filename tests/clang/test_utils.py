@@ -0,0 +1,58 @@
+from pathlib import Path
+import gc
+import weakref
+
+import clang.cindex
+
+from cpp_stats.metrics.utils import mangle_cursor_name
+
+def _find(cursor: clang.cindex.Cursor, spelling: str) -> clang.cindex.Cursor | None:
+    for child in cursor.get_children():
+        if child.spelling == spelling:
+            return child
+        found = _find(child, spelling)
+        if found is not None:
+            return found
+    return None
+
+def test_mangle_cursor_name(clang_index: clang.cindex.Index, tmp_path: Path):
+    file_path = tmp_path.joinpath('a.cpp')
+    file_path.write_text(
+        'namespace outer { namespace inner { class C { int m(int x); int f; }; } }\n',
+        encoding='utf-8'
+    )
+    translation_unit = clang_index.parse(str(file_path))
+    method = _find(translation_unit.cursor, 'm')
+
+    assert '::outer::inner::C::m(int)' == mangle_cursor_name(method)
+    assert '::outer::inner::C::f' == mangle_cursor_name(_find(translation_unit.cursor, 'f'))
+    assert '::outer::inner::C::m(int)::x' == mangle_cursor_name(_find(method, 'x'))
+    assert '' == mangle_cursor_name(translation_unit.cursor)
+
+def test_mangle_cursor_name_of_deeply_nested_cursor(clang_index: clang.cindex.Index,
+                                                    tmp_path: Path):
+    depth = 1500
+    file_path = tmp_path.joinpath('a.cpp')
+    file_path.write_text(
+        'namespace n {' * depth + 'int x;' + '}' * depth + '\n',
+        encoding='utf-8'
+    )
+    translation_unit = clang_index.parse(str(file_path), args=[f'-fbracket-depth={depth + 1}'])
+    cursor = translation_unit.cursor
+    for _ in range(depth):
+        cursor = next(cursor.get_children())
+
+    assert '::n' * depth + '::x' == mangle_cursor_name(next(cursor.get_children()))
+
+def test_names_do_not_keep_translation_unit_alive(clang_index: clang.cindex.Index,
+                                                  tmp_path: Path):
+    file_path = tmp_path.joinpath('a.cpp')
+    file_path.write_text('class C { int f; };\n', encoding='utf-8')
+    translation_unit = clang_index.parse(str(file_path))
+    mangle_cursor_name(_find(translation_unit.cursor, 'f'))
+    reference = weakref.ref(translation_unit)
+
+    del translation_unit
+    gc.collect()
+
+    assert reference() is None
@@ -2,8 +2,14 @@ from pathlib import Path
 import os
 
 import pytest
+import clang.cindex
 
 import utils.clang
+from cpp_stats.analyzer import CodeAnalyzer
+from cpp_stats.cpp_stats import CppStats
+
+# metrics calculated without Clang
+_BASIC_METRICS = ['NUMBER_OF_C_C++_FILES', 'LINES_OF_CODE']
 
 def rename_git_ignore_and_modules(repo_path: Path, to_test: bool = True):
     '''
@@ -77,3 +83,52 @@ def clang_index():
     if index is None:
         pytest.skip('Clang cannot be found using env variable LIBCLANG_LIBRARY_PATH')
     yield index
+
+@pytest.fixture
+def write_repo():
+    '''
+    Returns function that writes files of test repository `repo_path`,
+    given as contents keyed by paths relative to it, and returns paths of written files.
+    '''
+    def write(repo_path: Path, sources: dict[str, str]) -> list[Path]:
+        written = []
+        for name, content in sources.items():
+            file_path = repo_path.joinpath(name)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content, encoding='utf-8')
+            written.append(file_path)
+        return written
+    return write
+
+@pytest.fixture
+def analyze_repo(clang_index):
+    '''
+    Returns function that analyzes `files` of repository `repo_path` with `CodeAnalyzer`
+    and returns values of metrics calculated with Clang by names.
+    Keyword arguments are passed to `CodeAnalyzer`, e.g. `jobs`, `metrics` or `call_counter`.
+    '''
+    metric_names = [name for name in CppStats('.').list() if name not in _BASIC_METRICS]
+    def analyze(repo_path: Path, files: list[Path], **kwargs) -> dict[str, tuple]:
+        analyzer = CodeAnalyzer(
+            str(repo_path),
+            files,
+            os.getenv('LIBCLANG_LIBRARY_PATH'),
+            **kwargs
+        )
+        analyzer.analyze(metric_names)
+        metrics = [analyzer.metric(name) for name in metric_names]
+        return dict(metric.get() for metric in metrics if metric is not None)
+    return analyze
+
+@pytest.fixture
+def parsed_files(monkeypatch) -> list[str]:
+    '''
+    Returns names of files parsed by libclang in this process during the test.
+    '''
+    parsed = []
+    parse = clang.cindex.Index.parse
+    def spy(index, path, *args, **kwargs):
+        parsed.append(Path(path).name)
+        return parse(index, path, *args, **kwargs)
+    monkeypatch.setattr(clang.cindex.Index, 'parse', spy)
+    return parsed
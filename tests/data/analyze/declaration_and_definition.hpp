@@ -0,0 +1,9 @@
+class Declared {
+public:
+    void method1(int);
+    virtual void method2() = 0;
+    void method3() const noexcept { return; }
+    Declared() = default;
+};
+
+void Declared::method1(int) {}
@@ -0,0 +1,10 @@
+#define ADD(a, b) ((a) + (b))
+#define SQ(a) ((a) * (a))
+#define ONE 1
+#define DECLARE(name) int name = ONE
+
+int macro(int x, int y) {
+    DECLARE(z);
+    z = ADD(x, y) - -ONE;
+    return ADD(SQ(x), ONE) + z;
+}
@@ -0,0 +1,26 @@
+'''
+Tests for aggregation of values of entities.
+'''
+from cpp_stats.metrics.aggregation import collect_values, mean_value, max_value, min_value
+
+def test_collect_values_drops_nan_and_calls_value_source_once():
+    calls = []
+    def value_source(entity):
+        calls.append(entity)
+        return complex(entity, 0) if entity is not None else float('nan')
+    expected = [1.0, 3.0]
+
+    actual = collect_values([1, None, 3], value_source)
+
+    assert expected == actual
+    assert [1, None, 3] == calls
+
+def test_mean_counts_entities_with_nan():
+    assert 2.0 == mean_value([1.0, 5.0], 3)
+    assert 0 == mean_value([], 0)
+
+def test_max_and_min():
+    assert 0.0 == max_value([-1.0, -2.0], 0.0)
+    assert 3 == max_value([1, 3, 2], 0)
+    assert 1 == min_value([2, 1, 3], None)
+    assert min_value([], None) is None
@@ -2,8 +2,10 @@
 Tests analyzer.py
 '''
 from pathlib import Path 
+import os
 
 from cpp_stats.analyzer import CodeAnalyzer
+import cpp_stats.analyzer
 
 def test_loc_metric_1():
     '''
@@ -61,3 +63,70 @@ def test_unknown_metric():
     actual = analyzer.metric("UNKNOWN_METRIC")
 
     assert expected == actual, f"Expected: {expected}, Actual: {actual}"
+
+def test_loc_metric_does_not_parse_files(monkeypatch):
+    '''
+    Tests that Analyzer with Clang gets LOC metric without parsing files.
+    '''
+    def fail(*_args, **_kwargs):
+        raise AssertionError('files must not be parsed')
+    monkeypatch.setattr('cpp_stats.analyzer.analyze_ast', fail)
+    files = [
+        Path('./tests/data/repo/main.cpp')
+    ]
+    analyzer = CodeAnalyzer("./tests/data/repo/", files, 'libclang.so')
+    expected = 6
+
+    _, actual = analyzer.metric("LINES_OF_CODE").get()
+
+    assert expected == actual, f"Expected: {expected}, Actual: {actual}"
+
+def test_clang_metric_is_calculated_once(clang_index, monkeypatch):
+    '''
+    Tests that Analyzer parses files only for requested metric and remembers it.
+    '''
+    requested = []
+    analyze_ast = cpp_stats.analyzer.analyze_ast
+    def spy(index, repo_path, files, calculators, options, *args):
+        requested.append(list(options.metrics))
+        return analyze_ast(index, repo_path, files, calculators, options, *args)
+    monkeypatch.setattr('cpp_stats.analyzer.analyze_ast', spy)
+    files = [
+        Path('./tests/data/repo/main.cpp')
+    ]
+    analyzer = CodeAnalyzer("./tests/data/repo/", files, os.getenv('LIBCLANG_LIBRARY_PATH'))
+    analyzer._index = clang_index
+
+    expected = analyzer.metric("NUMBER_OF_CLASSES")
+    actual = analyzer.metric("NUMBER_OF_CLASSES")
+
+    assert expected == actual, f"Expected: {expected}, Actual: {actual}"
+    assert [["NUMBER_OF_CLASSES"]] == requested
+
+def test_metrics_of_one_family_parse_files_once(clang_index, parsed_files: list[str]):
+    '''
+    Tests that Analyzer derives metrics requested one by one from records
+    of the same family without parsing files again.
+    '''
+    files = sorted(Path('./tests/data/analyze').glob('*.hpp'))
+    analyzer = CodeAnalyzer("./tests/data/analyze/", files, os.getenv('LIBCLANG_LIBRARY_PATH'))
+    analyzer._index = clang_index
+    names = [
+        "MEAN_CYCLOMATIC_COMPLEXITY",
+        "MAX_CYCLOMATIC_COMPLEXITY",
+        "MEAN_HALSTEAD_VOLUME",
+        "MAX_HALSTEAD_VOLUME",
+        "MEAN_MAINTAINABILITY_INDEX",
+        "MIN_MAINTAINABILITY_INDEX",
+    ]
+    batch = CodeAnalyzer("./tests/data/analyze/", files, os.getenv('LIBCLANG_LIBRARY_PATH'))
+    batch._index = clang_index
+    batch.analyze(names)
+    expected = [batch.metric(name).get() for name in names]
+    parsed_files.clear()
+
+    actual = [analyzer.metric(name).get() for name in names]
+
+    assert expected == actual
+    # records of cyclomatic complexity, Halstead metrics and lines are traversed once each
+    assert 3 * len(files) == len(parsed_files)
@@ -0,0 +1,91 @@
+'''
+Tests package bench
+'''
+
+from pathlib import Path
+
+import pytest
+
+from cpp_stats.bench.corpus import CorpusOptions, generate_corpus
+from cpp_stats.bench.scenarios import get_metric_families, get_scenarios, run_benchmarks
+from cpp_stats.cpp_stats import CppStats
+
+def _read_corpus(path: Path) -> dict[str, str]:
+    return {
+        str(file.relative_to(path)): file.read_text(encoding='utf-8')
+        for file in sorted(path.rglob('*')) if file.is_file()
+    }
+
+def test_corpus_is_deterministic(tmp_path: Path):
+    '''
+    Tests that the same parameters generate the same repository.
+    '''
+    options = CorpusOptions(files=5, seed=3)
+    generate_corpus(tmp_path.joinpath('a'), options)
+    generate_corpus(tmp_path.joinpath('b'), options)
+
+    expected = _read_corpus(tmp_path.joinpath('a'))
+    actual = _read_corpus(tmp_path.joinpath('b'))
+
+    assert expected == actual
+
+def test_corpus_depends_on_seed(tmp_path: Path):
+    '''
+    Tests that another seed generates another repository.
+    '''
+    generate_corpus(tmp_path.joinpath('a'), CorpusOptions(files=5, seed=1))
+    generate_corpus(tmp_path.joinpath('b'), CorpusOptions(files=5, seed=2))
+
+    assert _read_corpus(tmp_path.joinpath('a')) != _read_corpus(tmp_path.joinpath('b'))
+
+def test_corpus_has_header_and_source_per_file(tmp_path: Path):
+    '''
+    Tests that each module is a header and a source including other headers.
+    '''
+    written = generate_corpus(tmp_path, CorpusOptions(files=4, include_fan_out=2))
+
+    assert 8 == len(written)
+    source = tmp_path.joinpath('src', 'module_0.cpp').read_text(encoding='utf-8')
+    assert 3 == source.count('#include')
+
+def test_invalid_corpus_options():
+    '''
+    Tests that repository without files or with negative parameters is rejected.
+    '''
+    with pytest.raises(ValueError):
+        CorpusOptions(files=0)
+    with pytest.raises(ValueError):
+        CorpusOptions(nesting_depth=-1)
+
+def test_families_cover_clang_metrics():
+    '''
+    Tests that each metric calculated with Clang belongs to exactly one family.
+    '''
+    expected = sorted(
+        name for name in CppStats('.').list()
+        if name not in ['NUMBER_OF_C_C++_FILES', 'LINES_OF_CODE']
+    )
+
+    actual = sorted(name for names in get_metric_families().values() for name in names)
+
+    assert expected == actual
+    assert 'family:halstead' in get_scenarios()
+
+def test_run_benchmarks_without_clang(tmp_path: Path):
+    '''
+    Tests that results store every run of requested scenarios.
+    '''
+    generate_corpus(tmp_path, CorpusOptions(files=3))
+
+    results = run_benchmarks(tmp_path, ['sieve', 'lines_of_code'], repeat=2)
+
+    assert ['sieve', 'lines_of_code'] == list(results['scenarios'])
+    assert all(len(runs) == 2 for runs in results['scenarios'].values())
+    assert 6 == results['files']
+
+def test_run_unknown_scenario(tmp_path: Path):
+    '''
+    Tests that unknown scenario is rejected.
+    '''
+    with pytest.raises(ValueError):
+        run_benchmarks(tmp_path, ['unknown'])
@@ -0,0 +1,107 @@
+'''
+Tests module bench/compare.py
+'''
+
+from pathlib import Path
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from cpp_stats.bench.compare import compare_results, load_results, median_absolute_deviation
+from cpp_stats.bench.main import main
+from cpp_stats.bench.scenarios import RESULTS_FORMAT_VERSION
+
+def _results(scenarios: dict[str, list[float]]) -> dict:
+    return {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'scenarios': {
+            name: [{'wall': wall, 'cpu': wall} for wall in walls]
+            for name, walls in scenarios.items()
+        },
+    }
+
+def test_median_absolute_deviation():
+    '''
+    Tests that deviation ignores a single outlier.
+    '''
+    expected = 0.1
+
+    actual = median_absolute_deviation([1.0, 1.1, 0.9, 1.0, 5.0])
+
+    assert expected == pytest.approx(actual)
+
+def test_compare_statuses():
+    '''
+    Tests that slower, faster and noisy scenarios are told apart.
+    '''
+    baseline = _results({
+        'slower': [1.0, 1.01, 0.99],
+        'faster': [1.0, 1.01, 0.99],
+        'noisy': [1.0, 1.5, 0.6],
+        'small': [1.0, 1.0, 1.0],
+        'removed': [1.0],
+    })
+    current = _results({
+        'slower': [1.5, 1.51, 1.49],
+        'faster': [0.5, 0.51, 0.49],
+        'noisy': [1.3, 1.9, 0.9],
+        'small': [1.05, 1.05, 1.05],
+        'added': [1.0],
+    })
+    expected = {
+        'slower': 'regression',
+        'faster': 'improvement',
+        'noisy': 'unchanged',
+        'small': 'unchanged',
+        'removed': 'missing',
+        'added': 'new',
+    }
+
+    actual = {
+        comparison.name: comparison.status
+        for comparison in compare_results(baseline, current, threshold=0.1)
+    }
+
+    assert expected == actual
+
+def test_single_outlier_is_not_regression():
+    '''
+    Tests that median is compared, not mean.
+    '''
+    baseline = _results({'analyze_ast': [1.0, 1.0, 1.0, 1.0, 1.0]})
+    current = _results({'analyze_ast': [1.0, 1.0, 1.0, 1.0, 9.0]})
+
+    comparison, = compare_results(baseline, current)
+
+    assert 'unchanged' == comparison.status
+
+def test_load_results_of_other_format(tmp_path: Path):
+    '''
+    Tests that results of unknown format are rejected.
+    '''
+    path = tmp_path.joinpath('results.json')
+    path.write_text(json.dumps({'format_version': -1}), encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        load_results(str(path))
+
+@pytest.mark.parametrize("current_walls, exit_code", [
+    ([1.0, 1.0, 1.0], 0),
+    ([1.3, 1.3, 1.3], 1),
+])
+def test_compare_command_exit_code(tmp_path: Path, current_walls: list[float], exit_code: int):
+    '''
+    Tests that compare command fails only on regression past threshold.
+    '''
+    baseline = tmp_path.joinpath('baseline.json')
+    current = tmp_path.joinpath('current.json')
+    baseline.write_text(json.dumps(_results({'sieve': [1.0, 1.0, 1.0]})), encoding='utf-8')
+    current.write_text(json.dumps(_results({'sieve': current_walls})), encoding='utf-8')
+
+    result = CliRunner().invoke(
+        main,
+        ['compare', '--threshold', '20', str(baseline), str(current)]
+    )
+
+    assert exit_code == result.exit_code, result.output
@@ -0,0 +1,96 @@
+'''
+Tests for arguments used to parse C/C++ files.
+'''
+from pathlib import Path
+
+import pytest
+
+from cpp_stats.ast.compilation import get_include_args, find_compilation_database
+
+def test_include_args_contain_only_dirs_with_files_and_parents(tmp_path: Path):
+    tmp_path.joinpath('include', 'lib').mkdir(parents=True)
+    tmp_path.joinpath('include', 'lib', 'lib.hpp').write_text('', encoding='utf-8')
+    tmp_path.joinpath('src').mkdir()
+    tmp_path.joinpath('src', 'main.cpp').write_text('', encoding='utf-8')
+    tmp_path.joinpath('docs', 'empty').mkdir(parents=True)
+    expected = [
+        '-x', 'c++',
+        '-I', str(tmp_path),
+        '-I', str(tmp_path.joinpath('include')),
+        '-I', str(tmp_path.joinpath('include', 'lib')),
+        '-I', str(tmp_path.joinpath('src')),
+    ]
+
+    actual = get_include_args(str(tmp_path))
+
+    assert sorted(expected) == sorted(actual)
+    assert actual.index(str(tmp_path)) < actual.index(str(tmp_path.joinpath('include')))
+
+def test_include_args_keep_dirs_without_headers(tmp_path: Path):
+    tmp_path.joinpath('tables').mkdir()
+    tmp_path.joinpath('tables', 'opcodes.def').write_text('', encoding='utf-8')
+    tmp_path.joinpath('tables', 'VERSION').write_text('', encoding='utf-8')
+    expected = [
+        '-x', 'c++',
+        '-I', str(tmp_path),
+        '-I', str(tmp_path.joinpath('tables')),
+    ]
+
+    actual = get_include_args(str(tmp_path))
+
+    assert expected == actual
+
+def test_include_args_skip_git_and_ignored_dirs(tmp_path: Path):
+    for name in ['.git/objects/ab', 'build/gen', 'external/lib', 'src']:
+        tmp_path.joinpath(name).mkdir(parents=True)
+        tmp_path.joinpath(name, 'file.h').write_text('', encoding='utf-8')
+    tmp_path.joinpath('.gitignore').write_text('build/\n', encoding='utf-8')
+    tmp_path.joinpath('.gitmodules').write_text(
+        '[submodule "lib"]\n    path = external/lib\n', encoding='utf-8'
+    )
+    expected = [
+        '-x', 'c++',
+        '-I', str(tmp_path),
+        '-I', str(tmp_path.joinpath('src')),
+    ]
+
+    actual = get_include_args(str(tmp_path))
+
+    assert sorted(expected) == sorted(actual)
+
+def test_include_args_without_files(tmp_path: Path):
+    tmp_path.joinpath('empty').mkdir()
+    expected = ['-x', 'c++']
+
+    actual = get_include_args(str(tmp_path))
+
+    assert expected == actual
+
+def test_compilation_database_is_found_in_repo(tmp_path: Path):
+    tmp_path.joinpath('compile_commands.json').write_text('[]', encoding='utf-8')
+    expected = str(tmp_path)
+
+    actual = find_compilation_database(str(tmp_path))
+
+    assert expected == actual
+
+def test_compilation_database_is_not_found(tmp_path: Path):
+    expected = None
+
+    actual = find_compilation_database(str(tmp_path))
+
+    assert expected == actual
+
+def test_compilation_database_passed_as_file(tmp_path: Path):
+    database = tmp_path.joinpath('build', 'compile_commands.json')
+    database.parent.mkdir()
+    database.write_text('[]', encoding='utf-8')
+    expected = str(database.parent)
+
+    actual = find_compilation_database('unused', str(database))
+
+    assert expected == actual
+
+def test_missing_compilation_database_passed_as_dir(tmp_path: Path):
+    with pytest.raises(ValueError):
+        find_compilation_database('unused', str(tmp_path))
@@ -2,8 +2,15 @@
 Tests for cpp_stats main class.
 '''
 from pathlib import Path
+import gzip
+import io
+import subprocess
+
+from click.testing import CliRunner
+import pytest
 
 from cpp_stats.cpp_stats import CppStats
+from cpp_stats.main import main, open_report
 
 def test_number_of_c_cxx_files_1(repo: Path):
     stats = CppStats(str(repo))
@@ -37,3 +44,80 @@ def test_number_of_c_cxx_files_4(repo_with_ignr_modules: Path):
     actual = stats.metric('NUMBER_OF_C_C++_FILES')[1]
 
     assert expected == actual
+
+def test_written_report_is_equal_to_xml(repo: Path):
+    stats = CppStats(str(repo))
+    stream = io.StringIO()
+
+    stats.write_xml(stream)
+
+    assert stats.as_xml() == stream.getvalue()
+    assert stream.getvalue().startswith('<report>\n')
+    assert stream.getvalue().endswith('    </metrics>\n</report>\n')
+
+def test_gzip_report(tmp_path: Path):
+    report = str(tmp_path.joinpath('report.xml.gz'))
+
+    with open_report(report) as f:
+        f.write('<report/>\n')
+
+    with gzip.open(report, 'rt', encoding='utf-8') as f:
+        assert '<report/>\n' == f.read()
+
+@pytest.mark.parametrize('name', ['report.xml', 'report.xml.gz'])
+def test_failed_report_is_not_written(tmp_path: Path, name: str):
+    report = tmp_path.joinpath(name)
+
+    with pytest.raises(ValueError):
+        with open_report(str(report)) as f:
+            f.write('<report>\n')
+            raise ValueError('analysis failed')
+
+    assert [] == list(tmp_path.iterdir())
+
+def test_failed_report_keeps_previous_report(tmp_path: Path):
+    report = tmp_path.joinpath('report.xml')
+    report.write_text('<report/>\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        with open_report(str(report)) as f:
+            f.write('<report>\n')
+            raise ValueError('analysis failed')
+
+    assert [report] == list(tmp_path.iterdir())
+    assert '<report/>\n' == report.read_text(encoding='utf-8')
+
+def test_since_without_cache_dir_is_usage_error(repo: Path):
+    result = CliRunner().invoke(main, ['--since', 'HEAD', str(repo)])
+
+    assert 2 == result.exit_code
+    assert 'requires cache directory' in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+def test_unknown_since_revision_is_bad_parameter(tmp_path: Path):
+    subprocess.run(['git', '-C', str(tmp_path), 'init', '-q'], check=True)
+    report = tmp_path.joinpath('report.xml')
+
+    result = CliRunner().invoke(main, [
+        '--cache-dir', str(tmp_path.joinpath('cache')), '--since', 'no-such-revision',
+        '--report', str(report), str(tmp_path)
+    ])
+
+    assert 2 == result.exit_code
+    assert "'--since'" in result.output
+    assert not report.exists()
+
+@pytest.mark.parametrize('database', ['missing', 'build', 'build/commands.json'])
+def test_missing_compilation_database_is_bad_parameter(tmp_path: Path, database: str):
+    tmp_path.joinpath('build').mkdir()
+    tmp_path.joinpath('build', 'commands.json').write_text('[]', encoding='utf-8')
+    report = tmp_path.joinpath('report.xml')
+
+    result = CliRunner().invoke(main, [
+        '--compile-commands', str(tmp_path.joinpath(database)),
+        '--report', str(report), str(tmp_path)
+    ])
+
+    assert 2 == result.exit_code
+    assert "'--compile-commands'" in result.output
+    assert not report.exists()
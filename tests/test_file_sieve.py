@@ -8,68 +8,6 @@ from utils.asserts import assert_lists_equal_unordered
 
 import cpp_stats.file_sieve
 
-def test_find_gitignore_1(repo: Path):
-    '''
-    Tests that in repository without `.gitignore`
-    function `src.cpp_stats.file_sieve._locate_file`
-    does not locate any `.gitignore` files
-    '''
-    file_to_locate = '.gitignore'
-    expected = []
-
-    actual = cpp_stats.file_sieve._locate_file(repo, file_to_locate, [])
-
-    assert_lists_equal_unordered(expected, actual)
-
-def test_find_gitignore_2(repo_with_gitignore: Path):
-    '''
-    Tests that in repository with `.gitignore`
-    function `src.cpp_stats.file_sieve._locate_file` 
-    finds exactly one `.gitignore` file.
-    '''
-    file_to_locate = '.gitignore'
-    expected = [
-        Path('./tests/data/repo_with_gitignore/.gitignore')
-    ]
-
-    actual = cpp_stats.file_sieve._locate_file(repo_with_gitignore, file_to_locate, [])
-
-    assert_lists_equal_unordered(expected, actual)
-
-def test_find_gitignore_3(repo_with_2gitignore: Path):
-    '''
-    Tests that in repository with `.gitignore`
-    function `src.cpp_stats.file_sieve._locate_file` 
-    finds exactly one `.gitignore`.
-    '''
-    file_to_locate = '.gitignore'
-    expected = [
-        Path('./tests/data/repo_with_2gitignore/.gitignore'),
-        Path('./tests/data/repo_with_2gitignore/folder/.gitignore'),
-    ]
-
-    actual = cpp_stats.file_sieve._locate_file(repo_with_2gitignore, file_to_locate, [])
-
-    assert_lists_equal_unordered(expected, actual)
-
-def test_find_gitignore_with_banned_dir_1(repo_with_2gitignore: Path):
-    '''
-    Tests that in repository with banned directories and `.gitignore`
-    function `src.cpp_stats.file_sieve._locate_file` 
-    finds exactly one
-    '''
-    file_to_locate = '.gitignore'
-    banned_dirs = [
-        Path('./tests/data/repo_with_2gitignore/folder/')
-    ]
-    expected = [
-        Path('./tests/data/repo_with_2gitignore/.gitignore'),
-    ]
-
-    actual = cpp_stats.file_sieve._locate_file(repo_with_2gitignore, file_to_locate, banned_dirs)
-
-    assert_lists_equal_unordered(expected, actual)
-
 def test_list_gitignore_dirs_1(repo_with_gitignore: Path):
     '''
     Tests that in repository with `.gitignore`
@@ -200,3 +138,84 @@ def test_sieve_c_cxx_files_none():
     actual = cpp_stats.file_sieve.sieve_c_cxx_files(None)
 
     assert expected == actual
+
+def test_sieve_c_cxx_files_threads(tmp_path: Path, monkeypatch):
+    '''
+    Tests that
+    function `src.cpp_stats.file_sieve.sieve_c_cxx_files`
+    finds the same sorted files with threads and skips ignored directories
+    of relative repository path.
+    '''
+    for directory in ['a/b', 'a/build', 'c', 'build', 'sub/x']:
+        tmp_path.joinpath(directory).mkdir(parents=True)
+    for file in ['main.cpp', 'a/b/x.hpp', 'a/b/y.C', 'a/build/gen.cpp', 'a/z.txt',
+                 'c/.h', 'c/w.c++', 'build/gen.cpp', 'sub/x/s.cpp']:
+        tmp_path.joinpath(file).write_text('', encoding='utf-8')
+    tmp_path.joinpath('.gitignore').write_text('build/\n', encoding='utf-8')
+    tmp_path.joinpath('a', '.gitignore').write_text('# generated\nbuild\n', encoding='utf-8')
+    tmp_path.joinpath('.gitmodules').write_text(
+        '[submodule "sub"]\n    path = sub\n', encoding='utf-8'
+    )
+    monkeypatch.chdir(tmp_path)
+    expected = [
+        Path('a/b/x.hpp'),
+        Path('a/b/y.C'),
+        Path('c/.h'),
+        Path('c/w.c++'),
+        Path('main.cpp'),
+    ]
+
+    serial = cpp_stats.file_sieve.sieve_c_cxx_files(Path('.'))
+    parallel = cpp_stats.file_sieve.sieve_c_cxx_files(Path('.'), threads=4)
+
+    assert expected == serial
+    assert expected == parallel
+
+def test_sieve_c_cxx_files_ignored_by_other_directory(tmp_path: Path, monkeypatch):
+    '''
+    Tests that
+    function `src.cpp_stats.file_sieve.sieve_c_cxx_files`
+    skips directory ignored by `.gitignore` of another directory
+    with threads and without them.
+    '''
+    for directory in ['a', 'b', 'c', 'd']:
+        tmp_path.joinpath(directory).mkdir()
+        tmp_path.joinpath(directory, 'main.cpp').write_text('', encoding='utf-8')
+    tmp_path.joinpath('d', '.gitignore').write_text('../b\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    expected = [
+        Path('a/main.cpp'),
+        Path('c/main.cpp'),
+        Path('d/main.cpp'),
+    ]
+
+    serial = cpp_stats.file_sieve.sieve_c_cxx_files(Path('.'))
+    parallel = cpp_stats.file_sieve.sieve_c_cxx_files(Path('.'), threads=4)
+
+    assert expected == serial
+    assert expected == parallel
+
+def test_sieve_c_cxx_files_symlinks(tmp_path: Path):
+    '''
+    Tests that
+    function `src.cpp_stats.file_sieve.sieve_c_cxx_files`
+    returns symbolic links to files, but does not follow symbolic links
+    to directories and does not return directories with extensions of C/C++ files.
+    '''
+    repo_path = tmp_path.joinpath('repo')
+    outside_path = tmp_path.joinpath('outside')
+    repo_path.joinpath('dir.h').mkdir(parents=True)
+    outside_path.mkdir()
+    repo_path.joinpath('main.cpp').write_text('', encoding='utf-8')
+    outside_path.joinpath('outside.hpp').write_text('', encoding='utf-8')
+    repo_path.joinpath('link.cpp').symlink_to(repo_path.joinpath('main.cpp'))
+    repo_path.joinpath('link_to_dir.h').symlink_to(repo_path.joinpath('dir.h'))
+    repo_path.joinpath('outside').symlink_to(outside_path)
+    expected = [
+        repo_path.joinpath('link.cpp'),
+        repo_path.joinpath('main.cpp'),
+    ]
+
+    actual = cpp_stats.file_sieve.sieve_c_cxx_files(repo_path)
+
+    assert expected == actual
@@ -0,0 +1,91 @@
+'''
+Tests for finding files changed since git revision.
+'''
+from pathlib import Path
+import os
+import subprocess
+
+import pytest
+
+from cpp_stats.git_changes import get_changed_files, get_revision_files, resolve_revision
+
+def _git(repo_path: Path, *args: str):
+    subprocess.run(
+        ['git', '-C', str(repo_path), '-c', 'user.name=test', '-c', 'user.email=test@test',
+         *args],
+        check=True,
+        capture_output=True
+    )
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    '''
+    Returns path to git repository with one commit of `a.cpp`, `b.cpp` and `src/c.cpp`.
+    '''
+    _git(tmp_path, 'init', '-q')
+    tmp_path.joinpath('src').mkdir()
+    for name in ['a.cpp', 'b.cpp', os.path.join('src', 'c.cpp')]:
+        tmp_path.joinpath(name).write_text('int x;\n', encoding='utf-8')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-q', '-m', 'initial')
+    return tmp_path
+
+def test_changed_files_include_modified_staged_and_untracked(git_repo: Path):
+    git_repo.joinpath('a.cpp').write_text('int y;\n', encoding='utf-8')
+    git_repo.joinpath('src', 'c.cpp').write_text('int y;\n', encoding='utf-8')
+    _git(git_repo, 'add', 'src/c.cpp')
+    git_repo.joinpath('src', 'd.cpp').write_text('int z;\n', encoding='utf-8')
+    expected = {
+        os.path.realpath(git_repo.joinpath(name))
+        for name in ['a.cpp', os.path.join('src', 'c.cpp'), os.path.join('src', 'd.cpp')]
+    }
+
+    actual = get_changed_files(str(git_repo), 'HEAD')
+
+    assert expected == actual
+
+def test_changed_files_of_subdirectory(git_repo: Path):
+    git_repo.joinpath('src', 'd.cpp').write_text('int z;\n', encoding='utf-8')
+    git_repo.joinpath('b.cpp').write_text('int y;\n', encoding='utf-8')
+    expected = {
+        os.path.realpath(git_repo.joinpath('b.cpp')),
+        os.path.realpath(git_repo.joinpath('src', 'd.cpp')),
+    }
+
+    actual = get_changed_files(str(git_repo.joinpath('src')), 'HEAD')
+
+    assert expected == actual
+
+def test_changed_files_since_unknown_revision(git_repo: Path):
+    with pytest.raises(ValueError):
+        get_changed_files(str(git_repo), 'no-such-revision')
+
+def test_revision_files_are_tracked_files(git_repo: Path):
+    git_repo.joinpath('.gitignore').write_text('gen/\n', encoding='utf-8')
+    _git(git_repo, 'add', '.gitignore')
+    _git(git_repo, 'commit', '-q', '-m', 'ignore')
+    git_repo.joinpath('gen').mkdir()
+    git_repo.joinpath('gen', 'config.h').write_text('int g;\n', encoding='utf-8')
+    git_repo.joinpath('d.cpp').write_text('int z;\n', encoding='utf-8')
+    expected = {
+        os.path.realpath(git_repo.joinpath(name))
+        for name in ['.gitignore', 'a.cpp', 'b.cpp', os.path.join('src', 'c.cpp')]
+    }
+
+    actual = get_revision_files(str(git_repo.joinpath('src')), 'HEAD')
+
+    assert expected == actual
+
+def test_resolve_revision_returns_commit_hash(git_repo: Path):
+    expected = subprocess.run(
+        ['git', '-C', str(git_repo), 'rev-parse', 'HEAD'],
+        check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+    actual = resolve_revision(str(git_repo), 'HEAD')
+
+    assert expected == actual
+
+def test_resolve_unknown_revision(git_repo: Path):
+    with pytest.raises(ValueError):
+        resolve_revision(str(git_repo), 'no-such-revision')
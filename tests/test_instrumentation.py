@@ -0,0 +1,74 @@
+'''
+Tests module instrumentation.py
+'''
+
+from cpp_stats import instrumentation
+from cpp_stats.instrumentation import CallCounter
+from cpp_stats.metrics.sources import SourceStore
+
+def _counter(events: list[tuple[str, str, str]]) -> CallCounter:
+    counter = CallCounter()
+    for file_path, calculator, event in events:
+        counter.file = file_path
+        counter.calculator = calculator
+        counter.add(event)
+    return counter
+
+def test_report_groups_events():
+    '''
+    Tests that events are counted in total, per calculator and per file.
+    '''
+    counter = _counter([
+        ('a.cpp', 'LCOM', 'clang_visitChildren'),
+        ('a.cpp', 'LCOM', 'clang_visitChildren'),
+        ('b.cpp', 'NHD', 'clang_visitChildren'),
+        ('b.cpp', 'NHD', 'tokens'),
+    ])
+
+    report = counter.report()
+
+    assert {'clang_visitChildren': 3, 'tokens': 1} == report['events']
+    assert {'clang_visitChildren': 2} == report['calculators']['LCOM']
+    assert {'clang_visitChildren': 1, 'tokens': 1} == report['files']['b.cpp']
+
+def test_merge_adds_counts():
+    '''
+    Tests that counts of another process are added.
+    '''
+    counter = _counter([('a.cpp', 'LCOM', 'clang_tokenize')])
+
+    counter.merge(_counter([('a.cpp', 'LCOM', 'clang_tokenize')]))
+
+    assert {'clang_tokenize': 2} == counter.report()['events']
+
+def test_format_table_lists_files_with_most_calls():
+    '''
+    Tests that table lists only files with the most calls into libclang.
+    '''
+    counter = _counter([
+        ('a.cpp', 'LCOM', 'clang_visitChildren'),
+        ('b.cpp', 'LCOM', 'clang_visitChildren'),
+        ('b.cpp', 'LCOM', 'clang_visitChildren'),
+        ('c.cpp', 'LCOM', 'tokens'),
+    ])
+
+    table = counter.format_table(top_files=1)
+
+    assert 'b.cpp' in table
+    assert 'a.cpp' not in table
+
+def test_source_file_opens_are_counted(monkeypatch):
+    '''
+    Tests that mapping a source file is counted once while it stays open.
+    '''
+    counter = CallCounter()
+    monkeypatch.setattr(instrumentation, 'active_counter', counter)
+    store = SourceStore(max_open_files=1)
+
+    store.get('./tests/data/repo/main.cpp')
+    store.get('./tests/data/repo/main.cpp')
+    store.get('./tests/data/repo_with_ignr_modules/src/serial_port.c')
+    store.get('./tests/data/repo/main.cpp')
+    store.clear()
+
+    assert {instrumentation.SOURCE_FILE_OPENS: 3} == counter.report()['events']
@@ -0,0 +1,38 @@
+'''
+Tests module memory.py
+'''
+
+import pytest
+
+from cpp_stats.ast.memory import get_resident_memory, parse_memory_size
+
+@pytest.mark.parametrize("size, expected", [
+    ('1000', 1000),
+    ('512K', 512 * 1024),
+    ('4G', 4 * 1024 ** 3),
+    ('4GiB', 4 * 1024 ** 3),
+    ('256mb', 256 * 1024 ** 2),
+])
+def test_parse_memory_size(size: str, expected: int):
+    '''
+    Tests that sizes with units are converted to bytes.
+    '''
+    actual = parse_memory_size(size)
+
+    assert expected == actual, f"Expected: {expected}, Actual: {actual}"
+
+@pytest.mark.parametrize("size", ['', '0', '-1G', '4X', 'G'])
+def test_parse_invalid_memory_size(size: str):
+    '''
+    Tests that invalid sizes are rejected.
+    '''
+    with pytest.raises(ValueError):
+        parse_memory_size(size)
+
+def test_resident_memory_is_positive():
+    '''
+    Tests that resident memory of the process is read where `/proc` is available.
+    '''
+    actual = get_resident_memory()
+
+    assert actual is None or actual > 0
@@ -0,0 +1,72 @@
+'''
+Tests module profiling.py
+'''
+
+from cpp_stats.cpp_stats import CppStats
+from cpp_stats.profiling import Profiler
+
+def test_measure_accumulates_phases_and_files():
+    '''
+    Tests that Profiler counts measurements of phases and files.
+    '''
+    profiler = Profiler()
+
+    with profiler.measure('parse', 'a.cpp'):
+        pass
+    with profiler.measure('parse', 'b.cpp'):
+        pass
+    with profiler.measure('merge'):
+        pass
+    report = profiler.report()
+
+    assert ['merge', 'parse'] == list(report['phases'])
+    assert 2 == report['phases']['parse']['count']
+    assert ['a.cpp', 'b.cpp'] == list(report['files'])
+    assert report['phases']['parse']['wall'] >= 0
+
+def test_merge_sums_times():
+    '''
+    Tests that Profiler adds times of profile of another process.
+    '''
+    profiler = Profiler()
+    profiler.add_calculator('LINES_OF_CODE', 1.0, 0.5)
+    other = Profiler()
+    other.add_calculator('LINES_OF_CODE', 2.0, 1.0)
+    other.add_calculator('NUMBER_OF_CLASSES', 1.0, 1.0)
+    expected = {
+        'LINES_OF_CODE': {'wall': 3.0, 'cpu': 1.5, 'count': 2},
+        'NUMBER_OF_CLASSES': {'wall': 1.0, 'cpu': 1.0, 'count': 1},
+    }
+
+    profiler.merge(other)
+
+    assert expected == profiler.report()['calculators']
+
+def test_slowest_files_are_limited():
+    '''
+    Tests that Profiler lists only the slowest files.
+    '''
+    profiler = Profiler()
+    profiler.merge(_profile_of_files({'a.cpp': 1.0, 'b.cpp': 3.0, 'c.cpp': 2.0}))
+
+    slowest_files = profiler.report(top_files=2)['slowest_files']
+
+    assert ['b.cpp', 'c.cpp'] == [file['file'] for file in slowest_files]
+
+def test_cpp_stats_profile(repo):
+    '''
+    Tests that CppStats measures discovery and basic metrics only if profiling is on.
+    '''
+    stats = CppStats(str(repo), profile=True)
+    stats.as_xml()
+
+    phases = stats.profile()['phases']
+
+    assert {'discovery', 'basic_metrics'} == set(phases)
+    assert CppStats(str(repo)).profile() is None
+
+def _profile_of_files(walls: dict[str, float]) -> Profiler:
+    profiler = Profiler()
+    for file_path, wall in walls.items():
+        profiler.files[file_path] = {'parse': [wall, wall, 1]}
+    return profiler
@@ -0,0 +1,94 @@
+'''
+Tests module progress.py
+'''
+
+from pathlib import Path
+import io
+import json
+import time
+
+import pytest
+
+from cpp_stats.metrics.lines_of_code import LinesOfCodeCalculator
+from cpp_stats.progress import ProgressReporter
+
+def test_files_done_and_slowest_file():
+    '''
+    Tests that ProgressReporter counts files and lines and keeps the slowest file.
+    '''
+    reporter = ProgressReporter(io.StringIO())
+    reporter.start('analysis', 3)
+
+    reporter.file_done('a.cpp', 1.0, 10)
+    reporter.file_done('b.cpp', 3.0, 20)
+    reporter.file_done('c.cpp', 2.0, 30)
+    state = reporter.snapshot()
+    reporter.finish()
+
+    assert 3 == state['done']
+    assert 3 == state['total']
+    assert 60 == state['lines']
+    assert {'file': 'b.cpp', 'seconds': 3.0} == state['slowest']
+    assert 0.0 == state['eta']
+
+def test_current_file_and_eta():
+    '''
+    Tests that ProgressReporter shows file being analyzed and estimates time left.
+    '''
+    stream = io.StringIO()
+    reporter = ProgressReporter(stream)
+    reporter.start('analysis')
+    reporter.add_files(4)
+
+    reporter.file_started('a.cpp')
+    reporter.file_done('a.cpp', None, 5)
+    reporter.file_started('b.cpp')
+    line = reporter.format_line()
+    reporter.finish()
+
+    assert line.startswith('cpp-stats: analysis 1/4 files, ')
+    assert 'ETA ' in line
+    assert 'current b.cpp (' in line
+    assert 'slowest a.cpp (' in line
+    assert 'current' not in stream.getvalue().splitlines()[-1]
+
+def test_json_lines_are_written_periodically():
+    '''
+    Tests that ProgressReporter writes a JSON object per line while phase runs
+    and a final line when it finishes.
+    '''
+    stream = io.StringIO()
+    reporter = ProgressReporter(stream, 'json', interval=0.01)
+    reporter.start('lines_of_code', 1)
+
+    time.sleep(0.1)
+    reporter.file_done('a.cpp', 0.5, 7)
+    reporter.finish()
+    states = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert len(states) > 2
+    assert 'lines_of_code' == states[-1]['phase']
+    assert 1 == states[-1]['done']
+    assert 7 == states[-1]['lines']
+
+def test_lines_of_code_calculator_reports_progress():
+    '''
+    Tests that LinesOfCodeCalculator reports every counted file.
+    '''
+    files = sorted(Path('./tests/data/analyze/camc').glob('*'))
+    stream = io.StringIO()
+    reporter = ProgressReporter(stream, 'json')
+
+    metric = LinesOfCodeCalculator(reporter)(files)
+    state = json.loads(stream.getvalue().splitlines()[-1])
+
+    assert len(files) == state['done']
+    assert metric.value == state['lines']
+
+@pytest.mark.parametrize("kwargs", [{'log_format': 'xml'}, {'interval': 0}])
+def test_invalid_reporter(kwargs: dict):
+    '''
+    Tests that ProgressReporter rejects unknown format and non-positive interval.
+    '''
+    with pytest.raises(ValueError):
+        ProgressReporter(io.StringIO(), **kwargs)
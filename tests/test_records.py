@@ -0,0 +1,94 @@
+'''
+Tests module records.py
+'''
+
+import pytest
+
+from cpp_stats.metrics.metric_calculator import Metric, reduce_metrics
+from cpp_stats.metrics.lines_of_code import LinesOfCodeMetric
+from cpp_stats.metrics.records import FileRecordsMetric
+
+def test_merge_records():
+    m1 = FileRecordsMetric('RECORDS', {'file1': [1, 2], 'file2': [3]})
+    m2 = FileRecordsMetric('RECORDS', {'file1': [4], 'file3': [5]})
+    expected = {'file1': [1, 2, 4], 'file2': [3], 'file3': [5]}
+
+    actual = (m1 + m2).data
+
+    assert expected == actual
+
+def test_merge_records_does_not_change_arguments():
+    m1 = FileRecordsMetric('RECORDS', {'file1': [1]})
+    m2 = FileRecordsMetric('RECORDS', {'file1': [2]})
+    expected = {'file1': [1]}
+
+    m3 = m1 + m2
+    m3 += FileRecordsMetric('RECORDS', {'file1': [3]})
+
+    assert expected == m1.data
+
+def test_merge_records_in_place():
+    m1 = FileRecordsMetric('RECORDS', {'file1': [1, 2], 'file2': [3]})
+    m2 = FileRecordsMetric('RECORDS', {'file1': [4], 'file3': [5]})
+    expected = {'file1': [1, 2, 4], 'file2': [3], 'file3': [5]}
+
+    m3 = m1
+    m3 += m2
+
+    assert m3 is m1
+    assert expected == m1.data
+
+def test_merge_records_in_place_does_not_change_other():
+    m1 = FileRecordsMetric('RECORDS', {'file1': [1]})
+    m2 = FileRecordsMetric('RECORDS', {'file2': [2]})
+    expected = {'file2': [2]}
+
+    m1 += m2
+    m1 += FileRecordsMetric('RECORDS', {'file2': [3]})
+
+    assert expected == m2.data
+
+def test_reduce_metrics_keeps_order():
+    metrics = [FileRecordsMetric('RECORDS', {'file': [i]}) for i in range(7)]
+    expected = {'file': list(range(7))}
+
+    actual = reduce_metrics(metrics).data
+
+    assert expected == actual
+
+def test_reduce_metrics_without_in_place_sum():
+    metrics = [LinesOfCodeMetric(i) for i in range(5)]
+    expected = 10
+
+    _, actual = reduce_metrics(metrics).get()
+
+    assert expected == actual
+
+def test_reduce_empty_list_of_metrics():
+    expected = None
+
+    actual = reduce_metrics([])
+
+    assert expected == actual
+
+def test_values_of_all_files():
+    m = FileRecordsMetric('RECORDS', {'file1': [1, 2], 'file2': [3]})
+    expected = [1, 2, 3]
+
+    actual = m.values()
+
+    assert expected == actual
+
+def test_when_sum_with_other_records_then_not_implemented():
+    m1 = FileRecordsMetric('RECORDS', {})
+    m2 = FileRecordsMetric('OTHER_RECORDS', {})
+
+    with pytest.raises(NotImplementedError):
+        m1 + m2
+
+def test_when_sum_with_unknown_metric_then_not_implemented():
+    m1 = FileRecordsMetric('RECORDS', {})
+    m2 = Metric('some metric')
+
+    with pytest.raises(NotImplementedError):
+        m1 + m2
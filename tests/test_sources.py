@@ -0,0 +1,38 @@
+'''
+Tests for memory-mapped source files.
+'''
+from pathlib import Path
+
+from cpp_stats.metrics.sources import SourceFile, SourceStore
+
+def test_line_slice(tmp_path: Path):
+    file_path = tmp_path.joinpath('a.cpp')
+    file_path.write_bytes(b'int a = 1;\r\nint b = a + 2;\nint c;')
+    source_file = SourceFile(str(file_path))
+
+    assert 'a + 2' == source_file.line_slice(2, 9, 14)
+    assert '1;\n' == source_file.line_slice(1, 9, 100)
+    assert 'int c;' == source_file.line_slice(3, 1, 7)
+    assert '' == source_file.line_slice(4, 1, 2)
+    source_file.close()
+
+def test_line_count(tmp_path: Path):
+    tmp_path.joinpath('a.cpp').write_text('int a;\nint b;\n', encoding='utf-8')
+    tmp_path.joinpath('empty.cpp').write_text('', encoding='utf-8')
+
+    assert 3 == SourceFile(str(tmp_path.joinpath('a.cpp'))).line_count()
+    assert 1 == SourceFile(str(tmp_path.joinpath('empty.cpp'))).line_count()
+
+def test_store_keeps_limited_number_of_files(tmp_path: Path):
+    store = SourceStore(max_open_files=2)
+    names = []
+    for i in range(3):
+        names.append(str(tmp_path.joinpath(f'{i}.cpp')))
+        tmp_path.joinpath(f'{i}.cpp').write_text(f'int a{i};\n', encoding='utf-8')
+    first = store.get(names[0])
+
+    assert first is store.get(names[0])
+    store.get(names[1])
+    store.get(names[2])
+    assert first is not store.get(names[0])
+    store.clear()